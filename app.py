@@ -2,8 +2,8 @@ import streamlit as st
 from modules.upload import setup_upload_interface
 from modules.text_conversion import setup_conversion_interface
 from modules.text_management import setup_text_management
-from modules.minutes_generator import generate_minutes, setup_minutes_interface
-from modules.utils import initialize_session_state
+from modules.utils import initialize_session_state, apply_custom_css
+from modules.metrics import start_metrics_server
 from config.settings import APP_TITLE, APP_ICON, SIDEBAR_STATE
 
 # 페이지 설정
@@ -17,9 +17,11 @@ st.set_page_config(
 # 세션 상태 초기화
 initialize_session_state()
 
-# 커스텀 CSS 로드
-with open("static/css/styles.css") as f:
-    st.markdown(f"<style>{f.read()}</style>", unsafe_allow_html=True)
+# 처리 시간 수집용 /metrics 엔드포인트 (프로세스당 한 번만 시작)
+start_metrics_server()
+
+# 커스텀 CSS 로드 (파일은 프로세스당 한 번만 읽음)
+apply_custom_css()
 
 # 헤더
 st.markdown(f'<h1 class="header">{APP_TITLE}</h1>', unsafe_allow_html=True)
@@ -52,6 +54,7 @@ else:
     
     # 회의록 생성 섹션 (공통)
     if st.session_state.text_entries:
+        from modules.minutes_generator import setup_minutes_interface
         setup_minutes_interface()
         
 # 재실행이 필요한 경우
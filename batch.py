@@ -0,0 +1,343 @@
+"""
+회의록 일괄 생성 도구 (Streamlit 화면 없이 디렉토리 단위로 처리)
+
+사용 예:
+    python batch.py 녹음파일/ -o 회의록/ --workers 4 --engine clova --model claude
+
+API 키는 환경 변수(OPENAI_API_KEY, CLAUDE_API_KEY, NAVER_CLIENT_SECRET)에서 읽습니다.
+처리가 끝난 파일은 출력 디렉토리의 진행 상태 파일에 기록되므로, 중단 후 같은 명령을
+다시 실행하면 남은 파일만 처리합니다.
+"""
+import os
+import sys
+import json
+import time
+import hashlib
+import argparse
+import tempfile
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+from datetime import datetime
+
+from config.settings import (
+    ALLOWED_AUDIO_FORMATS, DEFAULT_SPEECH_TO_TEXT_ENGINE, DEFAULT_SUMMARY_MODEL, UPLOAD_CHUNK_SIZE,
+    SUMMARY_CACHE_ENABLED, BATCH_MAX_WORKERS, BATCH_EXECUTOR, BATCH_PROGRESS_FILE, BATCH_REPORT_FILE
+)
+from modules.clients import get_anthropic_client
+from modules.text_conversion import transcribe_audio
+from modules.minutes_generator import (
+    summarize_transcript, render_minutes_markdown, get_cached_minutes
+)
+from modules.utils import format_transcript
+
+TEXT_FORMATS = ["txt"]
+
+class ConsoleUI:
+    """st.info/st.success/st.warning/st.error 대신 콘솔에 출력 (파일 이름 표시)"""
+
+    def __init__(self, name):
+        self.name = name
+
+    def _print(self, level, text):
+        print(f"[{level}] {self.name}: {text}", file=sys.stderr if level in ("경고", "오류") else sys.stdout,
+              flush=True)
+
+    def info(self, text):
+        self._print("정보", text)
+
+    def success(self, text):
+        self._print("완료", text)
+
+    def warning(self, text):
+        self._print("경고", text)
+
+    def error(self, text):
+        self._print("오류", text)
+
+def hash_file(path, chunk_size=UPLOAD_CHUNK_SIZE):
+    """파일 해시값 계산 (화면에서 업로드한 파일과 같은 방식이므로 변환 결과 캐시를 공유)"""
+    hasher = hashlib.md5()
+    buffer = bytearray(chunk_size)
+    view = memoryview(buffer)
+    with open(path, "rb") as f:
+        while True:
+            read_size = f.readinto(buffer)
+            if not read_size:
+                break
+            hasher.update(view[:read_size])
+    return hasher.hexdigest()
+
+def collect_input_files(input_dir):
+    """
+    입력 디렉토리에서 처리할 오디오/텍스트 파일 목록 반환 (하위 디렉토리 포함, 이름순)
+
+    Returns:
+    list: 입력 디렉토리 기준 상대 경로 목록
+    """
+    formats = set(ALLOWED_AUDIO_FORMATS + TEXT_FORMATS)
+    files = []
+    for root, _, names in os.walk(input_dir):
+        for name in names:
+            if name.rsplit(".", 1)[-1].lower() in formats:
+                files.append(os.path.relpath(os.path.join(root, name), input_dir))
+    return sorted(files)
+
+def make_output_names(files, current_date):
+    """
+    입력 파일별 회의록 파일 이름 결정 (save_minutes_to_file과 같은 형식)
+
+    이름이 같은 파일이 여러 개면 (예: 회의.mp3, 회의.wav, 하위 디렉토리의 같은 이름)
+    확장자와 경로를 이름에 포함해 결과가 덮어써지지 않게 합니다.
+    """
+    stems = [os.path.splitext(os.path.basename(path))[0] for path in files]
+    output_names = {}
+    for path, stem in zip(files, stems):
+        base_name = stem
+        if stems.count(stem) > 1:
+            base_name = path.replace(os.sep, "_").replace(".", "_")
+        output_names[path] = (base_name, f"{base_name}_회의록_{current_date}.md")
+    return output_names
+
+def load_progress(output_dir):
+    """진행 상태 파일 읽기 (없거나 손상되었으면 빈 상태)"""
+    try:
+        with open(os.path.join(output_dir, BATCH_PROGRESS_FILE), "r", encoding="utf-8") as f:
+            progress = json.load(f)
+        if isinstance(progress.get("files"), dict):
+            return progress
+    except (OSError, ValueError, AttributeError):
+        pass
+    return {"files": {}}
+
+def write_json_atomic(path, data):
+    """임시 파일에 쓴 뒤 교체 (중단되어도 이전 내용이 깨지지 않음)"""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, path)
+    except Exception:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+def is_already_done(entry, input_path, output_dir):
+    """이전 실행에서 같은 파일을 이미 처리했는지 확인 (파일 크기/수정 시각 및 결과 파일 존재 여부)"""
+    if not entry or entry.get("status") != "done":
+        return False
+    stat = os.stat(input_path)
+    return (
+        entry.get("size") == stat.st_size
+        and entry.get("mtime") == stat.st_mtime
+        and os.path.exists(os.path.join(output_dir, entry.get("output", "")))
+    )
+
+def process_file(input_path, base_name, output_path, options):
+    """
+    파일 하나를 변환하고 회의록 저장 (작업 스레드 또는 작업 프로세스에서 실행)
+
+    Parameters:
+    input_path (str): 오디오 또는 텍스트 파일 경로
+    base_name (str): 회의록 제목에 사용할 이름
+    output_path (str): 회의록 파일 경로
+    options (dict): engine, summary_model, enable_diarization, secret_key, current_date
+
+    Returns:
+    dict: 처리 결과 (status, 사용된 엔진/모델, 단계별 처리 시간(초), 오류)
+    """
+    name = os.path.basename(input_path)
+    ui = ConsoleUI(name)
+    timings = {}
+    record = {"status": "failed", "engine": None, "model": None, "cached_summary": False, "timings": timings}
+    started = time.perf_counter()
+
+    try:
+        stat = os.stat(input_path)
+        record["size"] = stat.st_size
+        record["mtime"] = stat.st_mtime
+
+        if name.rsplit(".", 1)[-1].lower() in TEXT_FORMATS:
+            step = time.perf_counter()
+            with open(input_path, "r", encoding="utf-8") as f:
+                transcript_text = f.read()
+            timings["read"] = time.perf_counter() - step
+            source = f"텍스트 파일 ({name})"
+        else:
+            step = time.perf_counter()
+            audio_hash = hash_file(input_path)
+            timings["hash"] = time.perf_counter() - step
+
+            step = time.perf_counter()
+            transcript_text, file_info = transcribe_audio(
+                input_path, name, audio_hash, options["engine"], options["enable_diarization"],
+                options["secret_key"], ui=ui, remove_source=False
+            )
+            timings["transcribe"] = time.perf_counter() - step
+            if not transcript_text:
+                raise Exception("텍스트 변환에 실패했습니다.")
+            record["engine"] = file_info["engine"]
+            source = f"오디오 파일 ({name})"
+
+        if not transcript_text.strip():
+            raise Exception("회의 내용이 비어 있습니다.")
+
+        # 항목 시각은 파일 수정 시각을 사용 (다시 실행해도 회의록 캐시 키가 같도록)
+        full_transcript = format_transcript([{
+            "timestamp": datetime.fromtimestamp(stat.st_mtime).strftime("%Y-%m-%d %H:%M:%S"),
+            "source": source,
+            "text": transcript_text
+        }])
+
+        step = time.perf_counter()
+        summary_model = options["summary_model"]
+        summary = get_cached_minutes(full_transcript, summary_model) if SUMMARY_CACHE_ENABLED else None
+        if summary is not None:
+            ui.success("이전에 생성한 회의록을 불러왔습니다. (캐시)")
+            record["cached_summary"] = True
+            used_model = summary_model
+        else:
+            claude_client = None
+            try:
+                claude_client = get_anthropic_client()
+            except Exception as e:
+                ui.warning(f"Claude API 클라이언트 초기화 오류: {str(e)}")
+            # 생성한 회의록은 summarize_transcript에서 캐시에 저장됨
+            summary, used_model = summarize_transcript(full_transcript, summary_model, claude_client, ui=ui)
+        timings["summarize"] = time.perf_counter() - step
+        record["model"] = used_model
+
+        step = time.perf_counter()
+        with open(output_path, "w", encoding="utf-8") as f:
+            f.write(render_minutes_markdown(base_name, options["current_date"], summary, full_transcript))
+        timings["write"] = time.perf_counter() - step
+
+        record["status"] = "done"
+    except Exception as e:
+        ui.error(str(e))
+        record["error"] = str(e)
+
+    timings["total"] = time.perf_counter() - started
+    return record
+
+def run_batch(input_dir, output_dir, workers=BATCH_MAX_WORKERS, executor=BATCH_EXECUTOR,
+              engine=DEFAULT_SPEECH_TO_TEXT_ENGINE, summary_model=DEFAULT_SUMMARY_MODEL,
+              enable_diarization=True, force=False):
+    """
+    디렉토리의 오디오/텍스트 파일을 동시에 처리하고 파일별 결과 반환
+
+    파일 하나가 끝날 때마다 진행 상태 파일을 갱신하므로 중단되어도 다시 실행하면 이어서 처리합니다.
+
+    Returns:
+    dict: 보고서 (파일별 결과, 건너뛴 파일 수, 전체 처리 시간 등)
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    progress_path = os.path.join(output_dir, BATCH_PROGRESS_FILE)
+    progress = {"files": {}} if force else load_progress(output_dir)
+
+    current_date = datetime.now().strftime("%Y-%m-%d")
+    files = collect_input_files(input_dir)
+    output_names = make_output_names(files, current_date)
+    options = {
+        "engine": engine,
+        "summary_model": summary_model,
+        "enable_diarization": enable_diarization,
+        "secret_key": os.environ.get("NAVER_CLIENT_SECRET", ""),
+        "current_date": current_date
+    }
+
+    pending = []
+    skipped = []
+    for path in files:
+        if is_already_done(progress["files"].get(path), os.path.join(input_dir, path), output_dir):
+            skipped.append(path)
+        else:
+            pending.append(path)
+
+    print(f"전체 {len(files)}개 파일 중 {len(pending)}개 처리 (이미 처리됨: {len(skipped)}개)", flush=True)
+
+    results = {}
+    started = time.perf_counter()
+    pool_class = ProcessPoolExecutor if executor == "process" else ThreadPoolExecutor
+    if pending:
+        with pool_class(max_workers=max(1, min(workers, len(pending)))) as pool:
+            futures = {}
+            for path in pending:
+                base_name, output_name = output_names[path]
+                future = pool.submit(process_file, os.path.join(input_dir, path), base_name,
+                                     os.path.join(output_dir, output_name), options)
+                futures[future] = path
+
+            for future in as_completed(futures):
+                path = futures[future]
+                try:
+                    record = future.result()
+                except Exception as e:  # 작업 프로세스가 비정상 종료된 경우 등
+                    record = {"status": "failed", "error": str(e), "timings": {}}
+                record["output"] = output_names[path][1] if record["status"] == "done" else None
+                results[path] = record
+
+                # 완료된 파일만 진행 상태에 기록 (실패한 파일은 다음 실행에서 다시 처리)
+                if record["status"] == "done":
+                    progress["files"][path] = record
+                    write_json_atomic(progress_path, progress)
+
+    report = {
+        "input_dir": os.path.abspath(input_dir),
+        "output_dir": os.path.abspath(output_dir),
+        "executor": executor,
+        "workers": workers,
+        "wall_time": time.perf_counter() - started,
+        "processed": sum(1 for record in results.values() if record["status"] == "done"),
+        "failed": sum(1 for record in results.values() if record["status"] != "done"),
+        "skipped": skipped,
+        "files": {path: results[path] for path in pending}
+    }
+    write_json_atomic(os.path.join(output_dir, BATCH_REPORT_FILE), report)
+    return report
+
+def print_report(report):
+    """파일별 처리 시간 보고서 출력"""
+    stages = ["read", "hash", "transcribe", "summarize", "write", "total"]
+    print()
+    print(f"{'파일':<40} {'상태':<8}" + "".join(f"{stage:>12}" for stage in stages))
+    for path, record in report["files"].items():
+        timings = record.get("timings", {})
+        cells = "".join(
+            f"{timings[stage]:>11.2f}s" if stage in timings else f"{'-':>12}" for stage in stages
+        )
+        print(f"{path:<40} {record['status']:<8}{cells}")
+        if record.get("error"):
+            print(f"    오류: {record['error']}")
+    print()
+    print(f"처리 완료 {report['processed']}개, 실패 {report['failed']}개, "
+          f"이미 처리됨 {len(report['skipped'])}개 - 전체 {report['wall_time']:.1f}초")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="디렉토리의 회의 녹음/텍스트 파일로 회의록을 일괄 생성합니다.")
+    parser.add_argument("input_dir", help="오디오(mp3, wav, m4a, ogg) 또는 텍스트(txt) 파일이 있는 디렉토리")
+    parser.add_argument("-o", "--output-dir", default=None, help="회의록 저장 디렉토리 (기본: 입력 디렉토리)")
+    parser.add_argument("-w", "--workers", type=int, default=BATCH_MAX_WORKERS, help="동시에 처리할 파일 수")
+    parser.add_argument("--executor", choices=["thread", "process"], default=BATCH_EXECUTOR,
+                        help="작업 실행 방식 (스레드 풀 또는 프로세스 풀)")
+    parser.add_argument("--engine", choices=["clova", "whisper"], default=DEFAULT_SPEECH_TO_TEXT_ENGINE,
+                        help="음성 인식 엔진")
+    parser.add_argument("--model", choices=["claude", "openai"], default=DEFAULT_SUMMARY_MODEL,
+                        help="회의록 생성 모델")
+    parser.add_argument("--no-diarization", action="store_true", help="화자 구분 비활성화")
+    parser.add_argument("--force", action="store_true", help="진행 상태를 무시하고 모든 파일을 다시 처리")
+    args = parser.parse_args(argv)
+
+    if not os.path.isdir(args.input_dir):
+        parser.error(f"입력 디렉토리를 찾을 수 없습니다: {args.input_dir}")
+
+    report = run_batch(
+        args.input_dir, args.output_dir or args.input_dir,
+        workers=args.workers, executor=args.executor, engine=args.engine, summary_model=args.model,
+        enable_diarization=not args.no_diarization, force=args.force
+    )
+    print_report(report)
+    return 1 if report["failed"] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,6 @@
+"""
+성능 측정(벤치마크) 패키지 - 실제 API 대신 로컬 대체 서버를 사용
+
+실행 방법:
+    python -m benchmarks.run --output benchmark_results.json
+"""
@@ -0,0 +1,273 @@
+"""
+로컬 대체 Redis 서버 (RESP2/RESP3 프로토콜, 세션 저장소가 사용하는 명령만 지원)
+
+실제 Redis 없이 RedisStore와 여러 인스턴스 간 세션 공유를 확인하기 위해 사용합니다.
+redis 패키지 클라이언트가 그대로 연결할 수 있으며, 데이터는 서버 프로세스 메모리에만 보관합니다.
+
+    with RedisStubServer() as server:
+        os.environ["REDIS_URL"] = server.url
+        os.environ["SESSION_STORE_BACKEND"] = "redis"
+
+지원 명령: HELLO, MULTI/EXEC/DISCARD, PING, SELECT, CLIENT, GET, SET (EX), DEL, EXISTS, EXPIRE, TTL,
+HSET, HSETNX, HGET, HGETALL, HDEL, RPUSH, LRANGE, LREM, FLUSHDB
+"""
+import socketserver
+import threading
+import time
+
+class RedisStubHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        self.protocol = 2  # HELLO 3으로 RESP3 전환
+        self.queued = None  # MULTI 이후 EXEC까지 모아 둔 명령
+        while True:
+            try:
+                command = self.read_command()
+            except (ConnectionError, ValueError):
+                return
+            if command is None:
+                return
+            if command:
+                self.wfile.write(self.dispatch(command))
+                self.wfile.flush()
+
+    def dispatch(self, command):
+        """연결 단위 명령(HELLO, 트랜잭션)은 직접 처리하고 나머지는 서버에서 실행"""
+        name = command[0].upper()
+        if name == b"HELLO":
+            return self.hello(command[1:])
+        if name == b"MULTI":
+            self.queued = []
+            return b"+OK\r\n"
+        if name == b"DISCARD":
+            self.queued = None
+            return b"+OK\r\n"
+        if name == b"EXEC":
+            if self.queued is None:
+                return b"-ERR EXEC without MULTI\r\n"
+            commands, self.queued = self.queued, None
+            return self.server.execute_all(commands, self.protocol)
+        if self.queued is not None:
+            self.queued.append(command)
+            return b"+QUEUED\r\n"
+        return self.server.execute(command, self.protocol)
+
+    def hello(self, args):
+        """프로토콜 버전 협상 (인증 인자는 무시)"""
+        if args:
+            if args[0] not in (b"2", b"3"):
+                return b"-NOPROTO unsupported protocol version\r\n"
+            self.protocol = int(args[0])
+        return encode({b"server": b"redis", b"version": b"7.0.0", b"proto": self.protocol}, self.protocol)
+
+    def read_command(self):
+        """RESP 배열 명령 하나 읽기 (연결이 닫히면 None)"""
+        line = self.rfile.readline()
+        if not line:
+            return None
+        if not line.startswith(b"*"):
+            return line.strip().split()  # 인라인 명령 (redis-cli 등)
+        args = []
+        for _ in range(int(line[1:])):
+            length = int(self.rfile.readline()[1:])
+            args.append(self.rfile.read(length + 2)[:-2])
+        return args
+
+def encode(value, protocol=2):
+    """파이썬 값을 RESP 응답으로 변환 (dict는 RESP3에서 맵, RESP2에서 키/값 배열)"""
+    if value is None:
+        return b"_\r\n" if protocol == 3 else b"$-1\r\n"
+    if isinstance(value, bool):
+        value = int(value)
+    if isinstance(value, int):
+        return b":%d\r\n" % value
+    if isinstance(value, bytes):
+        return b"$%d\r\n%s\r\n" % (len(value), value)
+    if isinstance(value, dict):
+        if protocol == 3:
+            return b"%%%d\r\n" % len(value) + b"".join(
+                encode(key, protocol) + encode(item, protocol) for key, item in value.items())
+        value = [item for pair in value.items() for item in pair]
+    if isinstance(value, list):
+        return b"*%d\r\n" % len(value) + b"".join(encode(item, protocol) for item in value)
+    return b"+%s\r\n" % str(value).encode("utf-8")
+
+class RedisStubServer(socketserver.ThreadingTCPServer):
+    """
+    메모리에 데이터를 보관하는 최소 Redis 호환 서버
+
+    Parameters:
+    host (str): 접속 주소
+    port (int): 포트 (0이면 빈 포트 자동 선택)
+    """
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, host="127.0.0.1", port=0):
+        super().__init__((host, port), RedisStubHandler)
+        self.data = {}     # 키 -> bytes, dict(해시), list(리스트)
+        self.expires = {}  # 키 -> 만료 시각
+        self.commands = 0
+        self._lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"redis://{host}:{port}/0"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _get(self, key, kind=None):
+        """만료를 확인하여 값 반환 (없으면 None)"""
+        if key in self.expires and self.expires[key] <= time.time():
+            self.data.pop(key, None)
+            self.expires.pop(key, None)
+        value = self.data.get(key)
+        if value is not None and kind is not None and not isinstance(value, kind):
+            raise TypeError("WRONGTYPE Operation against a key holding the wrong kind of value")
+        return value
+
+    def execute(self, args, protocol=2):
+        """명령 하나 실행 후 RESP 응답 반환"""
+        with self._lock:
+            return self._execute(args, protocol)
+
+    def execute_all(self, commands, protocol=2):
+        """트랜잭션(MULTI/EXEC)으로 모은 명령을 한 번에 실행 후 응답 배열 반환"""
+        with self._lock:
+            return b"*%d\r\n" % len(commands) + b"".join(self._execute(args, protocol) for args in commands)
+
+    def _execute(self, args, protocol):
+        name = args[0].decode("utf-8").upper()
+        handler = getattr(self, f"cmd_{name.lower()}", None)
+        if handler is None:
+            return f"-ERR unknown command '{name}'\r\n".encode("utf-8")
+        self.commands += 1
+        try:
+            return encode(handler(*args[1:]), protocol)
+        except TypeError as e:
+            return f"-{e}\r\n".encode("utf-8")
+        except (ValueError, IndexError):
+            return b"-ERR syntax error\r\n"
+
+    # 연결 관련
+    def cmd_ping(self, *args):
+        return args[0] if args else "PONG"
+
+    def cmd_select(self, db):
+        return "OK"
+
+    def cmd_client(self, *args):
+        return "OK"
+
+    def cmd_flushdb(self, *args):
+        self.data.clear()
+        self.expires.clear()
+        return "OK"
+
+    # 문자열/키
+    def cmd_get(self, key):
+        return self._get(key, bytes)
+
+    def cmd_set(self, key, value, *options):
+        self.data[key] = value
+        self.expires.pop(key, None)
+        options = [option.upper() for option in options]
+        if b"EX" in options:
+            self.expires[key] = time.time() + int(options[options.index(b"EX") + 1])
+        return "OK"
+
+    def cmd_del(self, *keys):
+        removed = 0
+        for key in keys:
+            if self._get(key) is not None:
+                removed += 1
+            self.data.pop(key, None)
+            self.expires.pop(key, None)
+        return removed
+
+    def cmd_exists(self, *keys):
+        return sum(1 for key in keys if self._get(key) is not None)
+
+    def cmd_expire(self, key, seconds):
+        if self._get(key) is None:
+            return 0
+        self.expires[key] = time.time() + int(seconds)
+        return 1
+
+    def cmd_ttl(self, key):
+        if self._get(key) is None:
+            return -2
+        if key not in self.expires:
+            return -1
+        return int(self.expires[key] - time.time())
+
+    # 해시
+    def cmd_hset(self, key, *pairs):
+        value = self._get(key, dict)
+        if value is None:
+            value = self.data[key] = {}
+        created = 0
+        for i in range(0, len(pairs), 2):
+            created += pairs[i] not in value
+            value[pairs[i]] = pairs[i + 1]
+        return created
+
+    def cmd_hsetnx(self, key, field, item):
+        value = self._get(key, dict)
+        if value is None:
+            value = self.data[key] = {}
+        if field in value:
+            return 0
+        value[field] = item
+        return 1
+
+    def cmd_hget(self, key, field):
+        return (self._get(key, dict) or {}).get(field)
+
+    def cmd_hgetall(self, key):
+        return dict(self._get(key, dict) or {})
+
+    def cmd_hdel(self, key, *fields):
+        value = self._get(key, dict) or {}
+        removed = sum(1 for field in fields if value.pop(field, None) is not None)
+        if key in self.data and not value:
+            self.cmd_del(key)
+        return removed
+
+    # 리스트
+    def cmd_rpush(self, key, *items):
+        value = self._get(key, list)
+        if value is None:
+            value = self.data[key] = []
+        value.extend(items)
+        return len(value)
+
+    def cmd_lrange(self, key, start, stop):
+        value = self._get(key, list) or []
+        start, stop = int(start), int(stop)
+        stop = len(value) if stop == -1 else stop + 1
+        return value[start:stop]
+
+    def cmd_lrem(self, key, count, item):
+        value = self._get(key, list) or []
+        kept = [element for element in value if element != item]
+        removed = len(value) - len(kept)
+        value[:] = kept
+        if key in self.data and not value:
+            self.cmd_del(key)
+        return removed
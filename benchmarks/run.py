@@ -0,0 +1,372 @@
+"""
+파이프라인 성능 측정 (로컬 대체 서버 사용, 결과는 JSON으로 출력)
+
+측정 대상 (세션 상태를 사용하지 않는 핵심 함수 기준):
+- update_full_transcript : 텍스트 항목 목록 → 전체 회의 내용 (format_transcript)
+- convert_audio_to_text  : 임시 파일 → 텍스트 (transcribe_audio)
+- process_audio_file     : 업로드 파일 → 임시 파일 기록/해시 → 텍스트 (spool_upload + transcribe_audio)
+- generate_minutes       : 회의 내용 → 회의록 생성 → 마크다운 저장 (summarize_transcript + render_minutes_markdown)
+
+사용 예:
+    python -m benchmarks.run --output results.json
+    python -m benchmarks.run --baseline results.json --max-regression 0.2   # 이전 결과보다 20% 이상 느려지면 실패
+"""
+import os
+import io
+import sys
+import json
+import time
+import logging
+import shutil
+import argparse
+import platform
+import tempfile
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.stub_server import StubServer, StubConfig
+from benchmarks.synthetic import make_transcript, make_entries, make_wav
+
+class QuietUI:
+    """화면 출력 대신 메시지를 모아 두는 ui 객체 (st.info 등과 같은 이름)"""
+
+    def __init__(self):
+        self.messages = []
+
+    def info(self, text):
+        self.messages.append(("info", text))
+
+    def success(self, text):
+        self.messages.append(("success", text))
+
+    def warning(self, text):
+        self.messages.append(("warning", text))
+
+    def error(self, text):
+        self.messages.append(("error", text))
+
+class StreamSink:
+    """스트리밍 회의록 생성 시 조각을 받는 객체 (MinutesStream과 같은 인터페이스)"""
+
+    def __init__(self):
+        self.parts = []
+
+    def on_text(self, text):
+        self.parts.append(text)
+
+    def reset(self):
+        self.parts = []
+
+class NamedBytesIO(io.BytesIO):
+    """Streamlit 업로드 파일처럼 name 속성이 있는 메모리 파일"""
+
+    def __init__(self, data, name):
+        super().__init__(data)
+        self.name = name
+
+def percentile(values, ratio):
+    """nearest-rank 백분위수"""
+    ordered = sorted(values)
+    if not ordered:
+        return None
+    index = max(0, min(len(ordered) - 1, int(round(ratio * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+def summarize_latencies(values):
+    return {
+        "count": len(values),
+        "mean": sum(values) / len(values) if values else None,
+        "min": min(values) if values else None,
+        "p50": percentile(values, 0.5),
+        "p90": percentile(values, 0.9),
+        "p99": percentile(values, 0.99),
+        "max": max(values) if values else None,
+    }
+
+def measure(case, params, func, iterations, concurrency, server, bytes_per_op=0):
+    """
+    한 측정 항목 실행
+
+    func()는 단계별 처리 시간(초) dict를 반환합니다. 순차 실행으로 지연 시간을,
+    동시 실행으로 처리량을, tracemalloc을 켠 별도 실행으로 최대 메모리를 측정합니다.
+    """
+    func()  # 준비 실행 (연결 생성, 모듈 초기화)
+    server.reset_counts()
+
+    latencies = []
+    stages = {}
+    for _ in range(iterations):
+        started = time.perf_counter()
+        stage_times = func()
+        latencies.append(time.perf_counter() - started)
+        for stage, seconds in stage_times.items():
+            stages.setdefault(stage, []).append(seconds)
+    requests = server.reset_counts()
+
+    # 처리량 (동시 실행)
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(lambda _: func(), range(iterations)))
+    elapsed = time.perf_counter() - started
+
+    # 최대 메모리 (Python 할당 기준)
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    server.reset_counts()
+
+    result = {
+        "case": case,
+        "params": params,
+        "iterations": iterations,
+        "latency": summarize_latencies(latencies),
+        "stages": {stage: summarize_latencies(values) for stage, values in stages.items()},
+        "throughput": {
+            "concurrency": concurrency,
+            "ops_per_sec": iterations / elapsed if elapsed else None,
+            "bytes_per_sec": bytes_per_op * iterations / elapsed if elapsed and bytes_per_op else None,
+        },
+        "peak_memory_bytes": peak,
+        "stub_requests": requests,
+    }
+    print(f"{case} {json.dumps(params, ensure_ascii=False)}: p50 {result['latency']['p50']:.3f}s, "
+          f"{result['throughput']['ops_per_sec']:.2f} ops/s, peak {peak / 1024 / 1024:.1f}MB", file=sys.stderr)
+    return result
+
+def timed(stage_times, stage, func, *args, **kwargs):
+    started = time.perf_counter()
+    try:
+        return func(*args, **kwargs)
+    finally:
+        stage_times[stage] = time.perf_counter() - started
+
+def bench_update_full_transcript(args, server):
+    from modules.utils import format_transcript
+
+    results = []
+    for count in args.entry_counts:
+        entries = make_entries(count, args.entry_chars)
+
+        def run():
+            stage_times = {}
+            timed(stage_times, "format", format_transcript, entries)
+            return stage_times
+
+        results.append(measure("update_full_transcript", {"entries": count, "entry_chars": args.entry_chars},
+                               run, args.iterations, args.concurrency, server))
+    return results
+
+def bench_audio(args, server, work_dir):
+    import modules.text_conversion as text_conversion
+    from modules.utils import spool_upload
+
+    results = []
+    for size_mb in args.audio_sizes:
+        wav_path = os.path.join(work_dir, f"meeting_{size_mb}mb.wav")
+        duration = make_wav(wav_path, size_mb)
+        file_size = os.path.getsize(wav_path)
+        with open(wav_path, "rb") as f:
+            wav_bytes = f.read()
+
+        for engine in args.engines:
+            params = {"audio_mb": size_mb, "duration_sec": round(duration, 1), "engine": engine,
+                      "diarization": True}
+
+            def convert():
+                # transcribe_audio는 처리 후 입력 파일을 삭제하므로 복사본 사용
+                stage_times = {}
+                fd, tmp_path = tempfile.mkstemp(dir=work_dir, suffix=".wav")
+                os.close(fd)
+                shutil.copyfile(wav_path, tmp_path)
+                text, _ = timed(stage_times, "transcribe", text_conversion.transcribe_audio,
+                                tmp_path, "meeting.wav", "bench", engine, True, "bench-secret", ui=QuietUI())
+                if not text:
+                    raise RuntimeError("변환 결과가 비어 있습니다.")
+                return stage_times
+
+            def process():
+                stage_times = {}
+                upload = NamedBytesIO(wav_bytes, "meeting.wav")
+                tmp_path, audio_hash, _ = timed(stage_times, "spool", spool_upload, upload)
+                text, _ = timed(stage_times, "transcribe", text_conversion.transcribe_audio,
+                                tmp_path, "meeting.wav", audio_hash, engine, True, "bench-secret", ui=QuietUI())
+                if not text:
+                    raise RuntimeError("변환 결과가 비어 있습니다.")
+                return stage_times
+
+            results.append(measure("convert_audio_to_text", params, convert, args.iterations,
+                                   args.concurrency, server, bytes_per_op=file_size))
+            results.append(measure("process_audio_file", params, process, args.iterations,
+                                   args.concurrency, server, bytes_per_op=file_size))
+    return results
+
+def bench_generate_minutes(args, server, work_dir):
+    from modules.clients import get_anthropic_client
+    from modules.minutes_generator import summarize_transcript, render_minutes_markdown
+
+    claude_client = get_anthropic_client()
+    results = []
+    for length in args.transcript_lengths:
+        full_transcript = make_transcript(length)
+        for model in args.models:
+            for streaming in (False, True):
+                params = {"transcript_chars": len(full_transcript), "model": model, "streaming": streaming}
+
+                def run():
+                    stage_times = {}
+                    summary, _ = timed(stage_times, "summarize", summarize_transcript, full_transcript, model,
+                                       claude_client, ui=QuietUI(),
+                                       minutes_stream=StreamSink() if streaming else None)
+                    content = timed(stage_times, "render", render_minutes_markdown,
+                                    "회의", "2024-01-01", summary, full_transcript)
+                    fd, path = tempfile.mkstemp(dir=work_dir, suffix=".md")
+                    try:
+                        with os.fdopen(fd, "w", encoding="utf-8") as f:
+                            timed(stage_times, "save", f.write, content)
+                    finally:
+                        os.unlink(path)
+                    return stage_times
+
+                results.append(measure("generate_minutes", params, run, args.iterations, args.concurrency,
+                                       server, bytes_per_op=len(full_transcript.encode("utf-8"))))
+    return results
+
+def compare_with_baseline(results, baseline_path, max_regression):
+    """
+    이전 결과와 항목별 p50 지연 시간 비교
+
+    Returns:
+    list: 기준보다 max_regression 비율 이상 느려진 항목 설명 목록
+    """
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+
+    def key(result):
+        return result["case"], json.dumps(result["params"], sort_keys=True)
+
+    previous = {key(result): result for result in baseline.get("results", [])}
+    regressions = []
+    for result in results:
+        old = previous.get(key(result))
+        if not old or not old["latency"]["p50"]:
+            continue
+        ratio = result["latency"]["p50"] / old["latency"]["p50"] - 1
+        result["regression"] = ratio
+        if ratio > max_regression:
+            regressions.append(f"{result['case']} {json.dumps(result['params'], ensure_ascii=False)}: "
+                               f"p50 {old['latency']['p50']:.3f}s → {result['latency']['p50']:.3f}s (+{ratio:.0%})")
+    return regressions
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="로컬 대체 서버로 회의록 파이프라인 성능을 측정합니다.")
+    parser.add_argument("--output", help="결과 JSON 파일 경로 (기본: 표준 출력)")
+    parser.add_argument("--baseline", help="비교할 이전 결과 JSON 파일")
+    parser.add_argument("--max-regression", type=float, default=0.2, help="허용하는 p50 지연 증가 비율")
+    parser.add_argument("--suite", nargs="+", default=["transcript", "audio", "minutes"],
+                        choices=["transcript", "audio", "minutes"], help="실행할 측정 항목")
+    parser.add_argument("--iterations", type=int, default=5, help="항목별 반복 횟수")
+    parser.add_argument("--concurrency", type=int, default=4, help="처리량 측정 시 동시 실행 수")
+    parser.add_argument("--entry-counts", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--entry-chars", type=int, default=2000, help="텍스트 항목 하나의 글자 수")
+    parser.add_argument("--audio-sizes", type=float, nargs="+", default=[1, 8, 32], help="오디오 크기(MB)")
+    parser.add_argument("--engines", nargs="+", default=["clova", "whisper"], choices=["clova", "whisper"])
+    parser.add_argument("--transcript-lengths", type=int, nargs="+", default=[5000, 20000, 80000])
+    parser.add_argument("--models", nargs="+", default=["claude", "openai"], choices=["claude", "openai"])
+    # 대체 서버 동작
+    parser.add_argument("--stt-latency", type=float, default=0.2, help="음성 변환 응답 지연(초)")
+    parser.add_argument("--llm-latency", type=float, default=0.1, help="LLM 응답 지연(초)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="응답 지연에 더할 무작위 시간 최댓값(초)")
+    parser.add_argument("--clova-completion", choices=["sync", "async"], default=None,
+                        help="클로바 인식 방식 (기본: CLOVA_COMPLETION_MODE 설정)")
+    parser.add_argument("--clova-error-rate", type=float, default=0.0, help="클로바 오류 비율 (Whisper 대체 경로 측정)")
+    parser.add_argument("--llm-error-rate", type=float, default=0.0, help="기본 LLM 오류 비율 (대체 모델 경로 측정)")
+    parser.add_argument("--stt-chars-per-mb", type=int, default=3000, help="업로드 1MB당 음성 변환 결과 글자 수")
+    parser.add_argument("--llm-response-chars", type=int, default=3000, help="LLM 응답 글자 수")
+    parser.add_argument("--stream-interval", type=float, default=0.0, help="스트리밍 조각 사이 지연(초)")
+    parser.add_argument("--provider-max-concurrency", type=int, default=0,
+                        help="제공자별 동시 처리 한도 (넘으면 429 응답, 요청 제한 동작 측정, 0이면 제한 없음)")
+    parser.add_argument("--retry-after", type=float, default=1.0, help="429 응답의 Retry-After(초)")
+    parser.add_argument("--single-flight", action="store_true",
+                        help="동일 요청 합치기 사용 (동시 실행 시 같은 입력의 API 호출을 한 번으로 합친 처리량 측정)")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    work_dir = tempfile.mkdtemp(prefix="meetingnotes-bench-")
+
+    configs = {
+        "clova": StubConfig(latency=args.stt_latency, jitter=args.jitter, error_rate=args.clova_error_rate,
+                            chars_per_mb=args.stt_chars_per_mb, max_concurrency=args.provider_max_concurrency,
+                            retry_after=args.retry_after),
+        "openai": StubConfig(latency=args.llm_latency, jitter=args.jitter, chars_per_mb=args.stt_chars_per_mb,
+                             response_chars=args.llm_response_chars, stream_interval=args.stream_interval,
+                             max_concurrency=args.provider_max_concurrency, retry_after=args.retry_after),
+        "anthropic": StubConfig(latency=args.llm_latency, jitter=args.jitter, error_rate=args.llm_error_rate,
+                                response_chars=args.llm_response_chars, stream_interval=args.stream_interval,
+                                max_concurrency=args.provider_max_concurrency, retry_after=args.retry_after),
+    }
+
+    with StubServer(configs) as server:
+        # 클라이언트가 처음 만들어지기 전에 대체 서버 주소와 시험용 키를 설정하고, 결과 캐시는 끔
+        os.environ.update(server.environ())
+        os.environ["OPENAI_API_KEY"] = "bench-openai-key"
+        os.environ["CLAUDE_API_KEY"] = "bench-claude-key"
+        os.environ.setdefault("MEETINGNOTES_DATA_DIR", os.path.join(work_dir, "data"))
+        import modules.text_conversion as text_conversion
+        import modules.minutes_generator as minutes_generator
+        import modules.single_flight as single_flight
+        text_conversion.TRANSCRIPT_CACHE_ENABLED = False
+        minutes_generator.SUMMARY_CACHE_ENABLED = False
+        # 같은 입력을 동시에 처리하는 측정이므로 동일 요청 합치기는 지정한 경우에만 사용
+        single_flight.SINGLE_FLIGHT_ENABLED = args.single_flight
+        if args.clova_completion:
+            text_conversion.CLOVA_COMPLETION_MODE = args.clova_completion
+        # 단계별 처리 시간 로그는 결과 JSON과 섞이지 않도록 끔
+        logging.getLogger("meetingnotes.timing").setLevel(logging.WARNING)
+
+        results = []
+        try:
+            if "transcript" in args.suite:
+                results += bench_update_full_transcript(args, server)
+            if "audio" in args.suite:
+                results += bench_audio(args, server, work_dir)
+            if "minutes" in args.suite:
+                results += bench_generate_minutes(args, server, work_dir)
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    from modules.audio_processing import PYDUB_AVAILABLE
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "pydub": PYDUB_AVAILABLE,
+            "args": vars(args),
+        },
+        "stub": {provider: config.to_dict() for provider, config in configs.items()},
+        "results": results,
+    }
+
+    regressions = []
+    if args.baseline:
+        regressions = compare_with_baseline(results, args.baseline, args.max_regression)
+        report["regressions"] = regressions
+
+    output = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output)
+    else:
+        print(output)
+
+    for line in regressions:
+        print(f"성능 저하: {line}", file=sys.stderr)
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,153 @@
+"""
+앱 시작 시간 측정 (측정마다 새 Python 프로세스 사용, 결과는 JSON으로 출력)
+
+scale-to-zero 환경에서는 첫 사용자의 요청이 프로세스 시작 비용을 그대로 기다리므로
+이미 모듈을 불러온 프로세스가 아니라 매번 새 프로세스에서 측정합니다.
+
+측정 대상:
+- startup_import : streamlit을 불러온 뒤 첫 화면에서 사용하는 앱 모듈 import 시간
+- first_render   : AppTest로 app.py를 처음 실행하는 시간 (앱 모듈 import 포함)
+- rerun          : 같은 세션에서 app.py를 다시 실행하는 시간
+
+항목마다 측정이 끝난 시점에 불러와져 있던 제공자 SDK 모듈(sdk_loaded)도 함께 기록합니다.
+
+사용 예:
+    python -m benchmarks.startup --output startup.json
+    python -m benchmarks.startup --baseline startup.json --max-regression 0.2   # 이전 결과보다 20% 이상 느려지면 실패
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import subprocess
+import tempfile
+
+# 첫 화면에 필요하지 않아야 하는 제공자 SDK/오디오 모듈
+SDK_MODULES = ("openai", "anthropic", "httpx", "requests", "pydub", "numpy", "redis")
+# app.py가 첫 화면에서 사용하는 앱 모듈
+APP_MODULES = ("modules.upload", "modules.text_conversion", "modules.text_management", "modules.utils",
+               "modules.metrics")
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def loaded_sdks():
+    return [name for name in SDK_MODULES if name in sys.modules]
+
+def probe_import():
+    """앱 모듈 import 시간 측정 (새 프로세스에서 실행)"""
+    import importlib
+    import streamlit  # noqa: F401 - Streamlit 자체 import 시간은 제외
+
+    started = time.perf_counter()
+    for name in APP_MODULES:
+        importlib.import_module(name)
+    return {"seconds": time.perf_counter() - started, "sdk_loaded": loaded_sdks()}
+
+def probe_render():
+    """app.py 첫 실행과 재실행 시간 측정 (새 프로세스에서 실행)"""
+    from streamlit.testing.v1 import AppTest
+
+    app = AppTest.from_file(os.path.join(PROJECT_DIR, "app.py"), default_timeout=60)
+    started = time.perf_counter()
+    app.run()
+    first_render = time.perf_counter() - started
+    if app.exception:
+        raise RuntimeError(f"app.py 실행 오류: {app.exception[0].value}")
+
+    started = time.perf_counter()
+    app.run()
+    rerun = time.perf_counter() - started
+    return {"first_render": first_render, "rerun": rerun, "sdk_loaded": loaded_sdks()}
+
+def run_probe(kind, data_dir):
+    """새 Python 프로세스에서 측정 하나 실행 후 결과 반환"""
+    env = dict(os.environ)
+    # API 키가 있어야 첫 화면 전체가 그려짐 (실제 요청은 보내지 않음)
+    env.setdefault("OPENAI_API_KEY", "bench-openai-key")
+    env.setdefault("CLAUDE_API_KEY", "bench-claude-key")
+    env["MEETINGNOTES_DATA_DIR"] = data_dir
+    completed = subprocess.run(
+        [sys.executable, "-m", "benchmarks.startup", "--probe", kind],
+        cwd=PROJECT_DIR, env=env, capture_output=True, text=True, check=True
+    )
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+def make_result(case, values, iterations, sdk_loaded):
+    from benchmarks.run import summarize_latencies
+
+    result = {
+        "case": case,
+        "params": {},
+        "iterations": iterations,
+        "latency": summarize_latencies(values),
+        "sdk_loaded": sdk_loaded,
+    }
+    print(f"{case}: p50 {result['latency']['p50']:.3f}s, SDK {', '.join(sdk_loaded) or '없음'}", file=sys.stderr)
+    return result
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="새 프로세스에서 앱 모듈 import와 첫 화면 표시 시간을 측정합니다.")
+    parser.add_argument("--output", help="결과 JSON 파일 경로 (기본: 표준 출력)")
+    parser.add_argument("--baseline", help="비교할 이전 결과 JSON 파일")
+    parser.add_argument("--max-regression", type=float, default=0.2, help="허용하는 p50 지연 증가 비율")
+    parser.add_argument("--iterations", type=int, default=5, help="항목별 반복 횟수 (반복마다 새 프로세스)")
+    parser.add_argument("--probe", choices=["import", "render"], help=argparse.SUPPRESS)
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.probe:
+        # 측정용 자식 프로세스: 결과 한 줄만 출력
+        print(json.dumps(probe_import() if args.probe == "import" else probe_render()))
+        return 0
+
+    from benchmarks.run import compare_with_baseline
+
+    imports, first_renders, reruns = [], [], []
+    import_sdks, render_sdks = [], []
+    with tempfile.TemporaryDirectory(prefix="meetingnotes-startup-") as data_dir:
+        for _ in range(args.iterations):
+            probe = run_probe("import", data_dir)
+            imports.append(probe["seconds"])
+            import_sdks = probe["sdk_loaded"]
+
+            probe = run_probe("render", data_dir)
+            first_renders.append(probe["first_render"])
+            reruns.append(probe["rerun"])
+            render_sdks = probe["sdk_loaded"]
+
+    results = [
+        make_result("startup_import", imports, args.iterations, import_sdks),
+        make_result("first_render", first_renders, args.iterations, render_sdks),
+        make_result("rerun", reruns, args.iterations, render_sdks),
+    ]
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "args": vars(args),
+        },
+        "results": results,
+    }
+
+    regressions = []
+    if args.baseline:
+        regressions = compare_with_baseline(results, args.baseline, args.max_regression)
+        report["regressions"] = regressions
+
+    output = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output)
+    else:
+        print(output)
+
+    for line in regressions:
+        print(f"성능 저하: {line}", file=sys.stderr)
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,428 @@
+"""
+로컬 대체 API 서버 (클로바 스피치, OpenAI, Anthropic 응답 형식 흉내)
+
+실제 서비스에 요청하지 않고 응답 지연, 오류, 응답 크기를 조절하면서 파이프라인을 측정하기 위해 사용합니다.
+하나의 서버가 다음 경로를 모두 처리합니다.
+
+- POST {클로바 Invoke URL}/recognizer/upload  : 클로바 스피치 (경로 끝부분으로 판단)
+- GET  {클로바 Invoke URL}/recognizer/{토큰}   : 클로바 스피치 비동기 인식 결과 확인
+- POST /v1/audio/transcriptions               : OpenAI Whisper
+- POST /v1/chat/completions                   : OpenAI Chat (stream 지원)
+- POST /v1/messages                           : Anthropic Messages (stream 지원)
+"""
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+SAMPLE_SENTENCES = [
+    "이번 분기 일정은 다음 주까지 확정하겠습니다.",
+    "예산 관련해서는 재무팀과 한 번 더 논의가 필요합니다.",
+    "고객 피드백을 반영해서 화면 구성을 수정하기로 했습니다.",
+    "테스트 일정이 조금 늦어질 수 있다는 점 공유드립니다.",
+    "담당자는 금요일까지 초안을 작성해서 공유해 주세요.",
+]
+
+# 클로바 업로드 요청의 params 부분에서 비동기 방식 여부 확인
+CLOVA_ASYNC_PATTERN = re.compile(rb'"completion"\s*:\s*"async"')
+
+class StubConfig:
+    """
+    제공자 하나의 응답 동작 설정
+
+    Parameters:
+    latency (float): 응답 전 대기 시간(초)
+    jitter (float): 대기 시간에 더할 무작위 시간의 최댓값(초)
+    error_rate (float): 오류 응답 비율 (0~1)
+    error_status (int): 오류 응답 상태 코드
+    response_chars (int): 응답 텍스트 길이 (LLM 응답, 음성 변환 결과)
+    chars_per_mb (int): 음성 변환 결과 길이를 업로드 크기에 비례시킬 때 1MB당 글자 수 (0이면 response_chars 사용)
+    stream_chunk_chars (int): 스트리밍 응답 조각 하나의 글자 수
+    stream_interval (float): 스트리밍 응답 조각 사이 대기 시간(초)
+    max_concurrency (int): 동시에 처리하는 최대 요청 수 (넘으면 429와 Retry-After 응답, 0이면 제한 없음)
+    retry_after (float): 429 응답의 Retry-After(초)
+    """
+
+    def __init__(self, latency=0.0, jitter=0.0, error_rate=0.0, error_status=500, response_chars=2000,
+                 chars_per_mb=0, stream_chunk_chars=20, stream_interval=0.0, max_concurrency=0, retry_after=1.0):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.response_chars = response_chars
+        self.chars_per_mb = chars_per_mb
+        self.stream_chunk_chars = stream_chunk_chars
+        self.stream_interval = stream_interval
+        self.max_concurrency = max_concurrency
+        self.retry_after = retry_after
+
+    def to_dict(self):
+        return dict(self.__dict__)
+
+def make_text(length, seed=0):
+    """지정한 길이의 한국어 회의 문장 생성"""
+    rng = random.Random(seed)
+    parts = []
+    total = 0
+    while total < length:
+        sentence = rng.choice(SAMPLE_SENTENCES)
+        parts.append(sentence)
+        total += len(sentence) + 1
+    return " ".join(parts)[:length]
+
+class StubRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # 연결 재사용 (실제 API와 같은 조건)
+
+    def log_message(self, format, *args):
+        pass  # 요청마다 출력하지 않음
+
+    # 공통 처리
+    def _read_body(self, pattern=None):
+        """
+        요청 본문을 읽고 버림 (업로드 파일을 메모리에 모아 두지 않음)
+
+        Returns:
+        int 또는 tuple: 본문 크기 (pattern을 지정하면 (본문 크기, 본문에 pattern이 있는지 여부))
+        """
+        length = int(self.headers.get("Content-Length", 0) or 0)
+        remaining = length
+        found = False
+        tail = b""
+        while remaining > 0:
+            data = self.rfile.read(min(remaining, 1024 * 1024))
+            if not data:
+                break
+            remaining -= len(data)
+            if pattern is not None and not found:
+                # 읽기 단위 경계에 걸친 경우도 찾도록 앞 조각의 끝부분을 붙여서 확인
+                found = pattern.search(tail + data) is not None
+                tail = data[-64:]
+        return (length, found) if pattern is not None else length
+
+    def _read_json(self):
+        length = int(self.headers.get("Content-Length", 0) or 0)
+        body = self.rfile.read(length) if length else b""
+        try:
+            return json.loads(body or b"{}"), length
+        except ValueError:
+            return {}, length
+
+    def _send_json(self, status, payload, headers=None):
+        data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _start_stream(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+
+    def _send_event(self, data, event=None):
+        message = ""
+        if event:
+            message += f"event: {event}\n"
+        message += f"data: {data if isinstance(data, str) else json.dumps(data, ensure_ascii=False)}\n\n"
+        self.wfile.write(message.encode("utf-8"))
+        self.wfile.flush()
+
+    def _delay(self, provider):
+        """설정된 응답 지연 시간(초)"""
+        config = self.server.configs[provider]
+        return config.latency + (random.uniform(0, config.jitter) if config.jitter else 0)
+
+    def _wait_and_maybe_fail(self, provider, wait=True):
+        """설정된 지연 후 오류 응답 여부 결정 (오류를 보냈으면 True)"""
+        config = self.server.configs[provider]
+        # 동시 처리 한도를 넘으면 바로 429 응답 (실제 API의 요청 한도 초과와 같은 형식)
+        if not self.server.enter(provider, config.max_concurrency):
+            self.server.record(provider, throttled=True)
+            self._send_json(429, {
+                "type": "error",
+                "error": {"type": "rate_limit_error", "message": "대체 서버의 동시 요청 한도 초과"}
+            }, headers={"Retry-After": f"{config.retry_after:g}"})
+            return True
+        try:
+            delay = self._delay(provider) if wait else 0
+            if delay > 0:
+                time.sleep(delay)
+        finally:
+            self.server.leave(provider)
+        self.server.record(provider)
+        if config.error_rate and random.random() < config.error_rate:
+            self.server.record(provider, error=True)
+            self._send_json(config.error_status, {
+                "type": "error",
+                "error": {"type": "api_error", "message": "대체 서버에서 발생시킨 오류"}
+            })
+            return True
+        return False
+
+    def _chunks(self, text, size):
+        for start in range(0, len(text), max(1, size)):
+            yield text[start:start + size]
+
+    def do_GET(self):
+        path = self.path.split("?", 1)[0]
+        match = re.search(r"/recognizer/([^/]+)$", path)
+        if match:
+            self._handle_clova_status(match.group(1))
+        else:
+            self._send_json(404, {"error": {"message": f"알 수 없는 경로: {path}"}})
+
+    def do_POST(self):
+        path = self.path.split("?", 1)[0]
+        if path.endswith("/recognizer/upload"):
+            self._handle_clova()
+        elif path.endswith("/audio/transcriptions"):
+            self._handle_whisper()
+        elif path.endswith("/chat/completions"):
+            self._handle_openai_chat()
+        elif path.endswith("/messages"):
+            self._handle_anthropic()
+        else:
+            self._read_body()
+            self._send_json(404, {"error": {"message": f"알 수 없는 경로: {path}"}})
+
+    # 제공자별 응답
+    def _transcript_length(self, config, upload_bytes):
+        if config.chars_per_mb:
+            return max(1, int(config.chars_per_mb * upload_bytes / (1024 * 1024)))
+        return config.response_chars
+
+    def _handle_clova(self):
+        upload_bytes, is_async = self._read_body(CLOVA_ASYNC_PATTERN)
+        # 비동기 방식은 업로드에 바로 응답하고, 응답 지연은 인식에 걸리는 시간으로 사용
+        if self._wait_and_maybe_fail("clova", wait=not is_async):
+            return
+        result = self._clova_result(upload_bytes)
+        if not is_async:
+            self._send_json(200, result)
+            return
+
+        token = uuid.uuid4().hex
+        self.server.add_clova_job(token, time.monotonic() + self._delay("clova"), result)
+        self._send_json(200, {"result": "STARTED", "message": "Started", "token": token})
+
+    def _handle_clova_status(self, token):
+        self.server.record("clova_poll")
+        job = self.server.get_clova_job(token)
+        if job is None:
+            self._send_json(404, {"result": "FAILED", "message": "Not found", "token": token})
+            return
+        ready_at, result = job
+        if time.monotonic() < ready_at:
+            self._send_json(200, {"result": "PROCESSING", "message": "Processing", "token": token})
+            return
+        self._send_json(200, dict(result, token=token))
+
+    def _clova_result(self, upload_bytes):
+        """클로바 인식 완료 응답 생성"""
+        config = self.server.configs["clova"]
+        text = make_text(self._transcript_length(config, upload_bytes))
+
+        # 문장 단위 세그먼트 (두 화자가 번갈아 발화, 시간은 ms 단위)
+        segments = []
+        start = 0
+        for i, sentence in enumerate(text.split(". ")):
+            end = start + 1000 + len(sentence) * 80
+            segments.append({
+                "start": start,
+                "end": end,
+                "text": sentence,
+                "confidence": 0.95,
+                "speaker": {"label": str(i % 2 + 1), "name": "AB"[i % 2]}
+            })
+            start = end
+        return {
+            "result": "COMPLETED",
+            "message": "Succeeded",
+            "text": text,
+            "segments": segments
+        }
+
+    def _handle_whisper(self):
+        upload_bytes = self._read_body()
+        if self._wait_and_maybe_fail("openai"):
+            return
+        config = self.server.configs["openai"]
+        self._send_json(200, {"text": make_text(self._transcript_length(config, upload_bytes))})
+
+    def _handle_openai_chat(self):
+        request, _ = self._read_json()
+        if self._wait_and_maybe_fail("openai"):
+            return
+        config = self.server.configs["openai"]
+        text = make_text(config.response_chars)
+        model = request.get("model", "stub")
+        created = int(time.time())
+
+        if not request.get("stream"):
+            self._send_json(200, {
+                "id": "chatcmpl-stub",
+                "object": "chat.completion",
+                "created": created,
+                "model": model,
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": text},
+                    "finish_reason": "stop"
+                }],
+                "usage": {"prompt_tokens": 0, "completion_tokens": len(text), "total_tokens": len(text)}
+            })
+            return
+
+        self._start_stream()
+        for piece in self._chunks(text, config.stream_chunk_chars):
+            self._send_event({
+                "id": "chatcmpl-stub",
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": model,
+                "choices": [{"index": 0, "delta": {"content": piece}, "finish_reason": None}]
+            })
+            if config.stream_interval:
+                time.sleep(config.stream_interval)
+        self._send_event({
+            "id": "chatcmpl-stub",
+            "object": "chat.completion.chunk",
+            "created": created,
+            "model": model,
+            "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]
+        })
+        self._send_event("[DONE]")
+
+    def _handle_anthropic(self):
+        request, _ = self._read_json()
+        if self._wait_and_maybe_fail("anthropic"):
+            return
+        config = self.server.configs["anthropic"]
+        text = make_text(config.response_chars)
+        model = request.get("model", "stub")
+        usage = {"input_tokens": 0, "output_tokens": len(text)}
+
+        if not request.get("stream"):
+            self._send_json(200, {
+                "id": "msg_stub",
+                "type": "message",
+                "role": "assistant",
+                "model": model,
+                "content": [{"type": "text", "text": text}],
+                "stop_reason": "end_turn",
+                "stop_sequence": None,
+                "usage": usage
+            })
+            return
+
+        self._start_stream()
+        self._send_event({
+            "type": "message_start",
+            "message": {
+                "id": "msg_stub", "type": "message", "role": "assistant", "model": model,
+                "content": [], "stop_reason": None, "stop_sequence": None,
+                "usage": {"input_tokens": 0, "output_tokens": 0}
+            }
+        }, event="message_start")
+        self._send_event({"type": "content_block_start", "index": 0,
+                          "content_block": {"type": "text", "text": ""}}, event="content_block_start")
+        for piece in self._chunks(text, config.stream_chunk_chars):
+            self._send_event({"type": "content_block_delta", "index": 0,
+                              "delta": {"type": "text_delta", "text": piece}}, event="content_block_delta")
+            if config.stream_interval:
+                time.sleep(config.stream_interval)
+        self._send_event({"type": "content_block_stop", "index": 0}, event="content_block_stop")
+        self._send_event({"type": "message_delta", "delta": {"stop_reason": "end_turn", "stop_sequence": None},
+                          "usage": {"output_tokens": len(text)}}, event="message_delta")
+        self._send_event({"type": "message_stop"}, event="message_stop")
+
+class StubServer(ThreadingHTTPServer):
+    """
+    대체 API 서버 (별도 스레드에서 실행)
+
+    사용 예:
+        with StubServer({"clova": StubConfig(latency=0.5)}) as server:
+            os.environ.update(server.environ())
+    """
+    daemon_threads = True
+
+    def __init__(self, configs=None, host="127.0.0.1", port=0):
+        super().__init__((host, port), StubRequestHandler)
+        self.configs = {"clova": StubConfig(), "openai": StubConfig(), "anthropic": StubConfig()}
+        self.configs.update(configs or {})
+        self.counts = {}
+        self.active = {}      # 제공자 -> 처리 중인 요청 수
+        self.clova_jobs = {}  # 작업 토큰 -> (완료 시각, 인식 결과)
+        self._count_lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def environ(self):
+        """애플리케이션이 대체 서버로 요청하도록 설정하는 환경 변수"""
+        return {
+            "CLOVA_INVOKE_URL": f"{self.base_url}/clova",
+            "OPENAI_BASE_URL": f"{self.base_url}/v1",
+            "ANTHROPIC_BASE_URL": self.base_url,
+        }
+
+    def record(self, provider, error=False, throttled=False):
+        """제공자별 요청/오류/요청 한도 초과 횟수 기록"""
+        key = f"{provider}_throttled" if throttled else f"{provider}_errors" if error else f"{provider}_requests"
+        with self._count_lock:
+            self.counts[key] = self.counts.get(key, 0) + 1
+
+    def enter(self, provider, max_concurrency):
+        """요청 처리 시작 (동시 처리 한도를 넘으면 False)"""
+        with self._count_lock:
+            active = self.active.get(provider, 0)
+            if max_concurrency and active >= max_concurrency:
+                return False
+            self.active[provider] = active + 1
+            return True
+
+    def leave(self, provider):
+        with self._count_lock:
+            self.active[provider] -= 1
+
+    def reset_counts(self):
+        with self._count_lock:
+            counts = dict(self.counts)
+            self.counts = {}
+        return counts
+
+    def add_clova_job(self, token, ready_at, result):
+        """클로바 비동기 인식 작업 등록 (ready_at 이후 결과 확인 요청에 완료 응답)"""
+        with self._count_lock:
+            self.clova_jobs[token] = (ready_at, result)
+
+    def get_clova_job(self, token):
+        with self._count_lock:
+            return self.clova_jobs.get(token)
+
+    def start(self):
+        self._thread = threading.Thread(target=self.serve_forever, name="stub-api-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
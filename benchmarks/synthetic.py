@@ -0,0 +1,60 @@
+"""
+벤치마크용 가상 입력 생성 (회의 내용 텍스트, 오디오 파일)
+"""
+import math
+import struct
+import wave
+from datetime import datetime
+
+from benchmarks.stub_server import make_text
+
+SAMPLE_RATE = 16000  # 16kHz 모노 16비트 = 초당 32,000바이트
+
+def make_transcript(length, speakers=3, seed=0):
+    """
+    화자 구분 형식(클로바 변환 결과와 같은 형식)의 회의 내용 생성
+
+    Parameters:
+    length (int): 대략적인 전체 글자 수
+    speakers (int): 화자 수
+    """
+    text = make_text(length, seed=seed)
+    lines = []
+    elapsed = 0
+    for i, sentence in enumerate(text.split(". ")):
+        lines.append(f"화자 {i % speakers + 1} {elapsed // 60:02d}:{elapsed % 60:02d}\n{sentence}\n")
+        elapsed += 3 + len(sentence) // 10
+    return "".join(lines)
+
+def make_entries(count, length_each):
+    """텍스트 항목 목록 생성 (st.session_state.text_entries와 같은 형식)"""
+    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    return [
+        {"timestamp": timestamp, "source": "직접 입력", "text": make_transcript(length_each, seed=i)}
+        for i in range(count)
+    ]
+
+def make_wav(path, size_mb):
+    """
+    지정한 크기의 WAV 파일 생성 (0.7초 음 + 0.3초 무음 반복 - 무음 위치 분할 대상)
+
+    Returns:
+    float: 오디오 길이(초)
+    """
+    tone_samples = int(SAMPLE_RATE * 0.7)
+    pattern = b"".join(
+        struct.pack("<h", int(8000 * math.sin(2 * math.pi * 440 * i / SAMPLE_RATE)))
+        for i in range(tone_samples)
+    ) + b"\x00\x00" * (SAMPLE_RATE - tone_samples)
+
+    total_bytes = int(size_mb * 1024 * 1024)
+    with wave.open(path, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(SAMPLE_RATE)
+        written = 0
+        while written < total_bytes:
+            data = pattern[:total_bytes - written]
+            wav.writeframes(data)
+            written += len(data)
+    return total_bytes / (SAMPLE_RATE * 2)
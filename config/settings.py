@@ -1,17 +1,26 @@
 """
 애플리케이션 설정 모듈
 """
+import os
+import tempfile
 
 # 앱 기본 설정
 APP_TITLE = "통합 회의록 자동화 시스템"
 APP_ICON = "📝"
 SIDEBAR_STATE = "expanded"  # 'expanded' 또는 'collapsed'
 APP_VERSION = "1.0.0"
+STATIC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "static")  # CSS 등 정적 자산
 
 # API 기본 설정
 DEFAULT_SPEECH_TO_TEXT_ENGINE = "clova"  # 'clova' 또는 'whisper'
 DEFAULT_SUMMARY_MODEL = "claude"         # 'claude' 또는 'openai'
 
+# 클로바 스피치 Invoke URL (벤치마크 등에서 로컬 서버로 바꿀 때는 CLOVA_INVOKE_URL 환경 변수 사용)
+CLOVA_INVOKE_URL = os.environ.get(
+    "CLOVA_INVOKE_URL",
+    "https://clovaspeech-gw.ncloud.com/external/v1/10576/25e1436c8b6a648441382ef258197ba987660c32a80bc65b319acad99556b0e9"
+)
+
 # 클로드 모델 설정
 CLAUDE_MODEL = "claude-3-7-sonnet-20250219"
 CLAUDE_MAX_TOKENS = 5000
@@ -24,8 +33,38 @@ OPENAI_TEMPERATURE = 0.3
 
 # 오디오 파일 설정
 ALLOWED_AUDIO_FORMATS = ["mp3", "wav", "m4a", "ogg"]
+UPLOAD_CHUNK_SIZE = 1024 * 1024       # 업로드 파일을 임시 파일로 옮길 때 한 번에 읽는 크기 (1MB)
+UPLOAD_MAX_CONCURRENCY = 4            # 여러 파일을 올렸을 때 동시에 처리할 최대 파일 수 (백그라운드 작업은 JOB_MAX_WORKERS)
 WHISPER_MODEL = "whisper-1"
 DEFAULT_LANGUAGE = "ko"
+WHISPER_MAX_UPLOAD_MB = 25           # Whisper API 업로드 최대 크기(MB)
+
+# 긴 오디오 분할 변환 설정
+AUDIO_SPLIT_ENABLED = True           # 긴 오디오를 구간으로 나누어 동시에 변환할지 여부
+AUDIO_CHUNK_MAX_SEC = 600            # 구간 하나의 최대 길이(초)
+AUDIO_SPLIT_SEARCH_SEC = 30          # 구간 끝에서 무음 분할 지점을 찾을 범위(초)
+AUDIO_SILENCE_MIN_MS = 700           # 분할 지점으로 인정할 최소 무음 길이(ms)
+AUDIO_SILENCE_THRESH_DB = 16         # 평균 음량보다 이 값(dB)만큼 작으면 무음으로 판단
+AUDIO_CHUNK_BITRATE = "64k"          # 분할 구간 mp3 인코딩 비트레이트
+AUDIO_CHUNK_CONCURRENCY = 4          # 동시에 변환할 최대 구간 수
+
+# 업로드 전 음성용 압축 형식 변환 설정 (모노 16kHz로 바꾸어 업로드 크기 축소)
+AUDIO_TRANSCODE_ENABLED = True       # 변환 전에 오디오를 압축 형식으로 바꿀지 여부 (ffmpeg 필요)
+AUDIO_TRANSCODE_FORMAT = "flac"      # "flac" (무손실) 또는 "opus" (손실 압축, 더 작음)
+AUDIO_TRANSCODE_SAMPLE_RATE = 16000  # 음성 인식에 충분한 샘플링 주파수(Hz)
+AUDIO_TRANSCODE_OPUS_BITRATE = "24k" # opus 인코딩 비트레이트
+AUDIO_TRANSCODE_MIN_SAVING = 0.1     # 이 비율 이상 작아질 때만 변환한 파일 사용
+AUDIO_TRANSCODE_TIMEOUT_SEC = 300    # 형식 변환 최대 시간(초)
+
+# 무음/비음성 구간 제거 설정 (긴 무음을 잘라내고 업로드, 시간 표시는 원본 기준 유지)
+AUDIO_TRIM_ENABLED = True            # 변환 전에 긴 무음 구간을 제거할지 여부 (numpy, ffmpeg 필요)
+AUDIO_TRIM_FRAME_MS = 30             # 음량을 계산하는 프레임 길이(ms)
+AUDIO_TRIM_MIN_SILENCE_MS = 2000     # 이 길이(ms) 이상인 무음만 제거 (짧은 쉼은 유지)
+AUDIO_TRIM_PAD_MS = 300              # 발화 앞뒤로 남겨 둘 여유(ms)
+AUDIO_TRIM_MARGIN_DB = 10            # 배경 소음(하위 10% 프레임 음량)보다 이 값(dB) 이상 크면 발화로 판단
+AUDIO_TRIM_MIN_THRESH_DBFS = -55     # 발화 판단 기준 음량의 하한(dBFS)
+AUDIO_TRIM_MAX_THRESH_DBFS = -35     # 발화 판단 기준 음량의 상한(dBFS) - 작은 목소리가 잘리지 않도록 제한
+AUDIO_TRIM_MIN_REMOVED = 0.05        # 전체 길이의 이 비율 이상 제거될 때만 잘라낸 파일 사용
 
 # 시스템 프롬프트
 MINUTES_SYSTEM_PROMPT = """당신은 회의 내용을 구조화된 회의록으로 요약하는 전문가입니다. 
@@ -36,3 +75,147 @@ MINUTES_SYSTEM_PROMPT = """당신은 회의 내용을 구조화된 회의록으
 4) 행동계획(담당자와 마감일). 
 
 참석자 명단, 시간 등 중요 정보를 포함하고, 핵심을 명확하고 객관적으로 요약해 주세요."""
+
+# 긴 회의 분할 요약(map-reduce) 설정
+MINUTES_CHUNKING_ENABLED = True      # 긴 회의 내용을 구간별로 나누어 요약할지 여부
+MINUTES_CHUNK_MAX_CHARS = 12000      # 구간(청크) 하나의 최대 글자 수
+MINUTES_CHUNK_CONCURRENCY = 4        # 동시에 요약할 최대 구간 수
+
+# 구간별 부분 회의록 작성용 프롬프트
+MINUTES_CHUNK_SYSTEM_PROMPT = """당신은 긴 회의의 일부 구간을 요약하는 전문가입니다. 
+주어진 구간에 등장하는 내용만 다음 형식으로 빠짐없이 정리해 주세요: 
+1) 회의 개요(참석자, 시간 등 구간에서 확인되는 정보), 
+2) 주요 논의사항, 
+3) 결정사항, 
+4) 행동계획(담당자와 마감일). 
+
+해당 내용이 없는 항목은 '없음'으로 표시하고, 추측하지 마세요."""
+
+# 회의록 스트리밍 출력 설정
+MINUTES_STREAMING_ENABLED = True     # 생성되는 토큰을 화면에 바로 표시할지 여부 (결과 파일은 생성이 끝난 뒤 한 번 저장)
+MINUTES_STREAM_RENDER_INTERVAL = 0.2 # 화면 갱신 최소 간격(초)
+
+# 영구 데이터 저장 경로 (fly.io 볼륨이 있으면 /data 사용)
+DATA_DIR = os.environ.get(
+    "MEETINGNOTES_DATA_DIR",
+    "/data" if os.path.isdir("/data") else os.path.join(tempfile.gettempdir(), "meetingnotes")
+)
+
+# 세션/결과 저장소 설정 (인스턴스 재시작이나 여러 인스턴스 간 이동 시에도 입력 내용 유지)
+# 'sqlite': DATA_DIR의 SQLite 파일, 'redis': Redis 호환 서버 (여러 인스턴스가 공유), 'memory': 프로세스 메모리
+SESSION_STORE_BACKEND = os.environ.get("SESSION_STORE_BACKEND", "sqlite")
+SESSION_STORE_PATH = os.path.join(DATA_DIR, "sessions.db")
+SESSION_STORE_REDIS_URL = os.environ.get("REDIS_URL", "redis://localhost:6379/0")
+SESSION_STORE_PREFIX = "meetingnotes:"      # Redis 키 접두사
+SESSION_TTL_SEC = 7 * 24 * 60 * 60          # 마지막 변경 후 세션을 보관하는 시간(초)
+SESSION_COOKIE_NAME = "meetingnotes_sid"    # 세션 ID를 기록하는 브라우저 쿠키 (새로고침/재연결 시 세션 복원)
+
+# 세션 메모리 예산 설정 (초과 시 전체 텍스트 캐시 해제 후 큰 텍스트 항목을 압축하여 디스크로 옮김)
+SESSION_MEMORY_BUDGET_BYTES = 8 * 1024 * 1024   # 세션 하나의 세션 상태 최대 메모리 (8MB)
+SESSION_SPILL_MIN_CHARS = 20000                 # 이 글자 수 이상인 텍스트 항목만 디스크로 옮김
+SESSION_SPILL_DIR = os.path.join(DATA_DIR, "session_spill")
+SESSION_SPILL_COMPRESSION_LEVEL = 6             # zlib 압축 수준 (1: 빠름 ~ 9: 작음)
+PROCESSED_FILES_MAX_ENTRIES = 500               # 중복 확인용으로 기억할 최근 처리 파일 수
+ARTIFACT_MAX_PER_SESSION = 3                    # 세션별로 메모리에 보관할 최근 회의록 결과물 수
+SESSION_FOOTPRINT_TTL_SEC = 60 * 60             # 이 시간 동안 실행되지 않은 세션은 사용량 합계에서 제외(초)
+
+# 음성 변환 결과 캐시 설정
+TRANSCRIPT_CACHE_ENABLED = True
+TRANSCRIPT_CACHE_DIR = os.path.join(DATA_DIR, "transcript_cache")
+TRANSCRIPT_CACHE_MAX_BYTES = 200 * 1024 * 1024  # 최대 캐시 용량 (200MB)
+
+# 회의록 요약 결과 캐시 설정
+SUMMARY_CACHE_ENABLED = True
+SUMMARY_CACHE_MAX_ENTRIES = 128                # 메모리에 보관할 최대 회의록 수
+SUMMARY_CACHE_TTL_SEC = 24 * 60 * 60           # 캐시 유효 시간(초)
+SUMMARY_CACHE_PERSIST = False                  # 디스크에도 저장할지 여부
+SUMMARY_CACHE_DIR = os.path.join(DATA_DIR, "summary_cache")
+SUMMARY_CACHE_MAX_BYTES = 50 * 1024 * 1024     # 디스크 캐시 최대 용량 (50MB)
+
+# 백그라운드 작업 설정 (음성 변환, 회의록 생성)
+BACKGROUND_JOBS_ENABLED = True
+JOB_MAX_WORKERS = 4          # 프로세스 전체에서 동시에 실행할 최대 작업 수
+JOB_MAX_QUEUED = 32          # 대기 가능한 최대 작업 수
+JOB_POLL_INTERVAL = 1.0      # 화면에서 작업 상태를 확인하는 간격(초)
+JOB_RESULT_TTL_SEC = 60 * 60 # 완료된 작업 결과 보관 시간(초)
+
+# 동일 요청 합치기 설정 (같은 파일/회의 내용을 여러 세션이 동시에 처리하면 API 호출은 한 번만 하고 결과를 함께 사용)
+SINGLE_FLIGHT_ENABLED = True
+SINGLE_FLIGHT_POLL_SEC = 0.2  # 합류한 요청이 진행 상태와 스트리밍 텍스트를 받아 오는 간격(초)
+
+# API 클라이언트 연결 설정 (프로세스 전체에서 공유)
+HTTP_POOL_MAXSIZE = 20            # 제공자별 최대 동시 연결 수
+HTTP_KEEPALIVE_CONNECTIONS = 10   # 유지할 최대 유휴 연결 수
+HTTP_KEEPALIVE_EXPIRY = 60        # 유휴 연결 유지 시간(초)
+HTTP_CONNECT_TIMEOUT = 10         # 연결 제한 시간(초)
+LLM_READ_TIMEOUT = 300            # 회의록 생성 응답 대기 제한 시간(초)
+STT_READ_TIMEOUT = 900            # 음성 변환 응답 대기 제한 시간(초)
+PROVIDER_MAX_RETRIES = 2          # SDK 자동 재시도 횟수 (연결 오류 등, 요청 제한을 켜면 제한 모듈이 재시도)
+
+# 제공자별 요청 제한 (프로세스 전체 공유, 모든 세션의 요청을 조율)
+# 429/503 응답은 대체 엔진으로 넘기지 않고 Retry-After만큼 기다린 뒤 다시 시도하며, 동시 요청 한도를 줄임(AIMD)
+RATE_LIMIT_ENABLED = True
+# 제공자 -> (초당 요청 수, 순간 최대 요청 수, 시작 동시 요청 한도, 최대 동시 요청 한도)
+PROVIDER_RATE_LIMITS = {
+    "clova": (5.0, 10, 4, 16),
+    "whisper": (5.0, 10, 4, 16),
+    "claude": (2.0, 10, 4, 16),
+    "openai": (5.0, 10, 4, 16),
+}
+RATE_LIMIT_MIN_CONCURRENCY = 1    # 동시 요청 한도 최솟값
+RATE_LIMIT_DECREASE_FACTOR = 0.5  # 과부하 응답 시 동시 요청 한도에 곱하는 비율
+RATE_LIMIT_MAX_RETRIES = 3        # 과부하/일시 오류 재시도 횟수 (초과하면 대체 엔진 사용)
+RATE_LIMIT_BACKOFF_BASE_SEC = 1.0 # 재시도 대기 시간 기준값(초, 시도마다 2배, 무작위 지터 적용)
+RATE_LIMIT_BACKOFF_MAX_SEC = 30.0 # 재시도 대기 시간 최댓값(초)
+RATE_LIMIT_QUEUE_TIMEOUT_SEC = 120  # 요청 순서를 기다리는 최대 시간(초, 초과하면 대체 엔진 사용)
+
+# 클로바 인식 방식 설정
+# 'sync': 인식이 끝날 때까지 업로드 요청 연결을 유지 (기본값)
+# 'async': 업로드 후 작업 토큰을 받고, 공유 스레드 하나가 진행 중인 모든 작업의 결과를 확인
+#          (로컬 대체 서버로만 확인한 방식이므로 실제 클로바 환경에서 확인한 뒤 켜세요)
+CLOVA_COMPLETION_MODE = "sync"
+CLOVA_POLL_INITIAL_SEC = 1.0      # 첫 결과 확인까지 대기 시간(초)
+CLOVA_POLL_BACKOFF = 1.5          # 결과가 없을 때마다 확인 간격을 늘리는 배수
+CLOVA_POLL_MAX_SEC = 15.0         # 최대 확인 간격(초)
+CLOVA_POLL_READ_TIMEOUT = 30      # 결과 확인 요청 하나의 응답 대기 제한 시간(초)
+CLOVA_ASYNC_TIMEOUT_SEC = 1800    # 인식 결과를 기다리는 최대 시간(초)
+
+# 지연 대비 이중 요청(헤징) 설정
+# 'off': 기본 엔진 실패 후에만 대체 엔진 사용
+# 'hedge': 기본 엔진 응답이 지연 시간보다 늦으면 대체 엔진도 함께 요청
+# 'race': 처음부터 두 엔진에 동시에 요청
+STT_HEDGING_MODE = "off"
+STT_HEDGE_DELAY_SEC = 120         # 음성 변환 대체 요청 시작 지연 시간(초)
+LLM_HEDGING_MODE = "off"
+LLM_HEDGE_DELAY_SEC = 15          # 회의록 생성 대체 요청 시작 지연 시간(초, 스트리밍은 첫 응답 기준)
+HEDGE_MAX_WORKERS = 8             # 이중 요청에 사용할 최대 스레드 수
+HEDGE_CANCEL_CHECK_SEC = 0.5      # 진 쪽 요청이 기다리는 동안 중단 여부를 확인하는 간격(초)
+
+# 일괄 처리(batch.py) 설정
+BATCH_MAX_WORKERS = 2             # 동시에 처리할 최대 파일 수
+BATCH_EXECUTOR = "thread"         # 'thread': 스레드 풀, 'process': 프로세스 풀
+BATCH_PROGRESS_FILE = ".batch_progress.json"  # 출력 디렉토리에 저장하는 진행 상태 파일 (이어서 처리용)
+BATCH_REPORT_FILE = "batch_report.json"       # 출력 디렉토리에 저장하는 파일별 처리 시간 보고서
+
+# 처리 시간 측정 설정
+TIMING_LOG_ENABLED = True         # 단계별 처리 시간을 JSON 한 줄 로그로 출력할지 여부
+METRICS_ENABLED = True            # Prometheus 형식 /metrics 엔드포인트 사용 여부
+METRICS_HOST = "0.0.0.0"
+METRICS_PORT = int(os.environ.get("METRICS_PORT", "9091"))  # /metrics 엔드포인트 포트 (fly.toml [metrics]와 동일)
+METRICS_BUCKETS = [0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600]  # 히스토그램 구간(초)
+
+# 텍스트 항목 목록 표시 설정
+TEXT_ENTRIES_PAGE_SIZE = 10       # 한 페이지에 표시할 텍스트 항목 수
+TEXT_ENTRY_PREVIEW_CHARS = 300    # 접힌 항목에 표시할 미리보기 글자 수
+
+# 토큰 수 추정 설정 (화면 표시용 근사치)
+TOKEN_ESTIMATE_HANGUL_PER_TOKEN = 1.0   # 한글 몇 글자당 토큰 1개로 볼지
+TOKEN_ESTIMATE_OTHER_PER_TOKEN = 4.0    # 영문/숫자/공백 등 몇 글자당 토큰 1개로 볼지
+
+# LLM 입력 압축 설정 (회의록 생성 전에 불필요한 토큰 제거, 저장되는 전체 회의 내용은 원본 유지)
+MINUTES_COMPACTION_ENABLED = True
+COMPACTION_TIME_INTERVAL_SEC = 60     # 화자 시간 표시를 남길 최소 간격(초)
+# 항상 제거할 추임새 (단어 전체가 일치할 때만, 정규식)
+COMPACTION_FILLER_PATTERNS = [r"음+", r"으+음+", r"어+", r"아+", r"에+", r"엄+", r"흠+"]
+# 뒤에 쉼표/말줄임표가 붙거나 바로 반복될 때만 제거할 머뭇거림 단어
+COMPACTION_HESITATION_WORDS = ["그", "저", "뭐", "이제", "막", "좀"]
@@ -0,0 +1,242 @@
+"""
+회의록 결과물 모듈 - 세션별로 완성된 회의록을 메모리에 보관하고 내보내기 형식을 필요할 때 한 번만 생성
+
+회의록은 작업 디렉토리에 파일로 쓰지 않고 세션 상태(ArtifactStore)에 보관하므로 재실행 시 파일을 다시 읽지 않으며,
+이름이 같은 회의록을 여러 사용자가 동시에 만들어도 서로 덮어쓰지 않습니다.
+내보내기 형식(Markdown, 텍스트, DOCX, JSON)은 처음 요청할 때 만들고 내용 해시별로 캐시합니다.
+"""
+import hashlib
+import io
+import json
+import re
+import sys
+import threading
+import zipfile
+from collections import OrderedDict
+from xml.sax.saxutils import escape
+from config.settings import ARTIFACT_MAX_PER_SESSION
+
+# 내보내기 형식: 형식 키 -> (표시 이름, 확장자, MIME 형식)
+EXPORT_FORMATS = OrderedDict([
+    ("md", ("Markdown", "md", "text/markdown")),
+    ("txt", ("텍스트", "txt", "text/plain")),
+    ("docx", ("Word (DOCX)", "docx", "application/vnd.openxmlformats-officedocument.wordprocessingml.document")),
+    ("json", ("JSON (4개 항목)", "json", "application/json")),
+])
+
+# 회의록 4개 항목 (JSON 키, 제목에 포함되는 단어)
+MINUTES_SECTIONS = [
+    ("overview", ("개요",)),
+    ("discussion", ("논의",)),
+    ("decisions", ("결정",)),
+    ("action_items", ("행동", "실행", "액션", "할 일", "후속")),
+]
+# 회의록 파일에서 본문과 전체 회의 내용을 나누는 제목 (render_minutes_markdown 형식)
+TRANSCRIPT_HEADING = "\n\n## 전체 회의 내용\n\n"
+# 항목 제목 줄 (예: "## 1. 회의 개요", "**2) 주요 논의사항**", "3. 결정사항:")
+SECTION_HEADING_PATTERN = re.compile(r"^\s*(?:#{1,6}\s*)?(?:\*\*)?\s*(?:\d+[.)]|[IVX]+\.)?\s*(.{1,30}?)\s*(?:\*\*)?\s*:?\s*$")
+
+def split_minutes_sections(summary):
+    """
+    회의록 본문을 4개 항목(개요, 논의사항, 결정사항, 행동계획)으로 나누기
+
+    Returns:
+    dict: JSON 키 -> 항목 내용 (찾지 못한 항목은 빈 문자열)
+    """
+    sections = {key: [] for key, _ in MINUTES_SECTIONS}
+    current = None
+    for line in summary.splitlines():
+        match = SECTION_HEADING_PATTERN.match(line)
+        if match:
+            title = match.group(1)
+            key = next((key for key, words in MINUTES_SECTIONS if any(word in title for word in words)), None)
+            if key is not None:
+                current = key
+                continue
+        if current is not None:
+            sections[current].append(line)
+    return {key: "\n".join(lines).strip() for key, lines in sections.items()}
+
+def markdown_to_text(markdown):
+    """마크다운 서식 기호를 제거한 일반 텍스트로 변환"""
+    lines = []
+    for line in markdown.splitlines():
+        line = re.sub(r"^\s*#{1,6}\s*", "", line)
+        line = re.sub(r"\*\*(.+?)\*\*|__(.+?)__", lambda m: m.group(1) or m.group(2), line)
+        line = re.sub(r"\[([^\]]+)\]\([^)]+\)", r"\1", line)
+        line = re.sub(r"^(\s*)[-*+]\s+", r"\1• ", line)
+        lines.append(line)
+    return "\n".join(lines)
+
+DOCX_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/word/document.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+    '</Types>'
+)
+DOCX_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="word/document.xml"/>'
+    '</Relationships>'
+)
+# 제목 수준별 글자 크기 (반 포인트 단위)
+DOCX_HEADING_SIZES = {1: 36, 2: 30, 3: 26}
+
+def docx_paragraph(text, bold=False, size=None):
+    """DOCX 문단 XML 하나 생성 (**굵게** 구간은 굵은 글씨로)"""
+    runs = []
+    for i, part in enumerate(re.split(r"\*\*(.+?)\*\*", text)):
+        if not part:
+            continue
+        properties = ""
+        if bold or i % 2 == 1:
+            properties += "<w:b/>"
+        if size:
+            properties += f'<w:sz w:val="{size}"/>'
+        runs.append(f'<w:r><w:rPr>{properties}</w:rPr><w:t xml:space="preserve">{escape(part)}</w:t></w:r>')
+    return f"<w:p>{''.join(runs)}</w:p>"
+
+def markdown_to_docx(markdown):
+    """
+    마크다운을 DOCX 파일(바이트)로 변환
+
+    별도 패키지 없이 표준 라이브러리(zipfile)로 최소 구성의 문서를 만들며,
+    제목은 굵은 큰 글씨, 목록은 글머리 기호 문단으로 표시합니다.
+    """
+    paragraphs = []
+    for line in markdown.splitlines():
+        heading = re.match(r"^(#{1,6})\s*(.*)$", line)
+        if heading:
+            level = len(heading.group(1))
+            paragraphs.append(docx_paragraph(heading.group(2), bold=True, size=DOCX_HEADING_SIZES.get(level, 24)))
+        else:
+            paragraphs.append(docx_paragraph(re.sub(r"^(\s*)[-*+]\s+", r"\1• ", line)))
+
+    document = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+        f"<w:body>{''.join(paragraphs)}<w:sectPr/></w:body></w:document>"
+    )
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as docx:
+        docx.writestr("[Content_Types].xml", DOCX_CONTENT_TYPES)
+        docx.writestr("_rels/.rels", DOCX_RELS)
+        docx.writestr("word/document.xml", document)
+    return buffer.getvalue()
+
+class MinutesArtifact:
+    """
+    완성된 회의록 하나 (마크다운 원본과 형식별 내보내기 결과 캐시)
+
+    Parameters:
+    file_stem (str): 내려받을 파일 이름 (확장자 제외)
+    markdown (str): 회의록 파일 내용 (render_minutes_markdown 결과)
+    """
+
+    def __init__(self, file_stem, markdown):
+        self.file_stem = file_stem
+        self.markdown = markdown
+        self.content_hash = hashlib.sha256(markdown.encode("utf-8")).hexdigest()
+        self._exports = {}  # 형식 키 -> 바이트
+        self._lock = threading.Lock()
+
+    def file_name(self, fmt):
+        return f"{self.file_stem}.{EXPORT_FORMATS[fmt][1]}"
+
+    def export(self, fmt):
+        """
+        형식별 파일 내용 반환 (처음 요청할 때만 만들고 이후에는 캐시 사용)
+
+        Parameters:
+        fmt (str): EXPORT_FORMATS의 형식 키
+
+        Returns:
+        bytes 또는 str: 파일 내용 (Markdown은 사본을 만들지 않고 원본 문자열 반환)
+        """
+        if fmt == "md":
+            return self.markdown
+        with self._lock:
+            data = self._exports.get(fmt)
+            if data is None:
+                data = self._exports[fmt] = self._render(fmt)
+            return data
+
+    def _render(self, fmt):
+        if fmt == "txt":
+            return markdown_to_text(self.markdown).encode("utf-8")
+        if fmt == "docx":
+            return markdown_to_docx(self.markdown)
+        if fmt == "json":
+            # 제목 줄과 전체 회의 내용을 제외한 회의록 본문에서 항목 추출
+            summary = self.markdown.split(TRANSCRIPT_HEADING, 1)[0].split("\n\n", 1)[-1]
+            return json.dumps({
+                "title": self.file_stem,
+                "sections": split_minutes_sections(summary),
+            }, ensure_ascii=False, indent=2).encode("utf-8")
+        raise ValueError(f"지원하지 않는 형식입니다: {fmt}")
+
+    def cached_bytes(self):
+        """보관 중인 내용과 내보내기 결과의 메모리 크기(바이트)"""
+        with self._lock:
+            exports = sum(sys.getsizeof(data) for data in self._exports.values())
+        return sys.getsizeof(self.markdown) + exports
+
+    def release_exports(self):
+        """마크다운 원본을 제외한 내보내기 결과 해제 (다시 요청하면 새로 만듦), 해제한 크기(바이트) 반환"""
+        with self._lock:
+            freed = sum(sys.getsizeof(data) for data in self._exports.values())
+            self._exports.clear()
+        return freed
+
+class ArtifactStore:
+    """
+    세션 하나의 회의록 결과물 보관소 (내용 해시 -> MinutesArtifact, 최근 ARTIFACT_MAX_PER_SESSION개)
+
+    같은 내용의 회의록을 다시 저장하면 기존 결과물과 내보내기 캐시를 그대로 사용합니다.
+    """
+
+    def __init__(self, max_items=ARTIFACT_MAX_PER_SESSION):
+        self.max_items = max_items
+        self.current = None  # 현재 표시 중인 회의록의 내용 해시
+        self._items = OrderedDict()
+
+    def put(self, file_stem, markdown):
+        """회의록 결과물 등록 후 현재 결과물로 지정하고 반환"""
+        artifact = MinutesArtifact(file_stem, markdown)
+        artifact = self._items.setdefault(artifact.content_hash, artifact)
+        self._items.move_to_end(artifact.content_hash)
+        while len(self._items) > self.max_items:
+            self._items.popitem(last=False)
+        self.current = artifact.content_hash
+        return artifact
+
+    def get_current(self):
+        """현재 결과물 반환 (없으면 None)"""
+        return self._items.get(self.current) if self.current else None
+
+    def clear(self):
+        self._items.clear()
+        self.current = None
+
+    def cached_bytes(self):
+        return sum(artifact.cached_bytes() for artifact in self._items.values())
+
+    def release(self):
+        """
+        메모리가 부족할 때 현재 결과물이 아닌 항목과 모든 내보내기 캐시 해제
+
+        Returns:
+        int: 해제한 메모리 크기(바이트)
+        """
+        freed = 0
+        for content_hash in [key for key in self._items if key != self.current]:
+            freed += self._items.pop(content_hash).cached_bytes()
+        for artifact in self._items.values():
+            freed += artifact.release_exports()
+        return freed
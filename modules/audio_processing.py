@@ -0,0 +1,344 @@
+"""
+오디오 전처리 모듈 (긴 오디오 분할 등)
+
+pydub과 numpy는 import 비용이 크므로 설치 여부만 미리 확인하고, 오디오를 처음 처리할 때 함수 안에서 import합니다.
+"""
+import bisect
+import importlib.util
+import os
+import subprocess
+import tempfile
+import time
+from config.settings import (
+    WHISPER_MAX_UPLOAD_MB, AUDIO_CHUNK_MAX_SEC, AUDIO_SPLIT_SEARCH_SEC,
+    AUDIO_SILENCE_MIN_MS, AUDIO_SILENCE_THRESH_DB, AUDIO_CHUNK_BITRATE,
+    AUDIO_TRANSCODE_FORMAT, AUDIO_TRANSCODE_SAMPLE_RATE, AUDIO_TRANSCODE_OPUS_BITRATE,
+    AUDIO_TRANSCODE_MIN_SAVING, AUDIO_TRANSCODE_TIMEOUT_SEC,
+    AUDIO_TRIM_FRAME_MS, AUDIO_TRIM_MIN_SILENCE_MS, AUDIO_TRIM_PAD_MS, AUDIO_TRIM_MARGIN_DB,
+    AUDIO_TRIM_MIN_THRESH_DBFS, AUDIO_TRIM_MAX_THRESH_DBFS, AUDIO_TRIM_MIN_REMOVED
+)
+
+# pydub 설치 여부 (없어도 기본 기능 동작)
+PYDUB_AVAILABLE = importlib.util.find_spec("pydub") is not None
+
+# numpy 설치 여부 (없으면 무음 구간 제거 생략)
+NUMPY_AVAILABLE = importlib.util.find_spec("numpy") is not None
+
+# 압축 형식별 (확장자, ffmpeg 인코딩 옵션) - 클로바와 Whisper 모두 flac/ogg 업로드 지원
+TRANSCODE_CODECS = {
+    "flac": (".flac", ["-c:a", "flac"]),
+    "opus": (".ogg", ["-c:a", "libopus", "-b:a", AUDIO_TRANSCODE_OPUS_BITRATE, "-application", "voip"]),
+}
+# 무음 제거 결과 인코딩 형식 (압축 형식 변환을 거치지 않은 파일은 분할 구간과 같은 mp3 사용)
+TRIM_OUTPUT_CODECS = dict(TRANSCODE_CODECS, mp3=(".mp3", ["-c:a", "libmp3lame", "-b:a", AUDIO_CHUNK_BITRATE]))
+# 16비트 PCM 대비 FLAC 크기 비율 (음성 기준 대략값, 변환 전에 효과를 추정할 때 사용)
+FLAC_SIZE_RATIO = 0.6
+
+def get_audio_duration(file_path):
+    """오디오 길이(초) 반환 - 확인할 수 없으면 0"""
+    if not PYDUB_AVAILABLE:
+        return 0
+    try:
+        from pydub.utils import mediainfo
+        return float(mediainfo(file_path).get("duration", 0) or 0)
+    except Exception:
+        return 0
+
+def needs_split(file_path, duration):
+    """오디오를 구간으로 나누어야 하는지 확인 (길이 또는 업로드 크기 기준)"""
+    file_size_mb = os.path.getsize(file_path) / (1024 * 1024)
+    return duration > AUDIO_CHUNK_MAX_SEC or file_size_mb > WHISPER_MAX_UPLOAD_MB
+
+def find_split_point(window):
+    """
+    구간 끝부분에서 무음 구간의 중간 지점을 찾아 분할 위치(ms) 반환
+
+    Parameters:
+    window (AudioSegment): 현재 구간 오디오
+
+    Returns:
+    int: 분할 위치(ms) - 무음이 없으면 구간 끝
+    """
+    from pydub.silence import detect_silence
+    search_ms = min(len(window), AUDIO_SPLIT_SEARCH_SEC * 1000)
+    tail = window[-search_ms:]
+
+    # 완전 무음 구간은 dBFS가 -inf 이므로 고정값 사용
+    loudness = window.dBFS if window.dBFS != float("-inf") else -50
+    silences = detect_silence(tail, min_silence_len=AUDIO_SILENCE_MIN_MS,
+                              silence_thresh=loudness - AUDIO_SILENCE_THRESH_DB)
+    if not silences:
+        return len(window)
+
+    # 구간 끝에 가장 가까운 무음의 중간 지점에서 자름
+    start, end = silences[-1]
+    return len(window) - search_ms + (start + end) // 2
+
+def split_audio_on_silence(file_path):
+    """
+    긴 오디오를 무음 위치 기준으로 최대 AUDIO_CHUNK_MAX_SEC 길이의 구간으로 분할
+
+    전체 파일을 한 번에 디코딩하지 않고 구간 단위로 읽어 메모리 사용량을 제한합니다.
+
+    Parameters:
+    file_path (str): 원본 오디오 파일 경로
+
+    Returns:
+    list: (구간 파일 경로, 원본 기준 시작 시간(초)) 목록 - 분할이 필요 없으면 원본 하나만 반환
+    """
+    duration = get_audio_duration(file_path)
+    if not PYDUB_AVAILABLE or duration <= 0 or not needs_split(file_path, duration):
+        return [(file_path, 0)]
+    from pydub import AudioSegment
+
+    chunks = []
+    offset = 0.0
+    try:
+        while offset < duration:
+            window = AudioSegment.from_file(file_path, start_second=offset, duration=AUDIO_CHUNK_MAX_SEC)
+            if len(window) == 0:
+                break
+
+            # 마지막 구간이 아니면 무음 위치에서 자름
+            if offset + len(window) / 1000 >= duration:
+                cut = len(window)
+            else:
+                cut = find_split_point(window)
+
+            with tempfile.NamedTemporaryFile(delete=False, suffix=".mp3") as chunk_file:
+                chunk_path = chunk_file.name
+            window[:cut].export(chunk_path, format="mp3", bitrate=AUDIO_CHUNK_BITRATE)
+            chunks.append((chunk_path, offset))
+            offset += cut / 1000
+    except Exception:
+        # 분할 실패 시 원본 그대로 변환
+        remove_temp_files([path for path, _ in chunks])
+        return [(file_path, 0)]
+
+    return chunks
+
+def remove_temp_files(paths):
+    """임시 파일 목록 삭제 (실패는 무시)"""
+    for path in paths:
+        try:
+            os.unlink(path)
+        except Exception:
+            pass
+
+def estimate_transcoded_size(duration):
+    """압축 형식으로 변환했을 때의 예상 크기(바이트)"""
+    if AUDIO_TRANSCODE_FORMAT == "opus":
+        bitrate = int(AUDIO_TRANSCODE_OPUS_BITRATE.rstrip("k")) * 1000
+        return duration * bitrate / 8
+    return duration * AUDIO_TRANSCODE_SAMPLE_RATE * 2 * FLAC_SIZE_RATIO
+
+def transcode_for_upload(file_path):
+    """
+    업로드 전에 오디오를 모노, AUDIO_TRANSCODE_SAMPLE_RATE, 음성용 압축 형식(FLAC/Opus)으로 변환
+
+    ffmpeg가 파일을 직접 읽고 쓰므로 전체 오디오를 메모리에 올리지 않습니다.
+    결과가 원본보다 AUDIO_TRANSCODE_MIN_SAVING 이상 작을 때만 사용하고, 그렇지 않으면 원본 경로를 반환합니다.
+    길이를 알 수 있으면 예상 크기로 먼저 판단하여 이미 압축된 파일(mp3 등)은 변환하지 않습니다.
+
+    Parameters:
+    file_path (str): 원본 오디오 파일 경로
+
+    Returns:
+    tuple: (업로드할 파일 경로, 결과 dict - outcome, bytes_before, bytes_after, bytes_saved, transcode_sec)
+    """
+    bytes_before = os.path.getsize(file_path)
+    result = {
+        "outcome": "skipped",
+        "format": AUDIO_TRANSCODE_FORMAT,
+        "bytes_before": bytes_before,
+        "bytes_after": bytes_before,
+        "bytes_saved": 0,
+        "transcode_sec": 0.0,
+    }
+    if not PYDUB_AVAILABLE or AUDIO_TRANSCODE_FORMAT not in TRANSCODE_CODECS:
+        return file_path, result
+
+    max_size = bytes_before * (1 - AUDIO_TRANSCODE_MIN_SAVING)
+    duration = get_audio_duration(file_path)
+    if duration > 0 and estimate_transcoded_size(duration) >= max_size:
+        result["outcome"] = "not_smaller"
+        return file_path, result
+
+    from pydub import AudioSegment
+    suffix, codec_options = TRANSCODE_CODECS[AUDIO_TRANSCODE_FORMAT]
+    with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as output_file:
+        output_path = output_file.name
+    command = [
+        AudioSegment.converter, "-y", "-nostdin", "-loglevel", "error",
+        "-i", file_path, "-vn", "-ac", "1", "-ar", str(AUDIO_TRANSCODE_SAMPLE_RATE)
+    ] + codec_options + [output_path]
+
+    started = time.perf_counter()
+    try:
+        subprocess.run(command, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                       timeout=AUDIO_TRANSCODE_TIMEOUT_SEC)
+        bytes_after = os.path.getsize(output_path)
+    except Exception as e:
+        # ffmpeg가 없거나 읽을 수 없는 형식, 시간 초과 등 - 원본 그대로 업로드
+        remove_temp_files([output_path])
+        result.update(outcome="failed", error=type(e).__name__)
+        return file_path, result
+    finally:
+        result["transcode_sec"] = time.perf_counter() - started
+
+    if bytes_after == 0 or bytes_after > max_size:
+        remove_temp_files([output_path])
+        result.update(outcome="not_smaller", transcoded_bytes=bytes_after)
+        return file_path, result
+
+    result.update(outcome="applied", bytes_after=bytes_after, bytes_saved=bytes_before - bytes_after)
+    return output_path, result
+
+def detect_speech_regions(samples, sample_rate):
+    """
+    프레임별 음량(RMS)으로 발화 구간 찾기 (numpy 벡터 연산)
+
+    배경 소음 수준에 맞춰 기준 음량을 정하고, 발화 앞뒤로 AUDIO_TRIM_PAD_MS만큼 여유를 둔 뒤
+    AUDIO_TRIM_MIN_SILENCE_MS보다 짧은 무음은 발화 구간에 포함합니다.
+
+    Parameters:
+    samples (numpy.ndarray): 모노 16비트 샘플
+    sample_rate (int): 샘플링 주파수(Hz)
+
+    Returns:
+    list: 남길 구간의 (시작 샘플, 끝 샘플) 목록 - 발화가 없으면 빈 목록
+    """
+    import numpy as np
+    frame_len = max(1, int(sample_rate * AUDIO_TRIM_FRAME_MS / 1000))
+    frame_count = len(samples) // frame_len
+    if frame_count == 0:
+        return [(0, len(samples))]
+
+    frames = samples[:frame_count * frame_len].astype(np.float32).reshape(frame_count, frame_len)
+    rms = np.sqrt(np.mean(frames * frames, axis=1))
+    loudness = 20 * np.log10(np.maximum(rms, 1.0) / 32768)
+    threshold = np.clip(np.percentile(loudness, 10) + AUDIO_TRIM_MARGIN_DB,
+                        AUDIO_TRIM_MIN_THRESH_DBFS, AUDIO_TRIM_MAX_THRESH_DBFS)
+    speech = loudness > threshold
+
+    # 발화 앞뒤 여유 (앞뒤 pad 프레임 안에 발화가 있으면 발화로 표시)
+    pad = AUDIO_TRIM_PAD_MS // AUDIO_TRIM_FRAME_MS
+    if pad:
+        speech = np.convolve(speech, np.ones(2 * pad + 1), mode="same") > 0
+
+    edges = np.diff(np.concatenate(([0], speech.astype(np.int8), [0])))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    if len(starts) == 0:
+        return []
+
+    # 짧은 무음으로 나뉜 발화는 하나로 합침
+    cut = (starts[1:] - ends[:-1]) >= AUDIO_TRIM_MIN_SILENCE_MS // AUDIO_TRIM_FRAME_MS
+    region_starts = np.concatenate((starts[:1], starts[1:][cut])) * frame_len
+    region_ends = np.concatenate((ends[:-1][cut], ends[-1:])) * frame_len
+    if ends[-1] == frame_count:
+        region_ends[-1] = len(samples)  # 프레임으로 나누고 남은 끝부분 포함
+    return list(zip(region_starts.tolist(), region_ends.tolist()))
+
+def trim_silence(file_path, output_format="mp3"):
+    """
+    긴 무음/비음성 구간을 제거한 오디오 파일 생성
+
+    AUDIO_CHUNK_MAX_SEC 단위로 읽어 모노 AUDIO_TRANSCODE_SAMPLE_RATE로 바꾼 뒤 발화 구간만
+    ffmpeg 인코더로 바로 전달하므로 전체 오디오를 메모리에 올리지 않습니다.
+    제거된 길이가 AUDIO_TRIM_MIN_REMOVED 비율보다 작거나 발화를 찾지 못하면 원본 경로를 반환합니다.
+
+    Parameters:
+    file_path (str): 오디오 파일 경로
+    output_format (str): 결과 인코딩 형식 ("flac", "opus", "mp3")
+
+    Returns:
+    tuple: (업로드할 파일 경로, 시간 대응표 또는 None, 결과 dict - outcome, 제거 전후 길이(초))
+           시간 대응표는 map_to_original_time에 전달하는 (잘라낸 오디오 기준 시작(초), 원본 기준 시작(초)) 목록
+    """
+    result = {"outcome": "skipped", "duration_before": 0.0, "duration_after": 0.0, "removed_sec": 0.0}
+    if not PYDUB_AVAILABLE or not NUMPY_AVAILABLE or output_format not in TRIM_OUTPUT_CODECS:
+        return file_path, None, result
+
+    import numpy as np
+    from pydub import AudioSegment
+    suffix, codec_options = TRIM_OUTPUT_CODECS[output_format]
+    with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as output_file:
+        output_path = output_file.name
+    sample_rate = AUDIO_TRANSCODE_SAMPLE_RATE
+    command = [
+        AudioSegment.converter, "-y", "-nostdin", "-loglevel", "error",
+        "-f", "s16le", "-ar", str(sample_rate), "-ac", "1", "-i", "pipe:0"
+    ] + codec_options + [output_path]
+
+    offset_map = []
+    offset = 0.0   # 현재 구간의 원본 기준 시작 시간(초)
+    kept = 0.0     # 지금까지 남긴 길이(초)
+    try:
+        encoder = subprocess.Popen(command, stdin=subprocess.PIPE, stdout=subprocess.DEVNULL,
+                                   stderr=subprocess.DEVNULL)
+        try:
+            while True:
+                window = AudioSegment.from_file(file_path, start_second=offset, duration=AUDIO_CHUNK_MAX_SEC)
+                if len(window) == 0:
+                    break
+                window = window.set_channels(1).set_frame_rate(sample_rate).set_sample_width(2)
+                samples = np.frombuffer(window.raw_data, dtype=np.int16)
+
+                for start, end in detect_speech_regions(samples, sample_rate):
+                    original_start = offset + start / sample_rate
+                    # 이전 구간과 원본에서 바로 이어지면 대응표 항목을 추가하지 않음
+                    if not offset_map or abs(offset_map[-1][1] + kept - offset_map[-1][0] - original_start) > 1e-6:
+                        offset_map.append((kept, original_start))
+                    encoder.stdin.write(samples[start:end].tobytes())
+                    kept += (end - start) / sample_rate
+
+                offset += len(samples) / sample_rate
+                if len(window) < AUDIO_CHUNK_MAX_SEC * 1000:
+                    break
+        finally:
+            # 인코더가 먼저 종료된 경우에도 아래에서 종료를 확인하고 회수하도록 닫기 오류는 무시
+            try:
+                encoder.stdin.close()
+            except OSError:
+                pass
+            try:
+                returncode = encoder.wait(timeout=AUDIO_TRANSCODE_TIMEOUT_SEC)
+            except subprocess.TimeoutExpired:
+                # 멈춘 인코더는 강제 종료 후 회수한 뒤 출력 파일 삭제 (좀비 프로세스 방지)
+                encoder.kill()
+                encoder.wait()
+                raise
+        if returncode != 0:
+            raise RuntimeError(f"ffmpeg 종료 코드 {returncode}")
+    except Exception as e:
+        # 디코딩/인코딩 실패 시 원본 그대로 변환
+        remove_temp_files([output_path])
+        result.update(outcome="failed", error=type(e).__name__)
+        return file_path, None, result
+
+    result.update(duration_before=offset, duration_after=kept, removed_sec=offset - kept)
+    if kept == 0:
+        result["outcome"] = "no_speech"
+    elif offset - kept < offset * AUDIO_TRIM_MIN_REMOVED:
+        result["outcome"] = "not_enough_silence"
+    else:
+        result.update(outcome="applied", bytes_after=os.path.getsize(output_path))
+        return output_path, offset_map, result
+
+    remove_temp_files([output_path])
+    return file_path, None, result
+
+def map_to_original_time(seconds, offset_map):
+    """
+    무음을 제거한 오디오 기준 시간(초)을 원본 녹음 기준 시간으로 변환
+
+    Parameters:
+    seconds (float): 잘라낸 오디오 기준 시간(초)
+    offset_map (list): trim_silence가 반환한 시간 대응표 (None이면 그대로 반환)
+    """
+    if not offset_map:
+        return seconds
+    index = max(bisect.bisect_right(offset_map, (seconds, float("inf"))) - 1, 0)
+    trimmed_start, original_start = offset_map[index]
+    return original_start + (seconds - trimmed_start)
@@ -0,0 +1,239 @@
+"""
+결과 캐시 모듈 (음성 변환 결과 등 세션 간 공유)
+"""
+import os
+import json
+import hashlib
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from modules.storage import get_shared_result, store_shared_result
+from config.settings import (
+    TRANSCRIPT_CACHE_DIR, TRANSCRIPT_CACHE_MAX_BYTES,
+    SUMMARY_CACHE_MAX_ENTRIES, SUMMARY_CACHE_TTL_SEC, SUMMARY_CACHE_PERSIST,
+    SUMMARY_CACHE_DIR, SUMMARY_CACHE_MAX_BYTES
+)
+
+def make_cache_key(*parts):
+    """캐시 키 생성 (구성 요소를 이어 붙인 SHA-256)"""
+    return hashlib.sha256("\x1f".join(str(part) for part in parts).encode("utf-8")).hexdigest()
+
+class DiskCache:
+    """
+    용량 제한과 LRU 삭제를 지원하는 디스크 캐시
+
+    항목마다 JSON 파일 하나로 저장하며, 임시 파일에 쓴 뒤 os.replace로 교체하므로
+    여러 세션(프로세스)이 동시에 같은 디렉토리를 사용해도 깨진 항목을 읽지 않습니다.
+    최근 사용 시각은 파일 수정 시각(mtime)으로 기록합니다.
+    """
+
+    def __init__(self, directory, max_bytes):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, key):
+        """캐시 항목 반환 (없으면 None)"""
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                value = json.load(f)
+            # 최근 사용 시각 갱신 (LRU)
+            os.utime(path, None)
+        except (OSError, ValueError):
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.hits += 1
+        return value
+
+    def set(self, key, value):
+        """캐시 항목 저장 후 용량 초과 시 오래된 항목 삭제"""
+        data = json.dumps(value, ensure_ascii=False).encode("utf-8")
+        if len(data) > self.max_bytes:
+            return
+
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, self._path(key))
+        except Exception:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+
+        self._evict()
+
+    def _entries(self):
+        """(mtime, 크기, 경로) 목록 반환"""
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(".json"):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue  # 다른 세션에서 이미 삭제한 경우
+            entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def _evict(self):
+        """전체 용량이 최대 용량 이하가 될 때까지 가장 오래 사용하지 않은 항목 삭제"""
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        if total <= self.max_bytes:
+            return
+
+        for _, size, path in sorted(entries):
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def stats(self):
+        """적중/미적중 횟수와 현재 사용량 반환"""
+        entries = self._entries()
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(entries),
+                "bytes": sum(size for _, size, _ in entries),
+                "max_bytes": self.max_bytes,
+            }
+
+class MemoryCache:
+    """
+    유효 시간(TTL)과 LRU 삭제를 지원하는 메모리 캐시
+
+    프로세스 전역 객체로 사용하면 같은 프로세스의 모든 세션이 결과를 공유합니다.
+    """
+
+    def __init__(self, max_entries, ttl_seconds):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._items = OrderedDict()  # 키 -> (만료 시각, 값)
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """캐시 항목 반환 (없거나 만료되었으면 None)"""
+        with self._lock:
+            item = self._items.get(key)
+            if item is None or item[0] < time.monotonic():
+                self._items.pop(key, None)
+                self.misses += 1
+                return None
+
+            self._items.move_to_end(key)
+            self.hits += 1
+            return item[1]
+
+    def set(self, key, value):
+        """캐시 항목 저장 후 최대 개수 초과 시 가장 오래 사용하지 않은 항목 삭제"""
+        with self._lock:
+            self._items[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_entries:
+                self._items.popitem(last=False)
+
+    def stats(self):
+        """적중/미적중 횟수와 현재 항목 수 반환"""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(self._items),
+                "max_entries": self.max_entries,
+            }
+
+_transcript_cache = None
+_transcript_cache_lock = threading.Lock()
+
+def get_transcript_cache():
+    """프로세스 전체에서 공유하는 음성 변환 결과 캐시 반환"""
+    global _transcript_cache
+    with _transcript_cache_lock:
+        if _transcript_cache is None:
+            _transcript_cache = DiskCache(TRANSCRIPT_CACHE_DIR, TRANSCRIPT_CACHE_MAX_BYTES)
+    return _transcript_cache
+
+def make_transcript_cache_key(audio_hash, engine, language, enable_diarization):
+    """음성 변환 결과 캐시 키 (오디오 해시 + 엔진 + 언어 + 화자 구분 여부)"""
+    return make_cache_key("transcript", audio_hash, engine, language, bool(enable_diarization))
+
+_summary_cache = None
+_summary_disk_cache = None
+_summary_cache_lock = threading.Lock()
+
+def get_summary_cache():
+    """프로세스 전체에서 공유하는 회의록 요약 결과 캐시 반환"""
+    global _summary_cache
+    with _summary_cache_lock:
+        if _summary_cache is None:
+            _summary_cache = MemoryCache(SUMMARY_CACHE_MAX_ENTRIES, SUMMARY_CACHE_TTL_SEC)
+    return _summary_cache
+
+def get_summary_disk_cache():
+    """회의록 요약 결과 디스크 캐시 반환 (SUMMARY_CACHE_PERSIST가 꺼져 있으면 None)"""
+    global _summary_disk_cache
+    if not SUMMARY_CACHE_PERSIST:
+        return None
+    with _summary_cache_lock:
+        if _summary_disk_cache is None:
+            _summary_disk_cache = DiskCache(SUMMARY_CACHE_DIR, SUMMARY_CACHE_MAX_BYTES)
+    return _summary_disk_cache
+
+def make_summary_cache_key(full_transcript, summary_model, model_name, temperature, max_tokens, settings_hash):
+    """
+    회의록 요약 결과 캐시 키 (회의 내용 해시 + 모델 + 생성 옵션 + 생성 설정 해시)
+
+    Parameters:
+    settings_hash (str): 결과에 영향을 주는 프롬프트, 구간 분할, 압축 설정의 해시
+    """
+    transcript_hash = hashlib.sha256(full_transcript.encode("utf-8")).hexdigest()
+    return make_cache_key("summary", transcript_hash, summary_model, model_name, temperature, max_tokens,
+                          settings_hash)
+
+def get_cached_summary(key):
+    """캐시된 회의록 반환 (메모리 → 디스크 → 공유 저장소 순으로 확인, 없으면 None)"""
+    summary = get_summary_cache().get(key)
+    if summary is not None:
+        return summary
+
+    disk_cache = get_summary_disk_cache()
+    entry = disk_cache.get(key) if disk_cache is not None else None
+    if not entry or time.time() - entry.get("created", 0) > SUMMARY_CACHE_TTL_SEC:
+        # 다른 인스턴스에서 생성한 회의록
+        entry = get_shared_result(key)
+        if not entry:
+            return None
+
+    # 디스크에서 찾은 항목은 메모리 캐시에도 올려 둠
+    get_summary_cache().set(key, entry["summary"])
+    return entry["summary"]
+
+def store_cached_summary(key, summary):
+    """회의록을 메모리 캐시(와 설정 시 디스크 캐시, 공유 저장소)에 저장"""
+    get_summary_cache().set(key, summary)
+    disk_cache = get_summary_disk_cache()
+    if disk_cache is not None:
+        disk_cache.set(key, {"summary": summary, "created": time.time()})
+    store_shared_result(key, {"summary": summary, "created": time.time()}, SUMMARY_CACHE_TTL_SEC)
@@ -0,0 +1,189 @@
+"""
+API 클라이언트 관리 모듈 (프로세스 전체에서 연결을 재사용)
+
+제공자 SDK(openai, anthropic, requests, httpx)는 import에 시간이 오래 걸리므로 모듈을 불러올 때가 아니라
+해당 엔진을 처음 사용할 때 load_sdk로 import합니다. 텍스트만 입력하는 사용자나 첫 화면 표시에는 SDK를 불러오지 않습니다.
+"""
+import importlib
+import os
+import threading
+import time
+from modules.metrics import record_span
+from config.settings import (
+    HTTP_POOL_MAXSIZE, HTTP_KEEPALIVE_CONNECTIONS, HTTP_KEEPALIVE_EXPIRY,
+    HTTP_CONNECT_TIMEOUT, LLM_READ_TIMEOUT, STT_READ_TIMEOUT, PROVIDER_MAX_RETRIES, RATE_LIMIT_ENABLED
+)
+
+# 클로바 요청 제한 시간 (연결, 응답) - requests는 요청마다 지정해야 함
+CLOVA_TIMEOUT = (HTTP_CONNECT_TIMEOUT, STT_READ_TIMEOUT)
+# SDK 자동 재시도 횟수 - 요청 제한을 켜면 429 응답을 SDK가 따로 재시도하지 않고 제한 모듈이 조율하여 재시도
+SDK_MAX_RETRIES = 0 if RATE_LIMIT_ENABLED else PROVIDER_MAX_RETRIES
+
+# 엔진 -> 필요한 SDK 모듈 (load_engine_sdks로 미리 불러올 때 사용)
+ENGINE_SDKS = {
+    "claude": ("httpx", "anthropic"),
+    "openai": ("httpx", "openai"),
+    "whisper": ("httpx", "openai"),
+    "clova": ("requests",),
+}
+
+_sdk_lock = threading.Lock()
+_sdk_modules = {}       # 모듈 이름 -> 모듈
+_sdk_import_times = {}  # 모듈 이름 -> import 시간(초)
+
+def load_sdk(name):
+    """
+    제공자 SDK 모듈 반환 (처음 호출할 때만 import하고 소요 시간 기록)
+
+    Parameters:
+    name (str): 모듈 이름 (예: "openai", "requests.adapters")
+    """
+    module = _sdk_modules.get(name)
+    if module is not None:
+        return module
+    with _sdk_lock:
+        if name not in _sdk_modules:
+            started = time.perf_counter()
+            _sdk_modules[name] = importlib.import_module(name)
+            _sdk_import_times[name] = time.perf_counter() - started
+            record_span("sdk_import", _sdk_import_times[name], {"module": name})
+        return _sdk_modules[name]
+
+def load_engine_sdks(engine):
+    """엔진에 필요한 SDK를 미리 불러옴 (작업 스레드에서 첫 요청 전에 호출)"""
+    for name in ENGINE_SDKS.get(engine, ()):
+        load_sdk(name)
+
+def get_sdk_import_times():
+    """지금까지 불러온 SDK 모듈별 import 시간(초)"""
+    with _sdk_lock:
+        return dict(_sdk_import_times)
+
+_lock = threading.Lock()
+_default_api_keys = {}
+_anthropic_clients = {}  # API 키 -> (클라이언트, httpx 클라이언트)
+_openai_clients = {}     # API 키 -> (클라이언트, httpx 클라이언트)
+_clova_session = None
+
+def set_default_api_keys(openai_api_key=None, claude_api_key=None):
+    """
+    작업 스레드에서 사용할 기본 API 키 등록
+
+    작업 스레드는 세션 상태에 접근할 수 없으므로 initialize_session_state에서 읽은 키를 등록해 둡니다.
+    """
+    with _lock:
+        if openai_api_key:
+            _default_api_keys["openai"] = openai_api_key
+        if claude_api_key:
+            _default_api_keys["claude"] = claude_api_key
+
+def _create_http_client(read_timeout):
+    """연결 풀과 제한 시간이 설정된 httpx 클라이언트 생성"""
+    httpx = load_sdk("httpx")
+    return httpx.Client(
+        timeout=httpx.Timeout(read_timeout, connect=HTTP_CONNECT_TIMEOUT),
+        limits=httpx.Limits(
+            max_connections=HTTP_POOL_MAXSIZE,
+            max_keepalive_connections=HTTP_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=HTTP_KEEPALIVE_EXPIRY
+        )
+    )
+
+def get_anthropic_client(api_key=None):
+    """
+    공유 Anthropic 클라이언트 반환 (API 키별로 한 번만 생성)
+
+    Parameters:
+    api_key (str): Claude API 키 (None이면 기본 키 사용)
+    """
+    api_key = api_key or _default_api_keys.get("claude") or os.environ.get("CLAUDE_API_KEY", "")
+    with _lock:
+        if api_key not in _anthropic_clients:
+            http_client = _create_http_client(LLM_READ_TIMEOUT)
+            client = load_sdk("anthropic").Anthropic(
+                api_key=api_key,
+                max_retries=SDK_MAX_RETRIES,
+                http_client=http_client
+            )
+            _anthropic_clients[api_key] = (client, http_client)
+        return _anthropic_clients[api_key][0]
+
+def get_openai_client(api_key=None):
+    """
+    공유 OpenAI 클라이언트 반환 (API 키별로 한 번만 생성)
+
+    Parameters:
+    api_key (str): OpenAI API 키 (None이면 기본 키 사용)
+    """
+    api_key = api_key or _default_api_keys.get("openai") or os.environ.get("OPENAI_API_KEY", "")
+    with _lock:
+        if api_key not in _openai_clients:
+            http_client = _create_http_client(LLM_READ_TIMEOUT)
+            client = load_sdk("openai").OpenAI(
+                api_key=api_key,
+                max_retries=SDK_MAX_RETRIES,
+                http_client=http_client
+            )
+            _openai_clients[api_key] = (client, http_client)
+        return _openai_clients[api_key][0]
+
+def get_whisper_client(api_key=None):
+    """음성 변환용 OpenAI 클라이언트 반환 (같은 연결 풀, 긴 응답 대기 시간)"""
+    httpx = load_sdk("httpx")
+    return get_openai_client(api_key).with_options(
+        timeout=httpx.Timeout(STT_READ_TIMEOUT, connect=HTTP_CONNECT_TIMEOUT)
+    )
+
+def get_clova_session():
+    """연결을 재사용하는 공유 requests 세션 반환 (클로바 API용)"""
+    global _clova_session
+    with _lock:
+        if _clova_session is None:
+            session = load_sdk("requests").Session()
+            adapter = load_sdk("requests.adapters").HTTPAdapter(pool_connections=1, pool_maxsize=HTTP_POOL_MAXSIZE)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _clova_session = session
+        return _clova_session
+
+def _httpx_pool_stats(http_client):
+    """httpx 클라이언트의 연결 수 (확인할 수 없으면 None)"""
+    try:
+        connections = http_client._transport._pool.connections
+        return {
+            "connections": len(connections),
+            "idle": sum(1 for connection in connections if connection.is_idle())
+        }
+    except Exception:
+        return None
+
+def get_pool_stats():
+    """제공자별 연결 풀 현황 반환"""
+    with _lock:
+        stats = {
+            "anthropic": {
+                "clients": len(_anthropic_clients),
+                "pools": [_httpx_pool_stats(http_client) for _, http_client in _anthropic_clients.values()]
+            },
+            "openai": {
+                "clients": len(_openai_clients),
+                "pools": [_httpx_pool_stats(http_client) for _, http_client in _openai_clients.values()]
+            },
+            "clova": None
+        }
+        session = _clova_session
+
+    if session is not None:
+        connections = requests_count = 0
+        try:
+            for pool in session.get_adapter("https://").poolmanager.pools.values():
+                connections += pool.num_connections
+                requests_count += pool.num_requests
+        except Exception:
+            pass
+        stats["clova"] = {
+            "connections_created": connections,
+            "requests": requests_count,
+            "max_size": HTTP_POOL_MAXSIZE
+        }
+    return stats
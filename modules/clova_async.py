@@ -0,0 +1,177 @@
+"""
+클로바 비동기 인식 모듈 (업로드 후 작업 토큰으로 결과 확인)
+
+동기 방식은 인식이 끝날 때까지 업로드 요청 연결을 유지하므로 긴 녹음에서 프록시/유휴 제한 시간에 걸릴 수 있습니다.
+비동기 방식은 업로드 요청이 작업 토큰을 받는 즉시 끝나고, 진행 중인 모든 작업의 결과는
+공유 스레드 하나(ClovaPoller)가 간격을 점점 늘려 가며 확인합니다.
+"""
+import random
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from modules.clients import get_clova_session, load_sdk
+from modules.metrics import record_span
+from modules.rate_limit import check_cancelled
+from config.settings import (
+    CLOVA_INVOKE_URL, HTTP_CONNECT_TIMEOUT, CLOVA_POLL_INITIAL_SEC, CLOVA_POLL_BACKOFF,
+    CLOVA_POLL_MAX_SEC, CLOVA_POLL_READ_TIMEOUT, CLOVA_ASYNC_TIMEOUT_SEC, HEDGE_CANCEL_CHECK_SEC
+)
+
+# 다시 확인하면 되는 일시적인 오류 상태 코드
+RETRYABLE_STATUS = (429, 500, 502, 503, 504)
+
+class ClovaPoller:
+    """
+    클로바 작업 토큰의 결과를 확인하는 공유 스레드
+
+    track()이 반환한 Future는 인식이 완료되면 응답 JSON, 실패하면 예외로 완료됩니다.
+    확인할 작업이 없으면 스레드는 종료되고, 다음 track() 호출 때 다시 시작됩니다.
+    """
+
+    def __init__(self):
+        self._pending = {}  # 작업 토큰 -> 확인 상태 dict
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+
+    def track(self, token, headers):
+        """
+        작업 토큰 결과 확인 등록
+
+        Parameters:
+        token (str): 업로드 응답의 작업 토큰
+        headers (dict): 결과 확인 요청 헤더 (API 키 포함)
+
+        Returns:
+        Future: 인식 결과(응답 JSON)
+        """
+        future = Future()
+        now = time.monotonic()
+        with self._lock:
+            self._pending[token] = {
+                "future": future,
+                "headers": headers,
+                "started": now,
+                "next_poll": now + CLOVA_POLL_INITIAL_SEC,
+                "interval": CLOVA_POLL_INITIAL_SEC,
+                "polls": 0,
+            }
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="clova-poller", daemon=True)
+                self._thread.start()
+        self._wakeup.set()
+        return future
+
+    def pending_count(self):
+        with self._lock:
+            return len(self._pending)
+
+    def _run(self):
+        while True:
+            with self._lock:
+                # 기다리는 쪽에서 취소한 작업은 확인하지 않음
+                for token in [token for token, item in self._pending.items() if item["future"].done()]:
+                    del self._pending[token]
+                if not self._pending:
+                    self._thread = None
+                    return
+                now = time.monotonic()
+                due = [(token, item) for token, item in self._pending.items() if item["next_poll"] <= now]
+                next_poll = min(item["next_poll"] for item in self._pending.values())
+
+            for token, item in due:
+                self._poll(token, item)
+
+            if not due:
+                self._wakeup.wait(max(0.0, next_poll - time.monotonic()))
+                self._wakeup.clear()
+
+    def _poll(self, token, item):
+        """작업 하나의 결과 확인 (진행 중이면 다음 확인 시각을 늦춤)"""
+        item["polls"] += 1
+        try:
+            response = get_clova_session().get(
+                f"{CLOVA_INVOKE_URL}/recognizer/{token}",
+                headers=item["headers"],
+                timeout=(HTTP_CONNECT_TIMEOUT, CLOVA_POLL_READ_TIMEOUT)
+            )
+        except load_sdk("requests").RequestException:
+            self._schedule(token, item)  # 연결 오류는 다음 확인 때 다시 시도
+            return
+
+        if response.status_code in RETRYABLE_STATUS:
+            self._schedule(token, item)
+            return
+        if response.status_code != 200:
+            self._finish(token, item, error=Exception(f"결과 확인 오류 ({response.status_code}): {response.text}"))
+            return
+
+        result = response.json()
+        state = result.get("result")
+        if state == "COMPLETED":
+            self._finish(token, item, result=result)
+        elif state == "FAILED":
+            self._finish(token, item, error=Exception(f"인식 실패: {result.get('message', '')}"))
+        else:
+            self._schedule(token, item)
+
+    def _schedule(self, token, item):
+        """확인 간격을 늘려 다음 확인 시각 지정 (여러 작업의 확인 시각이 겹치지 않도록 약간 흩어 놓음)"""
+        now = time.monotonic()
+        if now - item["started"] > CLOVA_ASYNC_TIMEOUT_SEC:
+            self._finish(token, item, error=TimeoutError("클로바 인식 결과 대기 시간이 초과되었습니다."))
+            return
+        item["next_poll"] = now + item["interval"] * random.uniform(0.9, 1.1)
+        item["interval"] = min(item["interval"] * CLOVA_POLL_BACKOFF, CLOVA_POLL_MAX_SEC)
+
+    def _finish(self, token, item, result=None, error=None):
+        with self._lock:
+            self._pending.pop(token, None)
+        record_span("stt_wait", time.monotonic() - item["started"], {
+            "engine": "clova", "polls": item["polls"], "outcome": "ok" if error is None else "error"
+        })
+        if item["future"].done():
+            return
+        if error is not None:
+            item["future"].set_exception(error)
+        else:
+            item["future"].set_result(result)
+
+_poller = None
+_poller_lock = threading.Lock()
+
+def get_clova_poller():
+    """프로세스 전체에서 공유하는 ClovaPoller 반환"""
+    global _poller
+    with _poller_lock:
+        if _poller is None:
+            _poller = ClovaPoller()
+        return _poller
+
+def wait_for_clova_result(token, headers, cancel_event=None):
+    """
+    작업 토큰의 인식 결과를 기다려 반환
+
+    결과 확인은 공유 스레드가 하므로 기다리는 동안 HTTP 연결을 유지하지 않습니다.
+
+    Parameters:
+    cancel_event (threading.Event): 설정되면 기다리기를 멈추고 결과 확인도 중단 (이중 요청에서 진 쪽)
+
+    Returns:
+    dict: 클로바 인식 결과 (동기 방식 응답과 같은 형식)
+    """
+    future = get_clova_poller().track(token, headers)
+    deadline = time.monotonic() + CLOVA_ASYNC_TIMEOUT_SEC
+    try:
+        while True:
+            remaining = deadline - time.monotonic()
+            try:
+                return future.result(timeout=min(remaining, HEDGE_CANCEL_CHECK_SEC) if cancel_event else remaining)
+            except FutureTimeoutError:
+                if time.monotonic() >= deadline:
+                    raise TimeoutError("클로바 인식 결과 대기 시간이 초과되었습니다.")
+                check_cancelled(cancel_event)
+    except BaseException:
+        # 시간 초과, 중단, 작업 취소(JobCancelled) 등으로 기다리지 않게 되면 공유 스레드도 이 작업의 결과를 확인하지 않음
+        future.cancel()
+        raise
@@ -0,0 +1,161 @@
+"""
+회의 내용 압축 모듈 - LLM에 보내기 전에 내용은 유지하면서 불필요한 토큰 제거
+
+- 같은 화자의 연속 발화를 하나로 합침
+- 화자 시간 표시는 COMPACTION_TIME_INTERVAL_SEC 간격으로만 남김
+- 추임새/머뭇거림(음, 어, 그… 등) 제거 (일반 단어는 반복되어도 그대로 유지)
+- 같은 출처의 연속 항목 헤더([날짜 시간 - 출처])를 하나로 합치고 날짜/초 단위 생략
+"""
+import re
+from modules.transcript import estimate_tokens
+from config.settings import (
+    COMPACTION_TIME_INTERVAL_SEC, COMPACTION_FILLER_PATTERNS, COMPACTION_HESITATION_WORDS
+)
+
+# 항목 헤더 (update_full_transcript 형식, 예: "[2025-01-01 10:00:00 - 직접 입력]")
+ENTRY_HEADER_PATTERN = re.compile(r"^\[(\d{4}-\d{2}-\d{2}) (\d{2}):(\d{2}):\d{2} - (.*)\]$")
+# 화자 헤더 - 음성 변환이 만드는 화자 이름만 인식 (예: "참석자 A 01:23", "1 12:05", "구간2-1 12:05")
+# 클로바: 숫자 화자 번호 또는 "알 수 없음", Whisper: "참석자 A/B", 분할 구간 변환 시 "구간N-" 접두어
+# ("다음 회의는 10:30"처럼 시간으로 끝나는 일반 문장은 화자 헤더로 보지 않음)
+SPEAKER_HEADER_PATTERN = re.compile(r"^((?:구간\d+-)?(?:\d+|참석자 [A-Z]|알 수 없음)) (\d{2,}):(\d{2})$")
+
+FILLER_PATTERN = re.compile("(?:" + "|".join(COMPACTION_FILLER_PATTERNS) + ")")
+TRAILING_PUNCTUATION = ",.…~"
+
+def remove_fillers(line, stats):
+    """
+    한 줄에서 추임새와 머뭇거림 단어 제거
+
+    머뭇거림 단어(그, 저 등)는 뒤에 쉼표/말줄임표가 있거나 바로 반복될 때만 제거하므로
+    "그 안건은"처럼 일반 단어로 쓰인 경우는 남습니다. 그 밖의 단어는 반복되어도("10 10 퍼센트")
+    내용일 수 있으므로 제거하지 않습니다.
+    """
+    tokens = line.split()
+    kept = []
+    for i, token in enumerate(tokens):
+        core = token.rstrip(TRAILING_PUNCTUATION)
+        if core and FILLER_PATTERN.fullmatch(core):
+            stats["fillers"] += 1
+            continue
+        if core in COMPACTION_HESITATION_WORDS:
+            next_core = tokens[i + 1].rstrip(TRAILING_PUNCTUATION) if i + 1 < len(tokens) else None
+            if core != token or next_core == core:
+                stats["fillers"] += 1
+                continue
+        kept.append(token)
+    return " ".join(kept)
+
+def is_speaker_formatted(lines):
+    """항목 본문이 화자 구분 형식("화자 MM:SS" 다음 줄에 발화)인지 확인"""
+    headers = 0
+    for i, line in enumerate(lines):
+        if SPEAKER_HEADER_PATTERN.match(line.strip()):
+            next_line = lines[i + 1].strip() if i + 1 < len(lines) else ""
+            if not next_line or SPEAKER_HEADER_PATTERN.match(next_line):
+                return False
+            headers += 1
+    return headers >= 2
+
+def compact_speaker_lines(lines, stats):
+    """화자 구분 형식 본문 압축 (같은 화자 발화 병합, 시간 표시 간격 조정, 발화마다 한 줄)"""
+    output = []
+    speaker = None
+    parts = []
+    last_shown = None
+
+    def flush():
+        # 발화 하나를 한 줄로 ("화자 MM:SS: 내용" 또는 시간 생략 시 "화자: 내용")
+        if speaker is not None and parts:
+            output.append(f"{header}: {' '.join(parts)}")
+
+    header = ""
+    for line in lines:
+        stripped = line.strip()
+        match = SPEAKER_HEADER_PATTERN.match(stripped)
+        if match:
+            name = match.group(1)
+            seconds = int(match.group(2)) * 60 + int(match.group(3))
+            if name == speaker:
+                stats["merged_segments"] += 1
+                continue
+            flush()
+            speaker = name
+            parts = []
+            if last_shown is None or seconds - last_shown >= COMPACTION_TIME_INTERVAL_SEC:
+                header = stripped
+                last_shown = seconds
+            else:
+                header = name
+                stats["dropped_timestamps"] += 1
+            continue
+
+        text = remove_fillers(stripped, stats)
+        if not text:
+            continue
+        if speaker is None:
+            output.append(text)  # 첫 화자 헤더 앞의 내용
+        else:
+            parts.append(text)
+    flush()
+    return output
+
+def compact_transcript(full_transcript):
+    """
+    LLM 입력용으로 회의 내용 압축
+
+    Parameters:
+    full_transcript (str): update_full_transcript() 결과 텍스트
+
+    Returns:
+    tuple: (압축된 텍스트, 보고서 dict - 압축 전후 글자 수/토큰 추정치와 항목별 처리 수)
+    """
+    stats = {"fillers": 0, "merged_segments": 0, "dropped_timestamps": 0, "collapsed_headers": 0}
+
+    # 항목 헤더 기준으로 본문 나누기
+    entries = []  # (헤더 match 또는 None, 본문 줄 목록)
+    current = (None, [])
+    for line in full_transcript.splitlines():
+        match = ENTRY_HEADER_PATTERN.match(line.strip())
+        if match:
+            if current[0] is not None or current[1]:
+                entries.append(current)
+            current = (match, [])
+        else:
+            current[1].append(line)
+    entries.append(current)
+
+    output = []
+    last_source = last_date = last_minute = None
+    for match, lines in entries:
+        if match is not None:
+            date, hour, minute, source = match.groups()
+            time_key = f"{hour}:{minute}"
+            if source == last_source and date == last_date and time_key == last_minute:
+                stats["collapsed_headers"] += 1
+            else:
+                if output:
+                    output.append("")
+                prefix = f"{date} " if date != last_date else ""
+                output.append(f"[{prefix}{time_key} - {source}]")
+            last_source, last_date, last_minute = source, date, time_key
+
+        if is_speaker_formatted(lines):
+            output.extend(compact_speaker_lines(lines, stats))
+        else:
+            for line in lines:
+                text = remove_fillers(line.strip(), stats)
+                if text:
+                    output.append(text)
+
+    compacted = "\n".join(output) + "\n"
+    tokens_before = estimate_tokens(full_transcript)
+    tokens_after = estimate_tokens(compacted)
+    report = dict(stats)
+    report.update({
+        "chars_before": len(full_transcript),
+        "chars_after": len(compacted),
+        "tokens_before": tokens_before,
+        "tokens_after": tokens_after,
+        "reduction": 1 - tokens_after / tokens_before if tokens_before else 0.0,
+    })
+    return compacted, report
@@ -0,0 +1,86 @@
+"""
+지연 대비 이중 요청(헤징) 모듈
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from modules.rate_limit import bind_rate_limit_owner
+from config.settings import HEDGE_MAX_WORKERS
+
+_executor = ThreadPoolExecutor(max_workers=HEDGE_MAX_WORKERS, thread_name_prefix="meetingnotes-hedge")
+
+def _abandon(future, cancel_event, discard):
+    """
+    진 쪽 요청 정리
+
+    중단 이벤트를 설정하여 실행 중인 요청이 다음 확인 지점(요청 순서 대기, 재시도 대기, 스트림 조각,
+    클로바 결과 대기)에서 멈추고 연결을 닫도록 합니다. 아직 시작하지 않았으면 취소하고,
+    중단되기 전에 결과가 나온 경우에는 결과를 discard로 정리합니다.
+    """
+    cancel_event.set()
+    if future.cancel() or discard is None:
+        return
+
+    def on_done(f):
+        if not f.cancelled() and f.exception() is None:
+            try:
+                discard(f.result())
+            except Exception:
+                pass
+
+    future.add_done_callback(on_done)
+
+def hedged_call(primary, backup, labels=("primary", "backup"), delay=0.0, race=False, discard=None):
+    """
+    기본 요청이 지연되면 대체 요청도 함께 보내고 먼저 성공한 결과 사용
+
+    기본 요청이 delay 안에 실패하면 즉시 대체 요청을 시작하므로 기존 순차 대체와 같은 결과를 보장합니다.
+
+    Parameters:
+    primary: 기본 요청 함수 (인자: 진 쪽이 되면 설정되는 중단 이벤트 threading.Event)
+    backup: 대체 요청 함수 (인자는 primary와 같음)
+    labels (tuple): (기본 요청 이름, 대체 요청 이름)
+    delay (float): 대체 요청을 시작하기 전 기다릴 시간(초)
+    race (bool): True이면 처음부터 두 요청을 동시에 시작
+    discard: 진 쪽 결과가 나중에 도착했을 때 정리할 함수 (예: 스트림 닫기)
+
+    Returns:
+    tuple: (결과, 이긴 요청 이름, 대체 요청이 이겼을 때 기본 요청의 오류 또는 None)
+    """
+    # 두 요청 모두 호출한 작업의 요청자로 요청 제한 대기열에 들어가도록 함
+    primary, backup = bind_rate_limit_owner(primary), bind_rate_limit_owner(backup)
+    cancel_events = {labels[0]: threading.Event(), labels[1]: threading.Event()}
+    futures = {_executor.submit(primary, cancel_events[labels[0]]): labels[0]}
+    backup_started = False
+    errors = {}  # 요청 이름 -> 오류
+    deadline = time.monotonic() + delay
+    pending = set(futures)
+
+    while True:
+        # 지연 시간이 지났거나 기본 요청이 실패하면 대체 요청 시작
+        if not backup_started and (race or labels[0] in errors or time.monotonic() >= deadline):
+            backup_future = _executor.submit(backup, cancel_events[labels[1]])
+            futures[backup_future] = labels[1]
+            pending.add(backup_future)
+            backup_started = True
+
+        if not pending:
+            break
+
+        timeout = None if backup_started else max(0.0, deadline - time.monotonic())
+        done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+
+        for future in done:
+            try:
+                result = future.result()
+            except Exception as e:
+                errors[futures[future]] = e
+                continue
+
+            for other in pending:
+                _abandon(other, cancel_events[futures[other]], discard)
+            # 기본 요청이 이긴 경우 대체 요청의 오류는 전달하지 않음
+            winner = futures[future]
+            return result, winner, errors.get(labels[0]) if winner != labels[0] else None
+
+    raise Exception(f"{errors[labels[0]]} / 대체 요청 오류: {errors[labels[1]]}")
@@ -0,0 +1,211 @@
+"""
+백그라운드 작업 실행 모듈 (음성 변환, 회의록 생성 등 오래 걸리는 작업)
+"""
+import time
+import uuid
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from modules.rate_limit import set_rate_limit_owner
+from config.settings import JOB_MAX_WORKERS, JOB_MAX_QUEUED, JOB_RESULT_TTL_SEC
+
+class JobCancelled(BaseException):
+    """
+    작업 취소 신호
+
+    asyncio.CancelledError처럼 BaseException을 상속하므로
+    대체 모델로 넘어가는 일반 예외 처리(except Exception)에 잡히지 않습니다.
+    """
+
+class JobQueueFull(Exception):
+    """대기 중인 작업이 너무 많아 새 작업을 받을 수 없음"""
+
+class Job:
+    """
+    백그라운드 작업 하나의 상태
+
+    작업 함수에 첫 번째 인자로 전달되며, st.info/st.success/st.warning/st.error와
+    같은 이름의 메서드를 제공하므로 화면 출력 대신 메시지를 기록하는 용도로 사용할 수 있습니다.
+    화면은 작업 완료 후 기록된 메시지를 그대로 표시합니다.
+    """
+
+    def __init__(self, kind, cleanup=None):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.status = "pending"  # pending, running, done, failed, cancelled
+        self.progress = 0
+        self.message = ""
+        self.result = None
+        self.error = None
+        self.messages = []  # (수준, 내용) 목록
+        self.created_at = time.time()
+        self.finished_at = None
+        self.cleanup = cleanup
+        self._parts = []
+        self._cancel_event = threading.Event()
+        self._lock = threading.Lock()
+
+    # 진행 상태
+    def update(self, progress=None, message=None):
+        """진행률과 상태 메시지 갱신 (취소된 작업이면 JobCancelled 발생)"""
+        self.check_cancelled()
+        if progress is not None:
+            self.progress = progress
+        if message is not None:
+            self.message = message
+
+    def is_finished(self):
+        return self.status in ("done", "failed", "cancelled")
+
+    # 화면 출력 대신 메시지 기록 (st.* 와 같은 이름)
+    def _log(self, level, text):
+        with self._lock:
+            self.messages.append((level, str(text)))
+
+    def info(self, text):
+        self._log("info", text)
+
+    def success(self, text):
+        self._log("success", text)
+
+    def warning(self, text):
+        self._log("warning", text)
+
+    def error(self, text):
+        self._log("error", text)
+
+    # 스트리밍 출력 (MinutesStream과 같은 인터페이스)
+    def on_text(self, text):
+        """생성 중인 텍스트 조각 기록"""
+        self.check_cancelled()
+        with self._lock:
+            self._parts.append(text)
+
+    def reset(self):
+        """스트림이 중단된 경우 받은 내용 삭제"""
+        with self._lock:
+            self._parts = []
+
+    @property
+    def partial_text(self):
+        with self._lock:
+            return "".join(self._parts)
+
+    # 취소
+    def cancel(self):
+        self._cancel_event.set()
+
+    def is_cancelled(self):
+        return self._cancel_event.is_set()
+
+    def check_cancelled(self):
+        if self._cancel_event.is_set():
+            raise JobCancelled()
+
+class JobManager:
+    """프로세스 전체에서 공유하는 백그라운드 작업 실행기 (작업 스레드 수 제한)"""
+
+    def __init__(self, max_workers=JOB_MAX_WORKERS, max_queued=JOB_MAX_QUEUED, result_ttl=JOB_RESULT_TTL_SEC):
+        self.max_workers = max_workers
+        self.max_queued = max_queued
+        self.result_ttl = result_ttl
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="meetingnotes-job")
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def submit(self, kind, func, *args, cleanup=None, **kwargs):
+        """
+        작업 등록 - func(job, *args, **kwargs)가 작업 스레드에서 실행됨
+
+        Parameters:
+        kind (str): 작업 종류 ("transcription", "minutes" 등)
+        func: 작업 함수 (첫 번째 인자로 Job을 받음)
+        cleanup: 작업이 시작되기 전에 취소된 경우 호출할 정리 함수
+
+        Returns:
+        Job: 등록된 작업
+        """
+        self._remove_expired()
+        with self._lock:
+            pending = sum(1 for job in self._jobs.values() if job.status == "pending")
+            if pending >= self.max_queued:
+                raise JobQueueFull("대기 중인 작업이 너무 많습니다. 잠시 후 다시 시도해주세요.")
+            job = Job(kind, cleanup=cleanup)
+            self._jobs[job.id] = job
+
+        self._executor.submit(self._run, job, func, args, kwargs)
+        return job
+
+    def _run(self, job, func, args, kwargs):
+        # 시작 전에 취소된 작업은 실행하지 않음
+        if job.is_cancelled():
+            if job.cleanup is not None:
+                try:
+                    job.cleanup()
+                except Exception:
+                    pass
+            job.status = "cancelled"
+            job.finished_at = time.time()
+            return
+
+        job.status = "running"
+        # 작업의 API 요청은 요청 제한 대기열에서 하나의 요청자로 묶어 다른 작업과 번갈아 처리
+        set_rate_limit_owner(job.id)
+        try:
+            job.result = func(job, *args, **kwargs)
+            job.progress = 100
+            job.status = "done"
+        except JobCancelled:
+            job.status = "cancelled"
+        except Exception as e:
+            job.error = str(e)
+            job.status = "failed"
+        finally:
+            set_rate_limit_owner(None)
+            job.finished_at = time.time()
+
+    def get(self, job_id):
+        """작업 반환 (없거나 만료되었으면 None)"""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id):
+        """
+        작업 취소 요청
+
+        대기 중인 작업은 시작되지 않으며, 실행 중인 작업은 다음 확인 지점에서 중단됩니다.
+        (이미 전송된 API 요청 자체는 응답이 올 때까지 기다린 후 결과를 버립니다.)
+        """
+        job = self.get(job_id)
+        if job is not None and not job.is_finished():
+            job.cancel()
+
+    def _remove_expired(self):
+        """완료된 지 오래된 작업 삭제"""
+        now = time.time()
+        with self._lock:
+            expired = [
+                job_id for job_id, job in self._jobs.items()
+                if job.finished_at is not None and now - job.finished_at > self.result_ttl
+            ]
+            for job_id in expired:
+                del self._jobs[job_id]
+
+    def stats(self):
+        """상태별 작업 수 반환"""
+        with self._lock:
+            counts = {"pending": 0, "running": 0, "done": 0, "failed": 0, "cancelled": 0}
+            for job in self._jobs.values():
+                counts[job.status] += 1
+        counts["max_workers"] = self.max_workers
+        return counts
+
+_job_manager = None
+_job_manager_lock = threading.Lock()
+
+def get_job_manager():
+    """프로세스 전체에서 공유하는 작업 실행기 반환"""
+    global _job_manager
+    with _job_manager_lock:
+        if _job_manager is None:
+            _job_manager = JobManager()
+    return _job_manager
@@ -0,0 +1,209 @@
+"""
+단계별 처리 시간 측정 모듈 (구조화 로그 + Prometheus 형식 히스토그램)
+
+사용 예:
+    with timing_span("stt_request", engine="clova", file_size=size) as span:
+        ...
+        span["outcome"] = "fallback"
+
+처리 시간은 JSON 한 줄 로그로 출력되고, METRICS_PORT의 /metrics 경로에서
+Prometheus 형식 히스토그램으로 수집할 수 있습니다.
+"""
+import json
+import logging
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from config.settings import (
+    TIMING_LOG_ENABLED, METRICS_ENABLED, METRICS_HOST, METRICS_PORT, METRICS_BUCKETS
+)
+
+METRIC_NAME = "meetingnotes_stage_duration_seconds"
+LABEL_NAMES = ("stage", "provider", "outcome", "size")
+
+# 파일 크기는 라벨 값이 너무 많아지지 않도록 구간으로 묶음 (정확한 값은 로그에 기록)
+SIZE_CLASSES = [(1, "lt_1mb"), (10, "1_10mb"), (25, "10_25mb"), (100, "25_100mb")]
+
+_logger = logging.getLogger("meetingnotes.timing")
+if not _logger.handlers:
+    _handler = logging.StreamHandler(sys.stderr)
+    _handler.setFormatter(logging.Formatter("%(message)s"))
+    _logger.addHandler(_handler)
+    _logger.setLevel(logging.INFO)
+    _logger.propagate = False
+
+def size_class(file_size):
+    """파일 크기(바이트)를 라벨용 구간 이름으로 변환"""
+    if file_size is None:
+        return ""
+    size_mb = file_size / (1024 * 1024)
+    for limit, name in SIZE_CLASSES:
+        if size_mb < limit:
+            return name
+    return "ge_100mb"
+
+class Histogram:
+    """라벨 조합별 누적 히스토그램 (Prometheus histogram과 같은 구조)"""
+
+    def __init__(self, buckets):
+        self.buckets = sorted(buckets)
+        self._series = {}  # 라벨 값 튜플 -> [버킷별 개수, 합계, 개수]
+        self._lock = threading.Lock()
+
+    def observe(self, labels, value):
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[0][i] += 1
+            series[1] += value
+            series[2] += 1
+
+    def snapshot(self):
+        with self._lock:
+            return {labels: (list(counts), total, count) for labels, (counts, total, count) in self._series.items()}
+
+_histogram = Histogram(METRICS_BUCKETS)
+_gauges = {}  # 지표 이름 -> (설명, 라벨 이름, 현재 값 함수)
+
+def register_gauge(name, help_text, label, collect):
+    """
+    /metrics에 현재 값(gauge) 지표 추가
+
+    Parameters:
+    name (str): 지표 이름
+    help_text (str): 지표 설명
+    label (str): 라벨 이름
+    collect: 호출 시 {라벨 값: 현재 값} dict를 반환하는 함수 (None인 값은 출력하지 않음)
+    """
+    _gauges[name] = (help_text, label, collect)
+
+def _format_labels(names, values, extra=None):
+    pairs = [(name, value) for name, value in zip(names, values) if value != ""]
+    if extra:
+        pairs.append(extra)
+    escaped = ",".join(
+        '{}="{}"'.format(name, str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for name, value in pairs
+    )
+    return "{" + escaped + "}"
+
+def render_prometheus():
+    """수집된 처리 시간을 Prometheus 텍스트 형식으로 반환"""
+    lines = [
+        f"# HELP {METRIC_NAME} 회의록 처리 단계별 소요 시간(초)",
+        f"# TYPE {METRIC_NAME} histogram",
+    ]
+    for labels, (counts, total, count) in sorted(_histogram.snapshot().items()):
+        for bound, bucket_count in zip(_histogram.buckets, counts):
+            lines.append(f"{METRIC_NAME}_bucket{_format_labels(LABEL_NAMES, labels, ('le', repr(float(bound))))} {bucket_count}")
+        lines.append(f"{METRIC_NAME}_bucket{_format_labels(LABEL_NAMES, labels, ('le', '+Inf'))} {count}")
+        lines.append(f"{METRIC_NAME}_sum{_format_labels(LABEL_NAMES, labels)} {total}")
+        lines.append(f"{METRIC_NAME}_count{_format_labels(LABEL_NAMES, labels)} {count}")
+
+    for name, (help_text, label, collect) in sorted(_gauges.items()):
+        try:
+            values = collect()
+        except Exception:
+            continue
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} gauge")
+        for label_value, value in sorted(values.items()):
+            if value is not None:
+                lines.append(f"{name}{_format_labels((label,), (label_value,))} {value}")
+    return "\n".join(lines) + "\n"
+
+def get_stage_summary():
+    """단계별 요청 수와 평균 소요 시간(초) 반환 (사이드바 표시용)"""
+    summary = {}
+    for labels, (_, total, count) in _histogram.snapshot().items():
+        stage = summary.setdefault(labels[0], {"count": 0, "total": 0.0})
+        stage["count"] += count
+        stage["total"] += total
+    return {
+        stage: {"count": values["count"], "avg_sec": values["total"] / values["count"]}
+        for stage, values in summary.items() if values["count"]
+    }
+
+@contextmanager
+def timing_span(stage, **tags):
+    """
+    코드 블록의 처리 시간 측정
+
+    블록 안에서 반환된 dict에 값을 넣으면 (예: span["outcome"] = "fallback") 태그로 함께 기록됩니다.
+    예외가 발생하면 outcome은 "error"로 기록되고 예외는 그대로 전달됩니다.
+
+    Parameters:
+    stage (str): 단계 이름 ("spool", "transcribe", "stt_request", "llm_request" 등)
+    tags: engine, model, file_size, outcome 등 추가 정보
+    """
+    span = dict(tags)
+    started = time.perf_counter()
+    try:
+        yield span
+    except BaseException as e:
+        span["outcome"] = "error"
+        span.setdefault("error", type(e).__name__)
+        raise
+    finally:
+        duration = time.perf_counter() - started
+        record_span(stage, duration, span)
+
+def record_span(stage, duration, tags):
+    """측정한 처리 시간을 히스토그램과 로그에 기록"""
+    tags.setdefault("outcome", "ok")
+    provider = tags.get("engine") or tags.get("model") or ""
+    labels = (stage, str(provider), str(tags["outcome"]), size_class(tags.get("file_size")))
+    _histogram.observe(labels, duration)
+
+    if TIMING_LOG_ENABLED:
+        record = {"event": "timing", "stage": stage, "duration_ms": round(duration * 1000, 1)}
+        record.update(tags)
+        record["thread"] = threading.current_thread().name
+        record["ts"] = time.time()
+        _logger.info(json.dumps(record, ensure_ascii=False, default=str))
+
+class MetricsRequestHandler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        if self.path.split("?", 1)[0] != "/metrics":
+            self.send_error(404)
+            return
+        data = render_prometheus().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+_metrics_server = None
+_metrics_server_lock = threading.Lock()
+
+def start_metrics_server():
+    """
+    /metrics 엔드포인트 서버 시작 (프로세스당 한 번, 이미 실행 중이면 무시)
+
+    Streamlit은 임의 경로를 추가할 수 없으므로 별도 포트의 작은 HTTP 서버를 사용합니다.
+    포트를 사용할 수 없으면 (다른 프로세스가 사용 중 등) 로그만 남기고 계속 실행합니다.
+    """
+    global _metrics_server
+    if not METRICS_ENABLED:
+        return None
+    with _metrics_server_lock:
+        if _metrics_server is None:
+            try:
+                server = ThreadingHTTPServer((METRICS_HOST, METRICS_PORT), MetricsRequestHandler)
+            except OSError as e:
+                _logger.warning(json.dumps({"event": "metrics_server_error", "error": str(e)}, ensure_ascii=False))
+                _metrics_server = False
+                return None
+            server.daemon_threads = True
+            threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+            _metrics_server = server
+    return _metrics_server or None
@@ -2,18 +2,41 @@
 회의록 생성 모듈
 """
 import os
+import re
 import time
 import streamlit as st
-import openai
-import anthropic
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
-from modules.utils import update_full_transcript
+from modules.utils import (
+    update_full_transcript, add_job_notices, render_job_notices, persist_session_fields, persist_file
+)
+from modules.storage import get_session_store
+from modules.artifacts import EXPORT_FORMATS
+from modules.jobs import get_job_manager, JobQueueFull
+from modules.clients import get_anthropic_client, get_openai_client
+from modules.rate_limit import rate_limited_call, rate_limited_stream, bind_rate_limit_owner, check_cancelled
+from modules.single_flight import run_single_flight
+from modules.hedging import hedged_call
+from modules.metrics import timing_span, record_span
+from modules.cache import make_summary_cache_key, get_cached_summary, store_cached_summary, make_cache_key
+from modules.compaction import compact_transcript
 from config.settings import (
     CLAUDE_MODEL, CLAUDE_MAX_TOKENS, CLAUDE_TEMPERATURE,
     OPENAI_MODEL, OPENAI_MAX_TOKENS, OPENAI_TEMPERATURE,
-    MINUTES_SYSTEM_PROMPT
+    MINUTES_SYSTEM_PROMPT, MINUTES_CHUNKING_ENABLED, MINUTES_CHUNK_MAX_CHARS,
+    MINUTES_CHUNK_CONCURRENCY, MINUTES_CHUNK_SYSTEM_PROMPT,
+    MINUTES_STREAMING_ENABLED, MINUTES_STREAM_RENDER_INTERVAL, SUMMARY_CACHE_ENABLED,
+    BACKGROUND_JOBS_ENABLED, JOB_POLL_INTERVAL, LLM_HEDGING_MODE, LLM_HEDGE_DELAY_SEC,
+    MINUTES_COMPACTION_ENABLED, COMPACTION_TIME_INTERVAL_SEC, COMPACTION_FILLER_PATTERNS,
+    COMPACTION_HESITATION_WORDS
 )
 
+# 화자 헤더 줄 패턴 (예: "참석자 A 01:23", "1 12:05")
+SPEAKER_HEADER_PATTERN = re.compile(r"^.{1,30} \d{2,}:\d{2}$")
+# 항목 헤더 줄 패턴 (update_full_transcript 형식, 예: "[2025-01-01 10:00:00 - 직접 입력]",
+# 압축된 형식, 예: "[2025-01-01 10:00 - 직접 입력]", "[10:05 - 직접 입력]")
+ENTRY_HEADER_PATTERN = re.compile(r"^\[(?:\d{4}-\d{2}-\d{2} )?\d{2}:\d{2}(?::\d{2})? - .*\]$")
+
 def setup_minutes_interface():
     """회의록 생성 인터페이스 설정"""
     st.markdown('<h3 class="subheader">회의록 생성</h3>', unsafe_allow_html=True)
@@ -22,187 +45,806 @@ def setup_minutes_interface():
     model_name = "Anthropic Claude" if st.session_state.summary_model == "claude" else "OpenAI GPT"
     st.info(f"현재 선택된 회의록 요약 모델: {model_name} (사이드바에서 변경 가능)")
     
+    # 캐시된 회의록 대신 새로 생성하는 옵션
+    force_regenerate = False
+    if SUMMARY_CACHE_ENABLED:
+        force_regenerate = st.checkbox("이전 결과를 사용하지 않고 새로 생성", value=False,
+                                       help="같은 내용으로 생성한 회의록이 있어도 AI 모델을 다시 호출합니다.",
+                                       key="force_regenerate")
+    
+    # 백그라운드 회의록 생성 작업 결과 메시지 표시
+    render_job_notices("minutes")
+    
     if st.button("회의록 생성하기", use_container_width=True, key="generate_minutes"):
-        generate_minutes()
+        if BACKGROUND_JOBS_ENABLED:
+            submit_minutes_job(force_regenerate=force_regenerate)
+        else:
+            generate_minutes(force_regenerate=force_regenerate)
+    
+    # 백그라운드로 생성 중인 회의록 진행 상태 표시
+    if st.session_state.minutes_job is not None:
+        render_minutes_job()
     
     # 결과 표시 및 다운로드
     if st.session_state.processing_complete and st.session_state.summary:
         display_minutes_results()
 
-def generate_minutes():
-    """회의록 생성 처리"""
+def generate_minutes(force_regenerate=False):
+    """
+    회의록 생성 처리 (백그라운드 작업을 사용하지 않는 경우)
+    
+    백그라운드 작업과 같은 summarize_transcript를 화면 스레드에서 실행하므로
+    요청 제한, 이중 요청(헤징), 캐시, 동일 요청 합치기가 똑같이 적용됩니다.
+    
+    Parameters:
+    force_regenerate (bool): True이면 캐시된 회의록을 사용하지 않고 새로 생성
+    """
     try:
         with st.spinner("회의록을 생성 중..."):
             # 진행 상태 표시
             progress_text = st.empty()
             progress_bar = st.progress(0)
             
+            def on_progress(progress, message):
+                if progress is not None:
+                    progress_bar.progress(progress)
+                if message is not None:
+                    progress_text.text(message)
+            
             # 전체 텍스트 생성
             full_transcript = update_full_transcript()
+            summary_model = st.session_state.summary_model
+            started = time.perf_counter()
             
-            progress_text.text("AI 모델 초기화 중...")
-            progress_bar.progress(10)
+            # 같은 회의 내용, 모델, 프롬프트로 생성한 회의록이 있으면 바로 사용
+            if SUMMARY_CACHE_ENABLED and not force_regenerate:
+                cached_summary = get_cached_minutes(full_transcript, summary_model)
+                if cached_summary:
+                    st.session_state.summary = cached_summary
+                    record_span("generate_minutes", time.perf_counter() - started, {
+                        "model": summary_model, "transcript_chars": len(full_transcript), "outcome": "cached"
+                    })
+                    save_minutes_to_file(full_transcript)
+                    progress_text.empty()
+                    progress_bar.empty()
+                    st.success("이전에 생성한 회의록을 불러왔습니다. (캐시)")
+                    return
             
-            # API 클라이언트 초기화
-            # 각 API 클라이언트를 미리 초기화하여 오류 발생 시에도 사용할 수 있도록 함
+            # API 클라이언트 초기화 (프로세스 전체에서 공유하는 클라이언트로 연결을 재사용)
+            on_progress(10, "AI 모델 초기화 중...")
             claude_client = None
             try:
-                claude_client = anthropic.Anthropic(
-                    api_key=st.session_state.claude_api_key,
-                )
+                claude_client = get_anthropic_client(st.session_state.claude_api_key)
             except Exception as e:
                 st.warning(f"Claude API 클라이언트 초기화 오류: {str(e)}")
             
-            progress_text.text("AI 모델 호출 중...")
-            progress_bar.progress(30)
+            # 스트리밍 출력 (생성되는 토큰을 화면과 파일에 바로 기록)
+            minutes_stream = MinutesStream(st.empty()) if MINUTES_STREAMING_ENABLED else None
             
-            # 선택된 모델에 따라 다른 API 호출
-            if st.session_state.summary_model == "claude":
-                progress_text.text("Claude API로 회의록 생성 중...")
-                try:
-                    # Claude가 기본적으로 선택된 경우
-                    if claude_client is None:
-                        raise Exception("Claude API 클라이언트가 초기화되지 않았습니다.")
-                        
-                    # Claude API 호출
-                    message = claude_client.messages.create(
-                        model=CLAUDE_MODEL,
-                        max_tokens=CLAUDE_MAX_TOKENS,
-                        temperature=CLAUDE_TEMPERATURE,
-                        system=MINUTES_SYSTEM_PROMPT,
-                        messages=[
-                            {
-                                "role": "user",
-                                "content": f"다음 회의 내용을 요약해주세요: {full_transcript}"
-                            }
-                        ]
-                    )
-                    
-                    progress_bar.progress(70)
-                    progress_text.text("회의록 생성 완료...")
-                    
-                    st.session_state.summary = message.content[0].text
-                    st.success("Claude로 회의록이 생성되었습니다!")
-                    
-                except Exception as claude_error:
-                    st.error(f"Claude API 연결 오류: {str(claude_error)}")
-                    st.info("인터넷 연결을 확인하거나 나중에 다시 시도해보세요.")
-                    st.code(str(claude_error))
-                    
-                    # 오류 발생 시 OpenAI로 대체 시도
-                    st.info("Claude API 오류 발생, OpenAI GPT로 대체합니다...")
-                    
-                    try:
-                        response = openai.chat.completions.create(
-                            model=OPENAI_MODEL,
-                            messages=[
-                                {"role": "system", "content": MINUTES_SYSTEM_PROMPT},
-                                {"role": "user", "content": f"다음 회의 내용을 요약해주세요: {full_transcript}"}
-                            ],
-                            max_completion_tokens=OPENAI_MAX_TOKENS
-                        )
-                        
-                        st.session_state.summary = response.choices[0].message.content
-                        st.success("OpenAI GPT로 회의록이 생성되었습니다! (백업)")
-                    except Exception as openai_error:
-                        st.error(f"OpenAI API 오류: {str(openai_error)}")
-                        st.code(str(openai_error))
-                        progress_bar.empty()
-                        progress_text.empty()
-                        st.stop()  # 처리 중단
-            
-            elif st.session_state.summary_model == "openai":
-                progress_text.text("OpenAI API로 회의록 생성 중...")
-                try:
-                    # OpenAI API 호출
-                    response = openai.chat.completions.create(
-                        model=OPENAI_MODEL,
-                        messages=[
-                            {"role": "system", "content": MINUTES_SYSTEM_PROMPT},
-                            {"role": "user", "content": f"다음 회의 내용을 요약해주세요: {full_transcript}"}
-                        ],
-                        max_completion_tokens=OPENAI_MAX_TOKENS
-                    )
-                    
-                    progress_bar.progress(70)
-                    progress_text.text("회의록 생성 완료...")
-                    
-                    st.session_state.summary = response.choices[0].message.content
-                    st.success("OpenAI GPT로 회의록이 생성되었습니다!")
-                    
-                except Exception as openai_error:
-                    st.error(f"OpenAI API 오류: {str(openai_error)}")
-                    st.info("인터넷 연결을 확인하거나 나중에 다시 시도해보세요.")
-                    st.code(str(openai_error))
-                    
-                    # 오류 발생 시 Claude로 대체 시도
-                    st.info("OpenAI API 오류 발생, Claude로 대체합니다...")
-                    
-                    try:
-                        # Claude 클라이언트가 초기화되지 않았으면 다시 초기화
-                        if claude_client is None:
-                            claude_client = anthropic.Anthropic(
-                                api_key=st.session_state.claude_api_key,
-                            )
-                            
-                        # Claude API 호출
-                        message = claude_client.messages.create(
-                            model=CLAUDE_MODEL,
-                            max_tokens=CLAUDE_MAX_TOKENS,
-                            temperature=CLAUDE_TEMPERATURE,
-                            system=MINUTES_SYSTEM_PROMPT,
-                            messages=[
-                                {
-                                    "role": "user",
-                                    "content": f"다음 회의 내용을 요약해주세요: {full_transcript}"
-                                }
-                            ]
-                        )
-                        
-                        st.session_state.summary = message.content[0].text
-                        st.success("Claude로 회의록이 생성되었습니다! (백업)")
-                    except Exception as claude_error:
-                        st.error(f"Claude API 오류: {str(claude_error)}")
-                        st.code(str(claude_error))
-                        progress_bar.empty()
-                        progress_text.empty()
-                        st.stop()  # 처리 중단
+            on_progress(30, "AI 모델 호출 중...")
+            try:
+                summary, _ = summarize_transcript(
+                    full_transcript, summary_model, claude_client, ui=st, on_progress=on_progress,
+                    minutes_stream=minutes_stream
+                )
+            except Exception as summary_error:
+                st.error(f"회의록 생성 API 오류: {str(summary_error)}")
+                st.info("인터넷 연결을 확인하거나 나중에 다시 시도해보세요.")
+                st.code(str(summary_error))
+                if minutes_stream is not None:
+                    minutes_stream.abort()
+                progress_bar.empty()
+                progress_text.empty()
+                return
             
-            # 결과 파일 저장 (요약이 생성된 경우에만)
-            if st.session_state.summary:
+            # 결과 파일 저장 (캐시 저장은 summarize_transcript에서 완료됨)
+            st.session_state.summary = summary
+            if minutes_stream is not None:
+                minutes_stream.finish(full_transcript)
+            else:
                 save_minutes_to_file(full_transcript)
-                
-                progress_bar.progress(100)
-                progress_text.text("완료!")
-                time.sleep(0.5)
-                progress_text.empty()
-                progress_bar.empty()
             
-                st.success("회의록 생성이 완료되었습니다!")
+            progress_bar.progress(100)
+            progress_text.text("완료!")
+            time.sleep(0.5)
+            progress_text.empty()
+            progress_bar.empty()
+            
+            st.success("회의록 생성이 완료되었습니다!")
     
     except Exception as e:
         st.error(f"알 수 없는 오류가 발생했습니다: {str(e)}")
         st.code(str(e))
 
-def save_minutes_to_file(full_transcript):
-    """생성된 회의록을 파일로 저장"""
+def submit_minutes_job(force_regenerate=False):
+    """
+    회의록 생성을 백그라운드 작업으로 등록 (캐시된 회의록이 있으면 바로 사용)
+    
+    Parameters:
+    force_regenerate (bool): True이면 캐시된 회의록을 사용하지 않고 새로 생성
+    """
+    # 이미 생성 중이면 중복 등록하지 않음
+    if st.session_state.minutes_job is not None:
+        st.info("이미 회의록을 생성 중입니다.")
+        return
+    
+    full_transcript = update_full_transcript()
+    summary_model = st.session_state.summary_model
+    
+    # 같은 회의 내용, 모델, 프롬프트로 생성한 회의록이 있으면 바로 사용
+    if SUMMARY_CACHE_ENABLED and not force_regenerate:
+        cached_summary = get_cached_minutes(full_transcript, summary_model)
+        if cached_summary:
+            st.session_state.summary = cached_summary
+            save_minutes_to_file(full_transcript)
+            st.success("이전에 생성한 회의록을 불러왔습니다. (캐시)")
+            return
+    
+    try:
+        job = get_job_manager().submit(
+            "minutes", run_minutes_job,
+            full_transcript, summary_model, st.session_state.claude_api_key
+        )
+    except JobQueueFull as e:
+        st.error(str(e))
+        return
+    
+    st.session_state.minutes_job = {
+        "job_id": job.id,
+        "full_transcript": full_transcript
+    }
+
+def run_minutes_job(job, full_transcript, summary_model, claude_api_key):
+    """
+    백그라운드 작업: 회의록 생성 (화면 메시지는 job에 기록)
+    
+    Returns:
+    dict: {"summary": 회의록, "used_model": 사용된 모델 이름}
+    """
+    job.update(10, "AI 모델 초기화 중...")
+    claude_client = None
+    try:
+        claude_client = get_anthropic_client(claude_api_key)
+    except Exception as e:
+        job.warning(f"Claude API 클라이언트 초기화 오류: {str(e)}")
+    
+    job.update(30, "AI 모델 호출 중...")
+    summary, used_model = summarize_transcript(
+        full_transcript, summary_model, claude_client, ui=job, on_progress=job.update,
+        minutes_stream=job if MINUTES_STREAMING_ENABLED else None
+    )
+    job.check_cancelled()
+    return {"summary": summary, "used_model": used_model}
+
+def summarize_transcript(full_transcript, summary_model, claude_client, ui=st, on_progress=None, minutes_stream=None):
+    """
+    전체 회의 내용으로 회의록 생성 (세션 상태 사용 안 함)
+    
+    긴 회의는 구간별 요약 후 통합하고, minutes_stream이 있으면 스트리밍으로 생성합니다.
+    같은 회의 내용과 모델로 생성 중인 요청이 있으면 API를 다시 호출하지 않고 그 결과를 함께 사용하며,
+    생성한 회의록은 완료 즉시 캐시에 저장하여 뒤이어 들어온 요청도 바로 사용할 수 있게 합니다.
+    
+    Parameters:
+    full_transcript (str): 전체 회의 내용
+    summary_model (str): 기본 모델 ("claude" 또는 "openai")
+    claude_client: Anthropic 클라이언트 (없으면 None)
+    ui: 메시지 출력 대상 (info/success/warning/error 메서드 제공)
+    on_progress: 구간 요약 진행률 콜백 (진행률, 메시지)
+    minutes_stream: 생성 중인 텍스트를 받을 객체 (on_text/reset 메서드 제공)
+    
+    Returns:
+    tuple: (회의록, 사용된 모델)
+    """
+    flight_key = make_cache_key("summarize", get_summary_cache_key(full_transcript, summary_model),
+                                claude_client is not None)
+    
+    def summarize(flight_ui, flight_progress, flight_stream):
+        summary, used_model = create_summary(full_transcript, summary_model, claude_client, flight_ui, flight_progress,
+                                            flight_stream)
+        if SUMMARY_CACHE_ENABLED:
+            store_cached_minutes(full_transcript, used_model, summary)
+        return summary, used_model
+    
+    started = time.perf_counter()
+    (summary, used_model), joined = run_single_flight(
+        flight_key, "minutes", summarize, ui=ui, on_progress=on_progress, minutes_stream=minutes_stream
+    )
+    if joined:
+        record_span("generate_minutes", time.perf_counter() - started, {
+            "model": summary_model, "transcript_chars": len(full_transcript), "used_model": used_model,
+            "outcome": "coalesced"
+        })
+    return summary, used_model
+
+def create_summary(full_transcript, summary_model, claude_client, ui, on_progress, minutes_stream):
+    """summarize_transcript의 실제 생성 처리 (인자와 반환값은 summarize_transcript와 동일)"""
+    with timing_span("generate_minutes", model=summary_model, transcript_chars=len(full_transcript)) as span:
+        llm_transcript = prepare_llm_transcript(full_transcript, ui)
+        summary, used_model, primary_error = run_summarization(
+            llm_transcript, summary_model, claude_client, ui, on_progress, minutes_stream
+        )
+        span["used_model"] = used_model
+        span["outcome"] = "primary" if used_model == summary_model else "fallback"
+    
+    model_name = "Claude" if used_model == "claude" else "OpenAI GPT"
+    if used_model == summary_model:
+        ui.success(f"{model_name}로 회의록이 생성되었습니다!")
+    else:
+        # 기본 모델 오류가 없으면 헤징으로 대체 모델이 먼저 완료된 경우
+        if primary_error is not None:
+            ui.error(f"기본 모델 API 오류: {str(primary_error)}")
+        ui.success(f"{model_name}로 회의록이 생성되었습니다! (백업)")
+    
+    return summary, used_model
+
+def run_summarization(full_transcript, summary_model, claude_client, ui, on_progress, minutes_stream):
+    """
+    summarize_transcript의 실제 생성 처리
+    
+    Returns:
+    tuple: (회의록, 사용된 모델, 기본 모델 오류 또는 None)
+    """
+    primary_error = None
+    
+    # 긴 회의는 구간별로 나누어 요약 후 통합 (map-reduce)
+    if MINUTES_CHUNKING_ENABLED and len(full_transcript) > MINUTES_CHUNK_MAX_CHARS:
+        summary, used_model, fallback_count, _ = summarize_in_chunks(
+            full_transcript, summary_model, claude_client,
+            on_progress=on_progress, minutes_stream=minutes_stream
+        )
+        if fallback_count:
+            ui.warning(f"{fallback_count}개 구간은 기본 모델 오류로 대체 모델이 요약했습니다.")
+    elif minutes_stream is not None:
+        summary, used_model, primary_error = stream_summary(
+            summary_model, claude_client, MINUTES_SYSTEM_PROMPT,
+            build_summary_request(full_transcript), minutes_stream
+        )
+    else:
+        summary, used_model, primary_error = request_summary(
+            summary_model, claude_client, MINUTES_SYSTEM_PROMPT, build_summary_request(full_transcript)
+        )
+    return summary, used_model, primary_error
+
+@st.fragment(run_every=JOB_POLL_INTERVAL)
+def render_minutes_job():
+    """회의록 생성 진행 상태와 생성 중인 내용을 주기적으로 갱신 (이 부분만 다시 실행됨)"""
+    entry = st.session_state.minutes_job
+    if entry is None:
+        return
+    
+    job = get_job_manager().get(entry["job_id"])
+    if job is None:
+        # 작업 정보가 만료된 경우 (서버 재시작 등)
+        st.session_state.minutes_job = None
+        add_job_notices("minutes", [("error", "회의록 생성 작업 정보를 찾을 수 없습니다. 다시 시도해주세요.")])
+        st.rerun()
+    
+    if not job.is_finished():
+        st.info(job.message or "회의록 생성 대기 중...")
+        st.progress(job.progress)
+        partial_text = job.partial_text
+        if partial_text:
+            st.markdown(partial_text)
+        if st.button("회의록 생성 취소", use_container_width=True, key=f"cancel_{job.id}"):
+            get_job_manager().cancel(job.id)
+        return
+    
+    finish_minutes_job(entry, job)
+    st.rerun()
+
+def finish_minutes_job(entry, job):
+    """완료된 회의록 생성 작업 결과를 세션 상태에 반영"""
+    st.session_state.minutes_job = None
+    notices = list(job.messages)
+    
+    if job.status == "done":
+        # 캐시 저장은 작업 스레드(summarize_transcript)에서 이미 완료됨
+        st.session_state.summary = job.result["summary"]
+        save_minutes_to_file(entry["full_transcript"])
+        notices.append(("success", "회의록 생성이 완료되었습니다!"))
+    elif job.status == "cancelled":
+        notices.append(("info", "회의록 생성이 취소되었습니다."))
+    else:
+        notices.append(("error", f"회의록 생성 중 오류가 발생했습니다: {job.error}"))
+    
+    add_job_notices("minutes", notices)
+
+def prepare_llm_transcript(full_transcript, ui=st):
+    """
+    LLM에 보낼 회의 내용 준비 (설정 시 압축하고 줄어든 토큰 수 표시)
+    
+    압축해도 토큰이 줄지 않으면 원본을 그대로 사용합니다.
+    
+    Parameters:
+    full_transcript (str): 전체 회의 내용
+    ui: 메시지 출력 대상 (info 메서드 제공)
+    
+    Returns:
+    str: LLM 요청에 사용할 회의 내용
+    """
+    if not MINUTES_COMPACTION_ENABLED:
+        return full_transcript
+    
+    with timing_span("compact", transcript_chars=len(full_transcript)) as span:
+        compacted, report = compact_transcript(full_transcript)
+        span.update(tokens_before=report["tokens_before"], tokens_after=report["tokens_after"])
+        if report["tokens_after"] >= report["tokens_before"]:
+            span["outcome"] = "skipped"
+            return full_transcript
+    
+    ui.info(
+        f"회의 내용 압축: 약 {report['tokens_before']:,} → {report['tokens_after']:,} 토큰 "
+        f"({report['reduction']:.0%} 감소, 추임새 {report['fillers']}개 제거, "
+        f"발화 {report['merged_segments']}개 병합)"
+    )
+    return compacted
+
+def get_summary_settings_hash():
+    """
+    회의록 결과에 영향을 주는 설정의 해시 (프롬프트, 구간 분할, LLM 입력 압축)
+    
+    설정을 바꾸면 이전 설정으로 만든 회의록 캐시를 사용하지 않습니다.
+    동시 요약 구간 수(MINUTES_CHUNK_CONCURRENCY)처럼 결과에 영향이 없는 설정은 제외합니다.
+    """
+    return make_cache_key(
+        MINUTES_SYSTEM_PROMPT,
+        MINUTES_CHUNKING_ENABLED, MINUTES_CHUNK_MAX_CHARS, MINUTES_CHUNK_SYSTEM_PROMPT,
+        MINUTES_COMPACTION_ENABLED, COMPACTION_TIME_INTERVAL_SEC, COMPACTION_FILLER_PATTERNS,
+        COMPACTION_HESITATION_WORDS
+    )
+
+def get_summary_cache_key(full_transcript, summary_model):
+    """회의 내용과 모델/생성 설정으로 회의록 캐시 키 생성"""
+    if summary_model == "claude":
+        return make_summary_cache_key(full_transcript, "claude", CLAUDE_MODEL, CLAUDE_TEMPERATURE, CLAUDE_MAX_TOKENS,
+                                      get_summary_settings_hash())
+    return make_summary_cache_key(full_transcript, "openai", OPENAI_MODEL, OPENAI_TEMPERATURE, OPENAI_MAX_TOKENS,
+                                  get_summary_settings_hash())
+
+def get_cached_minutes(full_transcript, summary_model):
+    """캐시된 회의록 반환 (없거나 캐시 오류 시 None)"""
+    try:
+        return get_cached_summary(get_summary_cache_key(full_transcript, summary_model))
+    except Exception:
+        return None
+
+def store_cached_minutes(full_transcript, summary_model, summary):
+    """생성된 회의록을 캐시에 저장 (캐시 오류는 결과에 영향 없음)"""
+    try:
+        store_cached_summary(get_summary_cache_key(full_transcript, summary_model), summary)
+    except Exception:
+        pass
+
+def build_summary_request(full_transcript):
+    """요약 요청 메시지 생성"""
+    return f"다음 회의 내용을 요약해주세요: {full_transcript}"
+
+def call_claude(claude_client, system_prompt, user_content):
+    """Claude API 호출 후 응답 텍스트 반환"""
+    message = claude_client.messages.create(
+        model=CLAUDE_MODEL,
+        max_tokens=CLAUDE_MAX_TOKENS,
+        temperature=CLAUDE_TEMPERATURE,
+        system=system_prompt,
+        messages=[
+            {
+                "role": "user",
+                "content": user_content
+            }
+        ]
+    )
+    return message.content[0].text
+
+def call_openai(system_prompt, user_content):
+    """OpenAI API 호출 후 응답 텍스트 반환"""
+    response = get_openai_client().chat.completions.create(
+        model=OPENAI_MODEL,
+        messages=[
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_content}
+        ],
+        max_completion_tokens=OPENAI_MAX_TOKENS
+    )
+    return response.choices[0].message.content
+
+def stream_claude(claude_client, system_prompt, user_content):
+    """Claude API 스트리밍 호출 - 텍스트 조각을 도착하는 대로 반환"""
+    with claude_client.messages.stream(
+        model=CLAUDE_MODEL,
+        max_tokens=CLAUDE_MAX_TOKENS,
+        temperature=CLAUDE_TEMPERATURE,
+        system=system_prompt,
+        messages=[
+            {
+                "role": "user",
+                "content": user_content
+            }
+        ]
+    ) as stream:
+        for text in stream.text_stream:
+            yield text
+
+def stream_openai(system_prompt, user_content):
+    """OpenAI API 스트리밍 호출 - 텍스트 조각을 도착하는 대로 반환"""
+    stream = get_openai_client().chat.completions.create(
+        model=OPENAI_MODEL,
+        messages=[
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_content}
+        ],
+        max_completion_tokens=OPENAI_MAX_TOKENS,
+        stream=True
+    )
+    # 도중에 닫히면(GeneratorExit) HTTP 응답도 함께 닫음
+    try:
+        for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+    finally:
+        stream.close()
+
+def get_model_order(summary_model):
+    """선택된 모델을 먼저, 대체 모델을 나중에 시도하는 순서 반환"""
+    if summary_model == "claude":
+        return ["claude", "openai"]
+    return ["openai", "claude"]
+
+def call_model(model, claude_client, system_prompt, user_content):
+    """지정한 모델로 요약 요청 후 응답 텍스트 반환 (제공자 요청 제한 적용, 429 응답은 기다렸다가 재시도)"""
+    if model == "claude" and claude_client is None:
+        raise Exception("Claude API 클라이언트가 초기화되지 않았습니다.")
+    
+    def request():
+        with timing_span("llm_request", model=model, request_chars=len(user_content)):
+            if model == "claude":
+                return call_claude(claude_client, system_prompt, user_content)
+            return call_openai(system_prompt, user_content)
+    
+    return rate_limited_call(model, request)
+
+def open_summary_stream(model, claude_client, system_prompt, user_content, cancel_event=None):
+    """
+    지정한 모델로 스트리밍 요청을 시작하고 첫 텍스트 조각까지 받아 반환
+    
+    스트림이 끝나거나 닫힐 때까지 제공자의 동시 요청 자리 하나를 사용합니다.
+    cancel_event가 설정되면 요청 순서를 기다리거나 재시도하는 중에 중단합니다.
+    
+    Returns:
+    tuple: (첫 텍스트 조각, 나머지 텍스트 조각 iterator)
+    """
+    if model == "claude" and claude_client is None:
+        raise Exception("Claude API 클라이언트가 초기화되지 않았습니다.")
+    
+    def open_stream():
+        with timing_span("llm_first_token", model=model, request_chars=len(user_content)):
+            if model == "claude":
+                chunks = stream_claude(claude_client, system_prompt, user_content)
+            else:
+                chunks = stream_openai(system_prompt, user_content)
+            return next(chunks, ""), chunks
+    
+    return rate_limited_stream(model, open_stream, cancel_event=cancel_event)
+
+def collect_summary_stream(model, claude_client, system_prompt, user_content, cancel_event):
+    """
+    스트리밍으로 요약을 받아 전체 텍스트 반환 (이중 요청의 비스트리밍 요약에 사용)
+    
+    조각을 받을 때마다 중단 여부를 확인하므로, 진 쪽 요청은 남은 출력을 받지 않고 바로 연결을 닫아
+    출력 토큰 비용과 동시 요청 자리를 더 쓰지 않습니다.
+    """
+    first, chunks = open_summary_stream(model, claude_client, system_prompt, user_content, cancel_event)
+    try:
+        parts = [first]
+        for text in chunks:
+            check_cancelled(cancel_event)
+            parts.append(text)
+    finally:
+        chunks.close()
+    return "".join(parts)
+
+def request_summary(summary_model, claude_client, system_prompt, user_content):
+    """
+    선택된 모델로 요약을 요청하고 실패 시 다른 모델로 대체
+    
+    LLM_HEDGING_MODE가 켜져 있으면 기본 모델이 지연될 때 대체 모델에도 요청하고 먼저 도착한 결과를 사용합니다.
+    작업 스레드에서도 호출되므로 Streamlit API(st.*)를 사용하지 않습니다.
+    
+    Returns:
+    tuple: (응답 텍스트, 사용된 모델 이름, 대체 모델을 사용했을 때 기본 모델 오류 또는 None)
+    """
+    order = get_model_order(summary_model)
+    if LLM_HEDGING_MODE != "off":
+        # 진 쪽 요청을 도중에 중단할 수 있도록 스트리밍으로 받음
+        return hedged_call(
+            lambda cancel: collect_summary_stream(order[0], claude_client, system_prompt, user_content, cancel),
+            lambda cancel: collect_summary_stream(order[1], claude_client, system_prompt, user_content, cancel),
+            labels=order, delay=LLM_HEDGE_DELAY_SEC, race=LLM_HEDGING_MODE == "race"
+        )
+    
+    primary_error = None
+    for model in order:
+        try:
+            return call_model(model, claude_client, system_prompt, user_content), model, primary_error
+        except Exception as e:
+            if primary_error is None:
+                primary_error = e
+            else:
+                raise Exception(f"{primary_error} / 대체 모델 오류: {str(e)}")
+
+def stream_summary(summary_model, claude_client, system_prompt, user_content, minutes_stream):
+    """
+    선택된 모델로 요약을 스트리밍 요청하고 실패 시 다른 모델로 대체
+    
+    스트림이 도중에 끊기면 받은 내용을 버리고 대체 모델로 처음부터 다시 생성합니다.
+    LLM_HEDGING_MODE가 켜져 있으면 첫 응답이 먼저 도착한 모델의 스트림을 사용합니다.
+    
+    Returns:
+    tuple: (응답 텍스트, 사용된 모델 이름, 대체 모델을 사용했을 때 기본 모델 오류 또는 None)
+    """
+    order = get_model_order(summary_model)
+    primary = order[0]
+    errors = {}  # 모델 이름 -> 오류
+    opened = None
+    
+    # 첫 응답 시간 기준으로 두 모델 경쟁 (진 쪽 스트림은 닫음)
+    if LLM_HEDGING_MODE != "off":
+        opened, first_model, hedge_error = hedged_call(
+            lambda cancel: open_summary_stream(order[0], claude_client, system_prompt, user_content, cancel),
+            lambda cancel: open_summary_stream(order[1], claude_client, system_prompt, user_content, cancel),
+            labels=order, delay=LLM_HEDGE_DELAY_SEC, race=LLM_HEDGING_MODE == "race",
+            discard=lambda result: result[1].close()
+        )
+        if hedge_error is not None:
+            errors[primary] = hedge_error
+        order = [first_model] + [model for model in order if model != first_model]
+    
+    for model in order:
+        try:
+            if opened is not None:
+                first, chunks = opened
+                opened = None
+            else:
+                first, chunks = open_summary_stream(model, claude_client, system_prompt, user_content)
+            
+            # 취소(JobCancelled)나 오류로 중단되어도 바로 스트림을 닫아 동시 요청 자리 반납
+            try:
+                parts = []
+                if first:
+                    parts.append(first)
+                    minutes_stream.on_text(first)
+                for text in chunks:
+                    parts.append(text)
+                    minutes_stream.on_text(text)
+            finally:
+                chunks.close()
+            return "".join(parts), model, errors.get(primary) if model != primary else None
+        except Exception as e:
+            minutes_stream.reset()
+            errors[model] = e
+            if len(errors) == len(order):
+                backup = order[1] if order[0] == primary else order[0]
+                raise Exception(f"{errors[primary]} / 대체 모델 오류: {str(errors[backup])}")
+
+def split_transcript_into_chunks(full_transcript, max_chars=MINUTES_CHUNK_MAX_CHARS):
+    """
+    전체 회의 내용을 항목/화자 경계 기준으로 구간(청크)으로 분할
+    
+    Parameters:
+    full_transcript (str): update_full_transcript() 결과 텍스트
+    max_chars (int): 구간 하나의 최대 글자 수
+    
+    Returns:
+    list: 분할된 구간 텍스트 목록 (원래 순서 유지)
+    """
+    # 항목 헤더 또는 화자 헤더가 시작되는 줄에서 블록을 나눔
+    blocks = []
+    current = []
+    for line in full_transcript.splitlines(keepends=True):
+        stripped = line.strip()
+        if current and (ENTRY_HEADER_PATTERN.match(stripped) or SPEAKER_HEADER_PATTERN.match(stripped)):
+            blocks.append("".join(current))
+            current = []
+        current.append(line)
+    if current:
+        blocks.append("".join(current))
+    
+    chunks = []
+    chunk = ""
+    for block in blocks:
+        # 경계가 없는 매우 긴 블록은 줄 단위로 강제 분할
+        while len(block) > max_chars:
+            cut = block.rfind("\n", 0, max_chars)
+            if cut <= 0:
+                cut = max_chars
+            if chunk:
+                chunks.append(chunk)
+                chunk = ""
+            chunks.append(block[:cut])
+            block = block[cut:]
+        
+        if chunk and len(chunk) + len(block) > max_chars:
+            chunks.append(chunk)
+            chunk = ""
+        chunk += block
+    if chunk.strip():
+        chunks.append(chunk)
+    
+    return [c for c in chunks if c.strip()]
+
+def summarize_in_chunks(full_transcript, summary_model, claude_client, on_progress=None, minutes_stream=None):
+    """
+    긴 회의 내용을 구간별로 동시에 요약(map)한 후 하나의 회의록으로 통합(reduce)
+    
+    Streamlit API를 사용하지 않으므로 백그라운드 작업에서도 실행할 수 있으며, 실패 시 예외가 발생합니다.
+    
+    Parameters:
+    full_transcript (str): 전체 회의 내용
+    summary_model (str): 요약 모델 ("claude" 또는 "openai")
+    claude_client: Claude API 클라이언트 (초기화 실패 시 None)
+    on_progress: 진행률 콜백 (진행률, 메시지)
+    minutes_stream: 통합 단계 스트리밍 출력 대상 (None이면 일괄 생성)
+    
+    Returns:
+    tuple: (통합된 회의록, 사용된 모델 이름, 대체 모델로 요약한 구간 수, 전체 구간 수)
+    """
+    def report(progress, message):
+        if on_progress is not None:
+            on_progress(progress, message)
+    
+    chunks = split_transcript_into_chunks(full_transcript)
+    total = len(chunks)
+    report(30, f"회의 내용을 {total}개 구간으로 나누어 요약 중...")
+    
+    partials = [None] * total
+    fallback_count = 0
+    with ThreadPoolExecutor(max_workers=max(1, min(MINUTES_CHUNK_CONCURRENCY, total))) as executor:
+        futures = {
+            executor.submit(
+                bind_rate_limit_owner(request_summary), summary_model, claude_client, MINUTES_CHUNK_SYSTEM_PROMPT,
+                f"다음은 전체 회의 중 {i + 1}/{total} 구간입니다. 이 구간의 내용을 정리해주세요: {chunk}"
+            ): i
+            for i, chunk in enumerate(chunks)
+        }
+        try:
+            for done, future in enumerate(as_completed(futures), 1):
+                text, used_model, _ = future.result()
+                partials[futures[future]] = text
+                if used_model != summary_model:
+                    fallback_count += 1
+                report(30 + int(40 * done / total), f"구간 요약 중... ({done}/{total})")
+        except BaseException:
+            # 실패 또는 취소 시 아직 시작하지 않은 구간은 요약하지 않음
+            for future in futures:
+                future.cancel()
+            raise
+    
+    # 부분 회의록이 다시 너무 길면 통합 가능한 크기가 될 때까지 단계적으로 합침
+    report(70, "구간별 요약을 하나의 회의록으로 통합 중...")
+    while len(partials) > 1 and sum(len(p) for p in partials) > MINUTES_CHUNK_MAX_CHARS:
+        groups = split_transcript_into_chunks("\n\n".join(partials))
+        if len(groups) >= len(partials):
+            break
+        with ThreadPoolExecutor(max_workers=max(1, min(MINUTES_CHUNK_CONCURRENCY, len(groups)))) as executor:
+            partials = list(executor.map(
+                bind_rate_limit_owner(lambda group: request_summary(
+                    summary_model, claude_client, MINUTES_CHUNK_SYSTEM_PROMPT,
+                    f"다음 부분 회의록들을 하나의 부분 회의록으로 합쳐주세요: {group}"
+                )[0]),
+                groups
+            ))
+    
+    merged_partials = "\n\n".join(
+        f"### 구간 {i + 1}\n{partial}" for i, partial in enumerate(partials)
+    )
+    reduce_request = (
+        f"다음은 하나의 회의를 시간 순서대로 구간별로 나누어 작성한 부분 회의록입니다. "
+        f"중복을 제거하고 하나의 회의록으로 통합해주세요: {merged_partials}"
+    )
+    if minutes_stream is not None:
+        summary, used_model, _ = stream_summary(
+            summary_model, claude_client, MINUTES_SYSTEM_PROMPT, reduce_request, minutes_stream
+        )
+    else:
+        summary, used_model, _ = request_summary(
+            summary_model, claude_client, MINUTES_SYSTEM_PROMPT, reduce_request
+        )
+    
+    return summary, used_model, fallback_count, total
+
+class MinutesStream:
+    """스트리밍으로 도착하는 회의록을 화면에 순차적으로 표시하고 완료되면 결과 파일로 저장"""
+    
+    def __init__(self, placeholder):
+        self.placeholder = placeholder
+        self.parts = []
+        self.last_render = 0.0
+    
+    def on_text(self, text):
+        """새로 도착한 텍스트 조각 기록"""
+        self.parts.append(text)
+        
+        # 화면 갱신은 일정 간격으로만 수행
+        now = time.monotonic()
+        if now - self.last_render >= MINUTES_STREAM_RENDER_INTERVAL:
+            self.placeholder.markdown("".join(self.parts))
+            self.last_render = now
+    
+    def reset(self):
+        """스트림이 중단된 경우 받은 내용을 버리고 처음 상태로 되돌림"""
+        self.parts = []
+        self.placeholder.empty()
+    
+    def finish(self, full_transcript):
+        """결과 파일 저장 (회의록 본문은 세션 상태의 요약을 사용)"""
+        self.placeholder.empty()
+        save_minutes_to_file(full_transcript, streaming=True)
+    
+    def abort(self):
+        """생성 실패 시 표시 중인 내용 삭제"""
+        self.placeholder.empty()
+        self.parts = []
+
+def get_minutes_file_info():
+    """결과 파일 이름 정보 반환 (기본 이름, 날짜, 파일 이름)"""
     base_name = os.path.splitext(st.session_state.file_name)[0] if st.session_state.file_name else "회의"
     current_date = datetime.now().strftime("%Y-%m-%d")
-    output_file_name = f"{base_name}_회의록_{current_date}.md"
+    return base_name, current_date, f"{base_name}_회의록_{current_date}.md"
+
+def render_minutes_markdown(base_name, current_date, summary, full_transcript):
+    """회의록 파일 내용(마크다운) 생성"""
+    return (
+        f"# 회의록: {base_name} ({current_date})\n\n"
+        f"{summary}"
+        "\n\n## 전체 회의 내용\n\n"
+        f"{full_transcript}"
+    )
+
+def save_minutes_to_file(full_transcript, streaming=False):
+    """
+    생성된 회의록을 결과 파일로 저장
+    
+    파일은 작업 디렉토리에 쓰지 않고 세션 결과물 보관소(화면 표시/내려받기용)와
+    세션 저장소(인스턴스가 바뀌었을 때 복원용)에 기록합니다.
+    """
+    base_name, current_date, output_file_name = get_minutes_file_info()
     
     try:
-        with open(output_file_name, "w", encoding="utf-8") as f:
-            f.write(f"# 회의록: {base_name} ({current_date})\n\n")
-            f.write(st.session_state.summary)
-            f.write("\n\n## 전체 회의 내용\n\n")
-            f.write(full_transcript)
+        with timing_span("save_minutes", transcript_chars=len(full_transcript), streaming=streaming):
+            content = render_minutes_markdown(base_name, current_date, st.session_state.summary, full_transcript)
+            st.session_state.artifacts.put(os.path.splitext(output_file_name)[0], content)
         
         st.session_state.output_file = output_file_name
-        st.session_state.processing_complete = True
     except Exception as file_error:
         st.error(f"파일 저장 중 오류 발생: {str(file_error)}")
         st.session_state.output_file = None
-        st.session_state.processing_complete = True
+    else:
+        # 저장소 기록 실패는 복원만 못 할 뿐 결과 파일은 정상이므로 저장 실패로 처리하지 않음
+        persist_file(output_file_name, content)
+    st.session_state.processing_complete = True
+    persist_session_fields("summary", "output_file", "processing_complete")
+
+def get_minutes_artifact():
+    """
+    현재 회의록 결과물 반환
+    
+    세션이 복원되어 결과물이 메모리에 없으면 세션 저장소의 파일을, 그것도 없으면
+    현재 회의록과 회의 내용으로 다시 만들어 한 번만 등록합니다.
+    """
+    artifact = st.session_state.artifacts.get_current()
+    if artifact is not None:
+        return artifact
+    
+    output_file_name = st.session_state.output_file or get_minutes_file_info()[2]
+    content = None
+    if st.session_state.output_file:
+        try:
+            content = get_session_store().load_file(st.session_state.session_id, output_file_name)
+        except Exception:
+            content = None
+    if content is None:
+        base_name, current_date, output_file_name = get_minutes_file_info()
+        content = render_minutes_markdown(base_name, current_date, st.session_state.summary, update_full_transcript())
+    return st.session_state.artifacts.put(os.path.splitext(output_file_name)[0], content)
 
 def display_minutes_results():
     """회의록 결과 표시 및 다운로드 옵션 제공"""
@@ -212,37 +854,28 @@ def display_minutes_results():
     st.markdown(st.session_state.summary)
     st.markdown('</div>', unsafe_allow_html=True)
     
-    # 다운로드 버튼 (파일이 성공적으로 저장된 경우에만)
-    if hasattr(st.session_state, 'output_file') and st.session_state.output_file:
+    # 내려받기 (선택한 형식만 처음 요청할 때 만들고, 이후 재실행에서는 캐시 사용)
+    artifact = get_minutes_artifact()
+    col1, col2 = st.columns([1, 2])
+    with col1:
+        fmt = st.selectbox("파일 형식", list(EXPORT_FORMATS), format_func=lambda key: EXPORT_FORMATS[key][0],
+                           key="export_format", label_visibility="collapsed")
+    with col2:
         try:
-            with open(st.session_state.output_file, "r", encoding="utf-8") as file:
-                st.download_button(
-                    label="회의록 다운로드",
-                    data=file,
-                    file_name=st.session_state.output_file,
-                    mime="text/markdown",
-                    use_container_width=True
-                )
-        except Exception as download_error:
-            st.error(f"파일 다운로드 준비 중 오류: {str(download_error)}")
-            
-            # 대체 다운로드 방법
-            full_transcript = update_full_transcript()
-            markdown_content = f"# 회의록: {os.path.splitext(st.session_state.file_name)[0]} ({datetime.now().strftime('%Y-%m-%d')})\n\n"
-            markdown_content += st.session_state.summary
-            markdown_content += "\n\n## 전체 회의 내용\n\n"
-            markdown_content += full_transcript
-            
             st.download_button(
-                label="회의록 다운로드 (대체 방식)",
-                data=markdown_content,
-                file_name=f"회의록_{datetime.now().strftime('%Y-%m-%d')}.md",
-                mime="text/markdown",
+                label="회의록 다운로드",
+                data=artifact.export(fmt),
+                file_name=artifact.file_name(fmt),
+                mime=EXPORT_FORMATS[fmt][2],
                 use_container_width=True
             )
+        except Exception as download_error:
+            st.error(f"파일 다운로드 준비 중 오류: {str(download_error)}")
     
     # 결과 리셋 버튼
     if st.button("새로운 회의록 만들기", use_container_width=True, key="reset_button"):
         st.session_state.summary = None
         st.session_state.processing_complete = False
+        st.session_state.artifacts.clear()
+        persist_session_fields("summary", "processing_complete")
         st.rerun()
@@ -0,0 +1,388 @@
+"""
+제공자별 요청 제한 모듈 (프로세스 전체에서 모든 세션의 API 요청을 조율)
+
+여러 세션이 동시에 같은 제공자에 요청하면 429(요청 한도 초과) 응답이 늘어나고, 이를 오류로 보고
+대체 제공자로 넘기면 대체 제공자까지 한도에 걸립니다. 제공자마다 ProviderLimiter 하나가
+
+- 토큰 버킷으로 초당 요청 수를 제한하고
+- 동시 요청 한도를 AIMD 방식으로 조절하며 (성공하면 조금씩 늘리고, 과부하 응답이면 크게 줄임)
+- 과부하 응답의 Retry-After 동안 새 요청을 보내지 않고
+- 대기 중인 요청을 요청자(작업)별로 번갈아 처리하여 한 세션의 많은 구간 요청이 다른 세션을 막지 않도록 합니다.
+
+과부하/일시 오류는 무작위 지터를 적용한 시간만큼 기다린 뒤 같은 제공자로 다시 시도하며, 재시도 횟수를 넘기거나
+순서를 기다리는 시간이 초과된 경우에만 예외를 전달합니다 (이후 호출한 쪽에서 대체 엔진 사용).
+"""
+import random
+import threading
+import time
+from collections import OrderedDict, deque
+from email.utils import parsedate_to_datetime
+from modules.metrics import record_span, register_gauge
+from config.settings import (
+    RATE_LIMIT_ENABLED, PROVIDER_RATE_LIMITS, RATE_LIMIT_MIN_CONCURRENCY, RATE_LIMIT_DECREASE_FACTOR,
+    RATE_LIMIT_MAX_RETRIES, RATE_LIMIT_BACKOFF_BASE_SEC, RATE_LIMIT_BACKOFF_MAX_SEC, RATE_LIMIT_QUEUE_TIMEOUT_SEC,
+    HEDGE_CANCEL_CHECK_SEC
+)
+
+# 과부하 응답: 동시 요청 한도를 줄이고 Retry-After 동안 새 요청 중단
+THROTTLE_STATUS = (429, 503, 529)
+# 일시 오류: 한도는 유지하고 지터 대기 후 재시도
+TRANSIENT_STATUS = (408, 409, 500, 502, 504)
+# 응답을 받기 전에 연결이 실패한 경우의 예외 이름 (openai/anthropic SDK, requests 공통)
+TRANSIENT_ERROR_NAMES = ("APIConnectionError", "ConnectionError", "ConnectTimeout")
+
+class RateLimitTimeout(Exception):
+    """요청 순서를 기다리는 시간 초과"""
+
+class RequestCancelled(Exception):
+    """결과가 더 이상 필요 없어 중단된 요청 (이중 요청에서 진 쪽 등)"""
+
+def check_cancelled(cancel_event):
+    """중단 이벤트가 설정되었으면 RequestCancelled 발생 (cancel_event가 None이면 확인하지 않음)"""
+    if cancel_event is not None and cancel_event.is_set():
+        raise RequestCancelled("요청이 중단되었습니다.")
+
+class ProviderHTTPError(Exception):
+    """
+    상태 코드와 Retry-After를 확인할 수 있는 HTTP 오류 (requests로 직접 호출하는 클로바용)
+
+    SDK 예외와 같은 이름의 속성(status_code)을 가지므로 classify_error에서 같은 방식으로 처리합니다.
+    """
+
+    def __init__(self, status_code, text="", retry_after=None):
+        super().__init__(f"API 응답 오류 ({status_code}): {text}")
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+def parse_retry_after(value):
+    """Retry-After 헤더 값(초 또는 HTTP 날짜)을 초로 변환 (없거나 해석할 수 없으면 None)"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError, IndexError, OverflowError):
+        return None
+
+def check_response(response):
+    """requests 응답이 과부하/일시 오류 상태이면 ProviderHTTPError 발생, 아니면 응답 그대로 반환"""
+    if response.status_code in THROTTLE_STATUS or response.status_code in TRANSIENT_STATUS:
+        raise ProviderHTTPError(response.status_code, response.text,
+                                parse_retry_after(response.headers.get("Retry-After")))
+    return response
+
+def classify_error(error):
+    """
+    예외 종류 판별
+
+    Returns:
+    tuple: (종류 - "throttled", "transient", "fatal", Retry-After(초) 또는 None)
+    """
+    status = getattr(error, "status_code", None)
+    retry_after = getattr(error, "retry_after", None)
+    headers = getattr(getattr(error, "response", None), "headers", None)
+    if retry_after is None and headers is not None:
+        # OpenAI는 밀리초 단위 헤더를 함께 보냄
+        retry_after_ms = parse_retry_after(headers.get("retry-after-ms"))
+        retry_after = retry_after_ms / 1000 if retry_after_ms is not None else parse_retry_after(headers.get("retry-after"))
+
+    if status in THROTTLE_STATUS:
+        return "throttled", retry_after
+    if status in TRANSIENT_STATUS or type(error).__name__ in TRANSIENT_ERROR_NAMES:
+        return "transient", retry_after
+    return "fatal", None
+
+def backoff_delay(attempt, retry_after=None):
+    """재시도 대기 시간(초) - 시도마다 두 배로 늘어나는 범위에서 무작위 선택, Retry-After가 있으면 그 이후로"""
+    delay = random.uniform(0, min(RATE_LIMIT_BACKOFF_MAX_SEC, RATE_LIMIT_BACKOFF_BASE_SEC * 2 ** attempt))
+    if retry_after is not None:
+        # 같은 응답을 받은 요청들이 동시에 다시 보내지 않도록 Retry-After 뒤에 지터를 더함
+        delay = retry_after + random.uniform(0, RATE_LIMIT_BACKOFF_BASE_SEC)
+    return delay
+
+# 요청자 (대기열에서 번갈아 처리하는 단위, 지정하지 않으면 스레드 단위)
+_owner = threading.local()
+
+def set_rate_limit_owner(owner):
+    """현재 스레드의 요청자 지정 (백그라운드 작업은 작업 ID 사용, None이면 해제)"""
+    _owner.value = owner
+
+def get_rate_limit_owner():
+    return getattr(_owner, "value", None) or threading.get_ident()
+
+def bind_rate_limit_owner(func):
+    """
+    현재 요청자를 다른 스레드에서도 사용하도록 func를 감싸서 반환
+
+    구간 변환/구간 요약처럼 한 작업의 요청을 여러 스레드로 나눠 보낼 때 사용하며,
+    같은 작업의 요청은 대기열에서 한 요청자로 묶여 다른 작업과 번갈아 처리됩니다.
+    """
+    owner = get_rate_limit_owner()
+
+    def bound(*args, **kwargs):
+        previous = getattr(_owner, "value", None)
+        _owner.value = owner
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _owner.value = previous
+
+    return bound
+
+class ProviderLimiter:
+    """
+    제공자 하나의 요청 제한 (토큰 버킷 + AIMD 동시 요청 한도 + 요청자별 공정 대기열)
+
+    Parameters:
+    name (str): 제공자 이름
+    rate (float): 초당 요청 수
+    burst (int): 순간 최대 요청 수 (토큰 버킷 크기)
+    initial_limit (int): 시작 동시 요청 한도
+    max_limit (int): 최대 동시 요청 한도
+    """
+
+    def __init__(self, name, rate, burst, initial_limit, max_limit, min_limit=RATE_LIMIT_MIN_CONCURRENCY):
+        self.name = name
+        self.rate = rate
+        self.burst = burst
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.limit = float(initial_limit)
+        self.tokens = float(burst)
+        self.in_flight = 0
+        self.blocked_until = 0.0  # 과부하 응답 후 새 요청을 보내지 않는 시각
+        self.throttled = 0
+        self._refilled = time.monotonic()
+        self._queues = OrderedDict()  # 요청자 -> 대기 순번 목록 (맨 앞 요청자가 다음 차례)
+        self._cond = threading.Condition()
+
+    def _refill(self, now):
+        self.tokens = min(self.burst, self.tokens + (now - self._refilled) * self.rate)
+        self._refilled = now
+
+    def _start_delay(self, now):
+        """다음 요청을 시작할 수 있을 때까지 남은 시간(초) - 동시 요청 한도에 걸렸으면 None"""
+        if self.in_flight >= int(self.limit):
+            return None
+        delay = max(0.0, self.blocked_until - now)
+        if self.tokens < 1:
+            delay = max(delay, (1 - self.tokens) / self.rate)
+        return delay
+
+    def _remove(self, owner, ticket):
+        queue = self._queues.get(owner)
+        if queue is not None:
+            queue.remove(ticket)
+            if not queue:
+                del self._queues[owner]
+
+    def acquire(self, owner, timeout=RATE_LIMIT_QUEUE_TIMEOUT_SEC, cancel_event=None):
+        """
+        요청 차례가 될 때까지 대기 (차례가 된 요청자는 대기열 맨 뒤로 이동)
+
+        Raises:
+        RateLimitTimeout: timeout(초) 안에 차례가 오지 않은 경우
+        RequestCancelled: 기다리는 동안 cancel_event가 설정된 경우
+        """
+        ticket = object()
+        started = time.monotonic()
+        deadline = started + timeout
+        with self._cond:
+            self._queues.setdefault(owner, deque()).append(ticket)
+            try:
+                while True:
+                    now = time.monotonic()
+                    self._refill(now)
+                    head = next(iter(self._queues))
+                    delay = self._start_delay(now) if self._queues[head][0] is ticket else None
+                    if delay is not None and delay <= 0:
+                        break
+                    if now >= deadline:
+                        raise RateLimitTimeout(f"{self.name} 요청 대기 시간이 초과되었습니다.")
+                    check_cancelled(cancel_event)
+                    wait = deadline - now if delay is None else min(delay, deadline - now)
+                    if cancel_event is not None:
+                        wait = min(wait, HEDGE_CANCEL_CHECK_SEC)
+                    self._cond.wait(wait)
+            except BaseException:
+                self._remove(owner, ticket)
+                self._cond.notify_all()
+                record_span("rate_limit_wait", time.monotonic() - started, {"engine": self.name, "outcome": "timeout"})
+                raise
+
+            self._remove(owner, ticket)
+            if owner in self._queues:
+                self._queues.move_to_end(owner)  # 남은 요청은 다른 요청자 다음 차례
+            self.tokens -= 1
+            self.in_flight += 1
+            self._cond.notify_all()
+        record_span("rate_limit_wait", time.monotonic() - started, {"engine": self.name})
+
+    def release(self, outcome, retry_after=None):
+        """
+        요청 종료 후 동시 요청 한도 조절
+
+        Parameters:
+        outcome (str): "ok" (한도 증가), "throttled" (한도 감소, Retry-After 동안 중단), 그 외 (한도 유지)
+        retry_after (float): 과부하 응답의 Retry-After(초)
+        """
+        with self._cond:
+            self.in_flight -= 1
+            now = time.monotonic()
+            if outcome == "ok":
+                # 한도만큼 요청이 성공하면 한도를 1 늘리는 정도로 천천히 증가
+                self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+            elif outcome == "throttled":
+                self.throttled += 1
+                # 같은 과부하로 동시에 실패한 요청들이 한도를 연달아 줄이지 않도록 중단 중에는 한 번만 감소
+                if now >= self.blocked_until:
+                    self.limit = max(self.min_limit, self.limit * RATE_LIMIT_DECREASE_FACTOR)
+                pause = retry_after if retry_after is not None else RATE_LIMIT_BACKOFF_BASE_SEC
+                self.blocked_until = max(self.blocked_until, now + pause)
+            self._cond.notify_all()
+
+    def call(self, func, keep_slot=False, cancel_event=None):
+        """
+        요청 제한을 적용하여 func() 실행 (과부하/일시 오류는 지터 대기 후 재시도)
+
+        Parameters:
+        func: 요청 함수 (인자 없음, 재시도 시 다시 호출됨)
+        keep_slot (bool): True이면 성공 후 동시 요청 자리를 반납하지 않음 (스트림이 끝날 때 release 호출)
+        cancel_event (threading.Event): 설정되면 대기/재시도를 멈추고 RequestCancelled 발생 (요청은 보내지 않음)
+        """
+        owner = get_rate_limit_owner()
+        attempt = 0
+        while True:
+            self.acquire(owner, cancel_event=cancel_event)
+            try:
+                check_cancelled(cancel_event)
+                result = func()
+            except Exception as e:
+                kind, retry_after = classify_error(e)
+                self.release(kind, retry_after)
+                if kind == "fatal" or attempt >= RATE_LIMIT_MAX_RETRIES:
+                    raise
+            except BaseException:
+                self.release("cancelled")
+                raise
+            else:
+                if not keep_slot:
+                    self.release("ok")
+                return result
+
+            delay = backoff_delay(attempt, retry_after)
+            record_span("provider_retry", delay, {"engine": self.name, "outcome": kind})
+            if cancel_event is not None:
+                cancel_event.wait(delay)
+            else:
+                time.sleep(delay)
+            attempt += 1
+
+    def open_stream(self, open_func, cancel_event=None):
+        """
+        스트리밍 요청 시작 (첫 조각을 받을 때까지 call과 같이 재시도)
+
+        Parameters:
+        open_func: (첫 텍스트 조각, 나머지 조각 iterator)를 반환하는 함수
+        cancel_event (threading.Event): call과 같음
+
+        Returns:
+        tuple: (첫 텍스트 조각, 스트림이 끝나거나 닫힐 때 동시 요청 자리를 반납하는 iterator)
+        """
+        first, chunks = self.call(open_func, keep_slot=True, cancel_event=cancel_event)
+        return first, LimitedStream(self, chunks)
+
+    def stats(self):
+        with self._cond:
+            return {
+                "limit": int(self.limit),
+                "in_flight": self.in_flight,
+                "queued": sum(len(queue) for queue in self._queues.values()),
+                "throttled": self.throttled,
+            }
+
+class LimitedStream:
+    """스트림이 끝나거나 닫힐 때 동시 요청 자리를 한 번만 반납하는 iterator"""
+
+    def __init__(self, limiter, chunks):
+        self._limiter = limiter
+        self._chunks = chunks
+        self._released = False
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        try:
+            return next(self._chunks)
+        except StopIteration:
+            self._release("ok")
+            raise
+        except Exception as e:
+            kind, retry_after = classify_error(e)
+            self._release(kind, retry_after)
+            raise
+        except BaseException:
+            self._release("cancelled")
+            raise
+
+    def close(self):
+        """스트림 중단 (다 읽은 뒤에도 호출 가능, 헤징에서 진 쪽 스트림 정리 등)"""
+        try:
+            close = getattr(self._chunks, "close", None)
+            if close is not None:
+                close()
+        finally:
+            self._release("cancelled")
+
+    def _release(self, outcome, retry_after=None):
+        if not self._released:
+            self._released = True
+            self._limiter.release(outcome, retry_after)
+
+    def __del__(self):
+        # 사용하는 쪽에서 close()를 호출하지 못한 경우의 대비책 (가비지 컬렉션 시점에 반납)
+        self._release("cancelled")
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+def get_rate_limiter(provider):
+    """프로세스 전체에서 공유하는 제공자별 ProviderLimiter 반환"""
+    with _limiters_lock:
+        if provider not in _limiters:
+            rate, burst, initial_limit, max_limit = PROVIDER_RATE_LIMITS[provider]
+            _limiters[provider] = ProviderLimiter(provider, rate, burst, initial_limit, max_limit)
+        return _limiters[provider]
+
+def rate_limited_call(provider, func, cancel_event=None):
+    """제공자 요청 제한을 적용하여 func() 실행 (RATE_LIMIT_ENABLED가 꺼져 있으면 그대로 실행)"""
+    if not RATE_LIMIT_ENABLED:
+        check_cancelled(cancel_event)
+        return func()
+    return get_rate_limiter(provider).call(func, cancel_event=cancel_event)
+
+def rate_limited_stream(provider, open_func, cancel_event=None):
+    """제공자 요청 제한을 적용하여 스트리밍 요청 시작 (반환값은 open_func와 같은 형식)"""
+    if not RATE_LIMIT_ENABLED:
+        check_cancelled(cancel_event)
+        return open_func()
+    return get_rate_limiter(provider).open_stream(open_func, cancel_event=cancel_event)
+
+def get_rate_limit_stats():
+    """제공자별 동시 요청 한도/진행 중/대기 중 요청 수 (사용한 제공자만)"""
+    with _limiters_lock:
+        limiters = list(_limiters.values())
+    return {limiter.name: limiter.stats() for limiter in limiters}
+
+def _collect(key):
+    return lambda: {provider: stats[key] for provider, stats in get_rate_limit_stats().items()}
+
+register_gauge("meetingnotes_provider_concurrency_limit", "제공자별 현재 동시 요청 한도", "provider", _collect("limit"))
+register_gauge("meetingnotes_provider_in_flight", "제공자별 진행 중인 요청 수", "provider", _collect("in_flight"))
+register_gauge("meetingnotes_provider_queue_depth", "제공자별 차례를 기다리는 요청 수", "provider", _collect("queued"))
+register_gauge("meetingnotes_provider_throttled", "제공자별 과부하 응답(429/503/529) 누적 수", "provider",
+               _collect("throttled"))
@@ -0,0 +1,285 @@
+"""
+세션 메모리 관리 모듈 - 세션별 메모리 예산과 큰 텍스트의 디스크 보관
+
+Streamlit은 모든 세션 상태를 한 프로세스 메모리에 두므로 동시 사용자가 늘면 긴 회의 내용이 그대로 쌓입니다.
+세션 상태가 SESSION_MEMORY_BUDGET_BYTES를 넘으면 다음 순서로 메모리를 줄입니다.
+
+1. 전체 트랜스크립트 캐시(이어 붙인 텍스트와 항목별 블록)와 회의록 내보내기 캐시 해제 - 필요할 때 다시 만듦
+2. 큰 텍스트 항목을 압축 파일(SpillStore)로 옮기고 항목에는 키와 미리보기만 남김 - 화면 표시/편집/요약 시 읽음
+
+옮긴 텍스트는 내용 해시로 저장하므로 여러 세션이 같은 파일을 올려도 디스크에는 한 번만 저장됩니다.
+"""
+import hashlib
+import os
+import sys
+import tempfile
+import threading
+import time
+import zlib
+from modules.metrics import register_gauge
+from config.settings import (
+    SESSION_MEMORY_BUDGET_BYTES, SESSION_SPILL_MIN_CHARS, SESSION_SPILL_DIR, SESSION_SPILL_COMPRESSION_LEVEL,
+    SESSION_TTL_SEC, PROCESSED_FILES_MAX_ENTRIES, SESSION_FOOTPRINT_TTL_SEC, TEXT_ENTRY_PREVIEW_CHARS
+)
+
+class SpillStore:
+    """
+    내용 해시를 키로 사용하는 압축 텍스트 파일 저장소 (프로세스 전체 공유)
+
+    같은 텍스트는 한 번만 저장하며, 임시 파일에 쓴 뒤 os.replace로 교체하므로
+    여러 세션이 동시에 같은 텍스트를 저장해도 깨진 파일을 읽지 않습니다.
+    """
+
+    def __init__(self, directory, compression_level=SESSION_SPILL_COMPRESSION_LEVEL):
+        self.directory = directory
+        self.compression_level = compression_level
+        self.writes = 0
+        self.reads = 0
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self.purge_expired(SESSION_TTL_SEC)
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.z")
+
+    def put(self, text):
+        """텍스트 저장 후 키 반환 (이미 있으면 쓰지 않음)"""
+        data = text.encode("utf-8")
+        key = hashlib.sha256(data).hexdigest()
+        path = self._path(key)
+        if os.path.exists(path):
+            os.utime(path, None)
+            return key
+
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(zlib.compress(data, self.compression_level))
+            os.replace(tmp_path, path)
+        except Exception:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+        with self._lock:
+            self.writes += 1
+        return key
+
+    def get(self, key):
+        """저장된 텍스트 반환 (파일이 없으면 FileNotFoundError)"""
+        path = self._path(key)
+        with open(path, "rb") as f:
+            data = zlib.decompress(f.read())
+        # 사용 중인 텍스트는 만료 삭제되지 않도록 수정 시각 갱신
+        os.utime(path, None)
+        with self._lock:
+            self.reads += 1
+        return data.decode("utf-8")
+
+    def purge_expired(self, max_age):
+        """max_age(초) 동안 사용하지 않은 파일 삭제"""
+        expired = time.time() - max_age
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            try:
+                if os.stat(path).st_mtime < expired:
+                    os.unlink(path)
+            except OSError:
+                pass  # 다른 프로세스에서 이미 삭제한 경우
+
+    def stats(self):
+        """파일 수와 디스크 사용량(압축 후) 반환"""
+        files = 0
+        size = 0
+        for name in os.listdir(self.directory):
+            if not name.endswith(".z"):
+                continue
+            try:
+                size += os.path.getsize(os.path.join(self.directory, name))
+                files += 1
+            except OSError:
+                continue
+        with self._lock:
+            return {"files": files, "bytes": size, "writes": self.writes, "reads": self.reads}
+
+_spill_store = None
+_spill_store_lock = threading.Lock()
+
+def get_spill_store():
+    """프로세스 전체에서 공유하는 SpillStore 반환"""
+    global _spill_store
+    with _spill_store_lock:
+        if _spill_store is None:
+            _spill_store = SpillStore(SESSION_SPILL_DIR)
+    return _spill_store
+
+# 텍스트 항목 접근 (디스크로 옮긴 항목은 "text" 대신 "blob" 키와 "chars", "preview"를 가짐)
+def is_spilled(entry):
+    return "blob" in entry
+
+def get_entry_text(entry):
+    """항목의 전체 텍스트 반환 (디스크로 옮긴 항목이면 읽어서 반환, 항목에는 다시 올리지 않음)"""
+    if is_spilled(entry):
+        return get_spill_store().get(entry["blob"])
+    return entry["text"]
+
+def set_entry_text(entry, text):
+    """항목 텍스트 교체 (디스크로 옮긴 항목이면 메모리 항목으로 되돌림)"""
+    entry["text"] = text
+    for key in ("blob", "chars", "preview"):
+        entry.pop(key, None)
+
+def get_entry_chars(entry):
+    """항목 텍스트 글자 수 (디스크에서 읽지 않음)"""
+    return entry["chars"] if is_spilled(entry) else len(entry["text"])
+
+def get_entry_preview(entry, max_chars=TEXT_ENTRY_PREVIEW_CHARS):
+    """항목 앞부분 반환 (디스크에서 읽지 않음)"""
+    return entry["preview"][:max_chars] if is_spilled(entry) else entry["text"][:max_chars]
+
+def spill_entry(entry):
+    """항목 텍스트를 디스크로 옮기고 메모리에서 줄어든 크기(바이트) 반환"""
+    text = entry["text"]
+    key = get_spill_store().put(text)
+    freed = sys.getsizeof(text)
+    entry.pop("text")
+    entry.update(blob=key, chars=len(text), preview=text[:TEXT_ENTRY_PREVIEW_CHARS])
+    return freed - sys.getsizeof(entry["preview"])
+
+# 메모리 사용량 측정
+def estimate_size(value):
+    """세션 상태 값 하나의 대략적인 메모리 크기(바이트) - 문자열/dict/list를 따라가며 합산"""
+    if isinstance(value, str):
+        return sys.getsizeof(value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(estimate_size(k) + estimate_size(v) for k, v in value.items())
+    if isinstance(value, (list, tuple, set)):
+        return sys.getsizeof(value) + sum(estimate_size(item) for item in value)
+    return sys.getsizeof(value)
+
+def measure_session_memory(state):
+    """
+    세션 상태의 메모리 사용량 측정
+
+    Parameters:
+    state: st.session_state
+
+    Returns:
+    dict: 항목별 크기(바이트)와 디스크로 옮긴 항목 수/글자 수
+    """
+    entries = state.get("text_entries", [])
+    transcript = state.get("transcript")
+    artifacts = state.get("artifacts")
+    usage = {
+        "entries": estimate_size(entries),
+        "transcript_cache": transcript.cached_bytes() if transcript is not None else 0,
+        "summary": estimate_size(state.get("summary") or ""),
+        "artifacts": artifacts.cached_bytes() if artifacts is not None else 0,
+        "files": estimate_size(state.get("processed_files", {})) + estimate_size(state.get("audio_info", {})),
+        "spilled_entries": sum(1 for entry in entries if is_spilled(entry)),
+        "spilled_chars": sum(entry["chars"] for entry in entries if is_spilled(entry)),
+    }
+    usage["total"] = (usage["entries"] + usage["transcript_cache"] + usage["summary"]
+                      + usage["artifacts"] + usage["files"])
+    return usage
+
+_footprints = {}  # 세션 ID -> (측정 시각, 사용량)
+_footprints_lock = threading.Lock()
+
+def record_session_footprint(session_id, usage):
+    """세션 사용량 기록 (오래 갱신되지 않은 세션은 종료된 것으로 보고 제외)"""
+    now = time.time()
+    with _footprints_lock:
+        _footprints[session_id] = (now, usage)
+        for stale in [sid for sid, (updated, _) in _footprints.items() if now - updated > SESSION_FOOTPRINT_TTL_SEC]:
+            del _footprints[stale]
+
+def get_process_rss():
+    """현재 프로세스의 상주 메모리(바이트) 반환 (확인할 수 없으면 None)"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    try:
+        import resource
+        # Linux 외에는 최대 사용량만 확인 가능 (macOS는 바이트, 그 외는 KB 단위)
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+    except (ImportError, OSError):
+        return None
+
+def get_memory_summary():
+    """프로세스 전체 메모리 사용량 (세션 합계, 디스크로 옮긴 텍스트, 프로세스 상주 메모리) 반환"""
+    with _footprints_lock:
+        usages = [usage for _, usage in _footprints.values()]
+    spill = get_spill_store().stats()
+    return {
+        "sessions": len(usages),
+        "session_bytes": sum(usage["total"] for usage in usages),
+        "max_session_bytes": max((usage["total"] for usage in usages), default=0),
+        "spilled_entries": sum(usage["spilled_entries"] for usage in usages),
+        "spill_files": spill["files"],
+        "spill_bytes": spill["bytes"],
+        "process_rss": get_process_rss(),
+    }
+
+def enforce_memory_budget(state, session_id):
+    """
+    세션 상태가 메모리 예산을 넘으면 캐시를 해제하고 큰 텍스트 항목을 디스크로 옮김
+
+    편집 중인 항목과 SESSION_SPILL_MIN_CHARS보다 짧은 항목은 옮기지 않습니다.
+    처리한 파일 목록은 예산과 관계없이 최근 PROCESSED_FILES_MAX_ENTRIES개만 유지합니다.
+
+    Returns:
+    dict: 조정 후 사용량 (measure_session_memory 결과)
+    """
+    processed_files = state.get("processed_files")
+    if processed_files and len(processed_files) > PROCESSED_FILES_MAX_ENTRIES:
+        for file_hash in list(processed_files)[:len(processed_files) - PROCESSED_FILES_MAX_ENTRIES]:
+            del processed_files[file_hash]
+
+    usage = measure_session_memory(state)
+    if usage["total"] > SESSION_MEMORY_BUDGET_BYTES:
+        over = usage["total"] - SESSION_MEMORY_BUDGET_BYTES
+        transcript = state.get("transcript")
+        if transcript is not None:
+            over -= transcript.release()
+        artifacts = state.get("artifacts")
+        if artifacts is not None:
+            over -= artifacts.release()
+
+        editing = state.get("editing_entries", set())
+        candidates = sorted(
+            (entry for entry in state.get("text_entries", [])
+             if not is_spilled(entry) and entry.get("id") not in editing
+             and len(entry["text"]) >= SESSION_SPILL_MIN_CHARS),
+            key=lambda entry: len(entry["text"]), reverse=True
+        )
+        for entry in candidates:
+            if over <= 0:
+                break
+            try:
+                over -= spill_entry(entry)
+            except OSError:
+                break  # 디스크를 사용할 수 없으면 메모리에 그대로 둠
+            if transcript is not None:
+                transcript.mark_spilled(entry)
+        usage = measure_session_memory(state)
+
+    record_session_footprint(session_id, usage)
+    return usage
+
+def collect_memory_gauges():
+    """/metrics 출력용 메모리 사용량"""
+    summary = get_memory_summary()
+    return {
+        "sessions": summary["session_bytes"],
+        "max_session": summary["max_session_bytes"],
+        "spill_disk": summary["spill_bytes"],
+        "process_rss": summary["process_rss"],
+    }
+
+register_gauge("meetingnotes_memory_bytes", "세션 상태/디스크 보관 텍스트/프로세스 메모리 사용량(바이트)", "kind",
+               collect_memory_gauges)
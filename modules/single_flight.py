@@ -0,0 +1,270 @@
+"""
+동일 요청 합치기 모듈 - 같은 내용의 음성 변환/회의록 생성이 동시에 요청되면 API 호출은 한 번만 실행
+
+결과 캐시는 처리가 끝난 뒤에야 채워지므로 회의 직후처럼 여러 사용자가 같은 녹음 파일이나 같은 회의 내용을
+동시에 처리하면 모두 같은 API 호출을 반복합니다. 진행 중인 처리를 키(내용 해시 + 엔진/모델 설정)별로 등록해 두고,
+같은 키로 들어온 요청은 새로 호출하지 않고 먼저 시작한 요청의 처리에 합류하여 결과를 함께 받습니다.
+
+- 합류한 요청도 진행률, 화면 메시지, 스트리밍 텍스트를 그대로 받습니다.
+- 처리 중 예외가 발생하면 기다리던 모든 요청에 같은 예외가 전달됩니다.
+- 요청자가 취소하면 기다리는 목록에서만 빠지며, 남은 요청자가 없을 때만 처리 자체를 중단합니다.
+"""
+import threading
+from modules.jobs import JobCancelled
+from modules.metrics import register_gauge
+from config.settings import SINGLE_FLIGHT_ENABLED, SINGLE_FLIGHT_POLL_SEC
+
+class Flight:
+    """진행 중인 처리 하나 (결과와 합류한 요청자에게 전달할 진행 상태)"""
+
+    def __init__(self, key, kind):
+        self.key = key
+        self.kind = kind
+        self.waiters = 1          # 처리를 맡은 요청자 포함
+        self.leader_left = False  # 처리를 맡은 요청자가 취소했는지 여부 (다른 요청자를 위해 처리는 계속)
+        self.cancelled = False    # 남은 요청자가 없어 처리를 중단해야 하는지 여부
+        self.progress = None
+        self.message = None
+        self.result = None
+        self.error = None
+        self.done = threading.Event()
+        self._messages = []       # (수준, 내용) 목록
+        self._parts = []          # 스트리밍 텍스트 조각
+        self._resets = 0          # 스트림이 처음부터 다시 시작된 횟수
+        self._lock = threading.Lock()
+
+    def add_message(self, level, text):
+        with self._lock:
+            self._messages.append((level, str(text)))
+
+    def set_progress(self, progress, message):
+        with self._lock:
+            if progress is not None:
+                self.progress = progress
+            if message is not None:
+                self.message = message
+
+    def add_part(self, text):
+        with self._lock:
+            self._parts.append(text)
+
+    def reset_parts(self):
+        with self._lock:
+            self._parts = []
+            self._resets += 1
+
+    def snapshot(self, seen_messages, seen_parts, seen_resets):
+        """
+        합류한 요청자가 아직 받지 않은 내용 반환
+
+        Returns:
+        tuple: (새 메시지 목록, 새 텍스트 조각 목록, 스트림 재시작 횟수, 진행률, 상태 메시지)
+        """
+        with self._lock:
+            if self._resets != seen_resets:
+                seen_parts = 0
+            return (self._messages[seen_messages:], self._parts[seen_parts:], self._resets,
+                    self.progress, self.message)
+
+class FlightReporter:
+    """
+    처리를 맡은 요청자의 ui/진행률/스트리밍 출력을 대신 받아 합류한 요청자와 공유 (처리 함수에 전달)
+
+    요청자 자신이 취소되면(JobCancelled) 출력 전달만 멈추고 처리는 계속하며,
+    합류한 요청자도 모두 떠나면 다음 확인 지점에서 JobCancelled를 발생시켜 처리를 중단합니다.
+    """
+
+    def __init__(self, group, flight, ui, on_progress, minutes_stream):
+        self._group = group
+        self._flight = flight
+        self._ui = ui
+        self._on_progress = on_progress
+        self._minutes_stream = minutes_stream
+
+    # 화면 메시지 (st.* 와 같은 이름)
+    def _log(self, level, text):
+        self._flight.add_message(level, text)
+        if self._ui is not None:
+            getattr(self._ui, level)(text)
+
+    def info(self, text):
+        self._log("info", text)
+
+    def success(self, text):
+        self._log("success", text)
+
+    def warning(self, text):
+        self._log("warning", text)
+
+    def error(self, text):
+        self._log("error", text)
+
+    # 진행률 (Job.update와 같은 인터페이스)
+    def update(self, progress=None, message=None):
+        self._check_cancelled()
+        self._flight.set_progress(progress, message)
+        self._forward(self._on_progress, progress, message)
+
+    # 스트리밍 출력 (MinutesStream과 같은 인터페이스)
+    def on_text(self, text):
+        self._check_cancelled()
+        self._flight.add_part(text)
+        self._forward(getattr(self._minutes_stream, "on_text", None), text)
+
+    def reset(self):
+        self._flight.reset_parts()
+        self._forward(getattr(self._minutes_stream, "reset", None))
+
+    def _forward(self, func, *args):
+        if func is None or self._flight.leader_left:
+            return
+        try:
+            func(*args)
+        except JobCancelled:
+            self._group.leave(self._flight, leader=True)
+            self._check_cancelled()
+
+    def _check_cancelled(self):
+        if self._flight.cancelled:
+            raise JobCancelled()
+
+class SingleFlightGroup:
+    """진행 중인 처리 목록 (키 -> Flight, 프로세스 전체 공유)"""
+
+    def __init__(self):
+        self._flights = {}
+        self._counts = {}  # 종류 -> {"started", "joined", "cancelled"}
+        self._lock = threading.Lock()
+
+    def run(self, key, kind, func, ui=None, on_progress=None, minutes_stream=None):
+        """
+        같은 키의 처리가 진행 중이면 합류하여 결과를 기다리고, 없으면 func를 직접 실행
+
+        Parameters:
+        key (str): 요청 키 (내용 해시 + 엔진/모델 설정)
+        kind (str): 처리 종류 ("transcription", "minutes")
+        func: func(ui, on_progress, minutes_stream) 형식의 처리 함수
+        ui: 메시지 출력 대상 (info/success/warning/error 메서드 제공)
+        on_progress: 진행률 콜백 (진행률, 메시지)
+        minutes_stream: 생성 중인 텍스트를 받을 객체 (on_text/reset 메서드 제공)
+
+        Returns:
+        tuple: (처리 결과, 다른 요청의 처리에 합류했는지 여부)
+        """
+        with self._lock:
+            counts = self._counts.setdefault(kind, {"started": 0, "joined": 0, "cancelled": 0})
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = Flight(key, kind)
+                counts["started"] += 1
+            else:
+                flight.waiters += 1
+                counts["joined"] += 1
+
+        if leader:
+            return self._lead(flight, func, ui, on_progress, minutes_stream), False
+        return self._follow(flight, ui, on_progress, minutes_stream), True
+
+    def _lead(self, flight, func, ui, on_progress, minutes_stream):
+        reporter = FlightReporter(self, flight, ui, on_progress, minutes_stream)
+        try:
+            flight.result = func(reporter, reporter.update, reporter if minutes_stream is not None else None)
+            return flight.result
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                if self._flights.get(flight.key) is flight:
+                    del self._flights[flight.key]
+            flight.done.set()
+
+    def _follow(self, flight, ui, on_progress, minutes_stream):
+        """처리가 끝날 때까지 진행 상태를 받아 전달한 뒤 같은 결과(또는 예외) 반환"""
+        if ui is not None:
+            ui.info("같은 내용을 처리 중인 다른 요청이 있어 그 결과를 함께 사용합니다.")
+        seen_messages = seen_parts = seen_resets = 0
+        try:
+            while True:
+                finished = flight.done.wait(SINGLE_FLIGHT_POLL_SEC)
+                messages, parts, resets, progress, message = flight.snapshot(seen_messages, seen_parts, seen_resets)
+                if ui is not None:
+                    for level, text in messages:
+                        getattr(ui, level)(text)
+                seen_messages += len(messages)
+                if minutes_stream is not None:
+                    if resets != seen_resets:
+                        minutes_stream.reset()
+                        seen_parts = 0
+                    for text in parts:
+                        minutes_stream.on_text(text)
+                seen_parts += len(parts)
+                seen_resets = resets
+                if finished:
+                    break
+                if on_progress is not None:
+                    on_progress(progress, message)
+        except JobCancelled:
+            self.leave(flight)
+            raise
+
+        if flight.error is not None:
+            raise flight.error
+        return flight.result
+
+    def leave(self, flight, leader=False):
+        """요청자 하나가 기다리기를 그만둠 (남은 요청자가 없으면 처리 중단 표시 후 목록에서 제거)"""
+        with self._lock:
+            if leader:
+                if flight.leader_left:
+                    return
+                flight.leader_left = True
+            flight.waiters -= 1
+            if flight.waiters <= 0 and not flight.done.is_set():
+                flight.cancelled = True
+                self._counts[flight.kind]["cancelled"] += 1
+                # 이후 같은 요청은 중단된 처리에 합류하지 않고 새로 시작
+                if self._flights.get(flight.key) is flight:
+                    del self._flights[flight.key]
+
+    def stats(self):
+        """종류별 진행 중인 처리 수, 기다리는 요청자 수, 누적 시작/합류/중단 횟수"""
+        with self._lock:
+            stats = {kind: dict(counts, in_flight=0, waiters=0) for kind, counts in self._counts.items()}
+            for flight in self._flights.values():
+                stats[flight.kind]["in_flight"] += 1
+                stats[flight.kind]["waiters"] += flight.waiters
+        return stats
+
+_single_flight = None
+_single_flight_lock = threading.Lock()
+
+def get_single_flight():
+    """프로세스 전체에서 공유하는 SingleFlightGroup 반환"""
+    global _single_flight
+    with _single_flight_lock:
+        if _single_flight is None:
+            _single_flight = SingleFlightGroup()
+    return _single_flight
+
+def run_single_flight(key, kind, func, ui=None, on_progress=None, minutes_stream=None):
+    """
+    동일 요청 합치기를 적용하여 func(ui, on_progress, minutes_stream) 실행
+
+    SINGLE_FLIGHT_ENABLED가 꺼져 있으면 그대로 실행합니다. 인자와 반환값은 SingleFlightGroup.run과 같습니다.
+    """
+    if not SINGLE_FLIGHT_ENABLED:
+        return func(ui, on_progress, minutes_stream), False
+    return get_single_flight().run(key, kind, func, ui=ui, on_progress=on_progress, minutes_stream=minutes_stream)
+
+def get_single_flight_stats():
+    return get_single_flight().stats()
+
+def _collect(key):
+    return lambda: {kind: stats[key] for kind, stats in get_single_flight_stats().items()}
+
+register_gauge("meetingnotes_single_flight_in_flight", "종류별 진행 중인 처리 수 (같은 요청은 하나로 합침)", "kind",
+               _collect("in_flight"))
+register_gauge("meetingnotes_single_flight_joined", "진행 중인 처리에 합류하여 API 호출을 생략한 요청 누적 수", "kind",
+               _collect("joined"))
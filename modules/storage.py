@@ -0,0 +1,392 @@
+"""
+세션/결과 저장소 모듈 (여러 앱 인스턴스가 세션 상태와 처리 결과를 공유)
+
+st.session_state는 프로세스 메모리에만 있으므로 인스턴스가 재시작되거나 사용자가 다른 인스턴스로
+연결되면 입력한 내용이 사라집니다. 세션 상태 중 다시 만들 수 없는 값(텍스트 항목, 처리한 파일,
+회의록 등)과 회의록 파일은 이 모듈의 저장소에 함께 기록하고, 새 세션이 시작될 때 불러옵니다.
+
+- SQLiteStore : 기본값. DATA_DIR의 SQLite 파일 (같은 볼륨을 사용하는 프로세스끼리 공유)
+- RedisStore  : Redis 호환 서버 (여러 인스턴스가 공유, redis 패키지 필요)
+- MemoryStore : 프로세스 메모리 (재시작 시 사라짐)
+
+모든 저장소는 변경된 값만 기록하며(항목 하나, 필드 하나 단위), 전체 상태를 한 번에 복사하지 않습니다.
+"""
+import importlib.util
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from config.settings import (
+    SESSION_STORE_BACKEND, SESSION_STORE_PATH, SESSION_STORE_REDIS_URL, SESSION_STORE_PREFIX, SESSION_TTL_SEC
+)
+
+# redis 패키지는 Redis 저장소를 사용할 때만 import (설치 여부만 미리 확인)
+REDIS_AVAILABLE = importlib.util.find_spec("redis") is not None
+
+_logger = logging.getLogger("meetingnotes.storage")
+
+def encode_value(value):
+    return json.dumps(value, ensure_ascii=False)
+
+def decode_value(data):
+    if isinstance(data, bytes):
+        data = data.decode("utf-8")
+    return json.loads(data)
+
+class MemoryStore:
+    """
+    프로세스 메모리 저장소 (재시작하면 사라지며 다른 인스턴스와 공유되지 않음)
+
+    다른 저장소와 같은 메서드를 제공하므로 저장소를 사용할 수 없는 환경에서 대신 사용합니다.
+    """
+
+    backend = "memory"
+    shared = False
+
+    def __init__(self):
+        self._sessions = {}  # 세션 ID -> {"fields", "entries", "files", "updated"}
+        self._results = {}   # 결과 키 -> (만료 시각, 값)
+        self._lock = threading.Lock()
+
+    def _session(self, session_id):
+        session = self._sessions.setdefault(session_id, {"fields": {}, "entries": {}, "files": {}})
+        session["updated"] = time.time()
+        return session
+
+    def load_session(self, session_id):
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None or time.time() - session["updated"] > SESSION_TTL_SEC:
+                return None
+            return {
+                "fields": {name: decode_value(value) for name, value in session["fields"].items()},
+                "entries": [decode_value(value) for value in session["entries"].values()],
+            }
+
+    def save_fields(self, session_id, fields):
+        with self._lock:
+            self._session(session_id)["fields"].update({name: encode_value(value) for name, value in fields.items()})
+
+    def save_entry(self, session_id, entry):
+        with self._lock:
+            self._session(session_id)["entries"][entry["id"]] = encode_value(entry)
+
+    def delete_entry(self, session_id, entry_id):
+        with self._lock:
+            self._session(session_id)["entries"].pop(entry_id, None)
+
+    def clear_entries(self, session_id):
+        with self._lock:
+            self._session(session_id)["entries"].clear()
+
+    def save_file(self, session_id, name, content):
+        with self._lock:
+            self._session(session_id)["files"][name] = content
+
+    def load_file(self, session_id, name):
+        with self._lock:
+            session = self._sessions.get(session_id)
+            return session["files"].get(name) if session else None
+
+    def delete_session(self, session_id):
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+    def get_result(self, key):
+        with self._lock:
+            item = self._results.get(key)
+            if item is None or item[0] < time.time():
+                self._results.pop(key, None)
+                return None
+            return decode_value(item[1])
+
+    def set_result(self, key, value, ttl_seconds):
+        with self._lock:
+            self._results[key] = (time.time() + ttl_seconds, encode_value(value))
+
+    def stats(self):
+        with self._lock:
+            return {"backend": self.backend, "sessions": len(self._sessions), "results": len(self._results)}
+
+class SQLiteStore:
+    """
+    SQLite 파일 저장소
+
+    WAL 모드로 열어 같은 파일을 사용하는 여러 프로세스가 동시에 읽고 쓸 수 있습니다.
+    텍스트 항목은 추가된 순서(seq)를 함께 기록하므로 수정해도 순서가 바뀌지 않습니다.
+    """
+
+    backend = "sqlite"
+    shared = False
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS sessions (session_id TEXT PRIMARY KEY, updated REAL NOT NULL);
+        CREATE TABLE IF NOT EXISTS session_fields (
+            session_id TEXT NOT NULL, name TEXT NOT NULL, value TEXT NOT NULL,
+            PRIMARY KEY (session_id, name));
+        CREATE TABLE IF NOT EXISTS session_entries (
+            session_id TEXT NOT NULL, entry_id TEXT NOT NULL, seq INTEGER NOT NULL, value TEXT NOT NULL,
+            PRIMARY KEY (session_id, entry_id));
+        CREATE TABLE IF NOT EXISTS session_files (
+            session_id TEXT NOT NULL, name TEXT NOT NULL, content TEXT NOT NULL,
+            PRIMARY KEY (session_id, name));
+        CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, value TEXT NOT NULL, expires REAL NOT NULL);
+    """
+
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=10, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(self.SCHEMA)
+        self._purge_expired()
+
+    def _write(self, statements):
+        """(SQL, 인자) 목록을 하나의 트랜잭션으로 실행"""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                for sql, params in statements:
+                    self._conn.execute(sql, params)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def _touch(self, session_id):
+        return ("INSERT INTO sessions (session_id, updated) VALUES (?, ?) "
+                "ON CONFLICT(session_id) DO UPDATE SET updated = excluded.updated", (session_id, time.time()))
+
+    def _purge_expired(self):
+        """유효 시간이 지난 세션과 결과 삭제 (시작할 때 한 번 실행)"""
+        expired = time.time() - SESSION_TTL_SEC
+        self._write([
+            (f"DELETE FROM {table} WHERE session_id IN (SELECT session_id FROM sessions WHERE updated < ?)", (expired,))
+            for table in ("session_fields", "session_entries", "session_files")
+        ] + [
+            ("DELETE FROM sessions WHERE updated < ?", (expired,)),
+            ("DELETE FROM results WHERE expires < ?", (time.time(),)),
+        ])
+
+    def load_session(self, session_id):
+        with self._lock:
+            row = self._conn.execute("SELECT updated FROM sessions WHERE session_id = ?", (session_id,)).fetchone()
+            if row is None or time.time() - row[0] > SESSION_TTL_SEC:
+                return None
+            fields = self._conn.execute(
+                "SELECT name, value FROM session_fields WHERE session_id = ?", (session_id,)).fetchall()
+            entries = self._conn.execute(
+                "SELECT value FROM session_entries WHERE session_id = ? ORDER BY seq", (session_id,)).fetchall()
+        return {
+            "fields": {name: decode_value(value) for name, value in fields},
+            "entries": [decode_value(value) for value, in entries],
+        }
+
+    def save_fields(self, session_id, fields):
+        self._write([self._touch(session_id)] + [
+            ("INSERT INTO session_fields (session_id, name, value) VALUES (?, ?, ?) "
+             "ON CONFLICT(session_id, name) DO UPDATE SET value = excluded.value",
+             (session_id, name, encode_value(value)))
+            for name, value in fields.items()
+        ])
+
+    def save_entry(self, session_id, entry):
+        # 새 항목은 맨 뒤 순서로, 기존 항목은 순서를 유지한 채 내용만 교체
+        self._write([self._touch(session_id), (
+            "INSERT INTO session_entries (session_id, entry_id, seq, value) VALUES (?, ?, "
+            "(SELECT COALESCE(MAX(seq), 0) + 1 FROM session_entries WHERE session_id = ?), ?) "
+            "ON CONFLICT(session_id, entry_id) DO UPDATE SET value = excluded.value",
+            (session_id, entry["id"], session_id, encode_value(entry))
+        )])
+
+    def delete_entry(self, session_id, entry_id):
+        self._write([self._touch(session_id), (
+            "DELETE FROM session_entries WHERE session_id = ? AND entry_id = ?", (session_id, entry_id)
+        )])
+
+    def clear_entries(self, session_id):
+        self._write([self._touch(session_id), ("DELETE FROM session_entries WHERE session_id = ?", (session_id,))])
+
+    def save_file(self, session_id, name, content):
+        self._write([self._touch(session_id), (
+            "INSERT INTO session_files (session_id, name, content) VALUES (?, ?, ?) "
+            "ON CONFLICT(session_id, name) DO UPDATE SET content = excluded.content",
+            (session_id, name, content)
+        )])
+
+    def load_file(self, session_id, name):
+        with self._lock:
+            row = self._conn.execute("SELECT content FROM session_files WHERE session_id = ? AND name = ?",
+                                     (session_id, name)).fetchone()
+        return row[0] if row else None
+
+    def delete_session(self, session_id):
+        self._write([
+            (f"DELETE FROM {table} WHERE session_id = ?", (session_id,))
+            for table in ("sessions", "session_fields", "session_entries", "session_files")
+        ])
+
+    def get_result(self, key):
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM results WHERE key = ? AND expires >= ?",
+                                     (key, time.time())).fetchone()
+        return decode_value(row[0]) if row else None
+
+    def set_result(self, key, value, ttl_seconds):
+        self._write([(
+            "INSERT INTO results (key, value, expires) VALUES (?, ?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET value = excluded.value, expires = excluded.expires",
+            (key, encode_value(value), time.time() + ttl_seconds)
+        )])
+
+    def stats(self):
+        with self._lock:
+            sessions = self._conn.execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+            results = self._conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+        return {"backend": self.backend, "sessions": sessions, "results": results,
+                "bytes": os.path.getsize(self.path) if os.path.exists(self.path) else 0}
+
+class RedisStore:
+    """
+    Redis 호환 서버 저장소 (여러 인스턴스가 같은 서버를 사용하면 세션과 결과를 공유)
+
+    세션 하나는 필드/항목/파일 해시와 항목 순서 해시(항목 ID -> 처음 저장한 시각)로 저장하며,
+    기록할 때마다 유효 시간을 연장합니다. 기록은 모두 트랜잭션(MULTI/EXEC) 하나로 실행합니다.
+    기본 명령(GET/SET/DEL/EXPIRE/HSET/HSETNX/HGET/HGETALL/HDEL)만 사용하므로
+    Redis 호환 서버(KeyDB, Valkey, 로컬 대체 서버 등)에서도 동작합니다.
+    """
+
+    backend = "redis"
+    shared = True
+
+    def __init__(self, url=None, client=None, prefix=SESSION_STORE_PREFIX):
+        if client is None:
+            if not REDIS_AVAILABLE:
+                raise RuntimeError("redis 패키지가 설치되어 있지 않습니다. 'pip install redis'로 설치하세요.")
+            import redis
+            client = redis.Redis.from_url(url)
+        # 연결은 첫 명령 때 만들어지므로 여기서 확인해야 연결 실패 시 메모리 저장소로 대체됨
+        client.ping()
+        self.client = client
+        self.prefix = prefix
+
+    def _key(self, session_id, kind):
+        return f"{self.prefix}session:{session_id}:{kind}"
+
+    def _write(self, session_id, commands):
+        """명령 목록을 트랜잭션 하나(MULTI/EXEC pipeline)로 실행하고 세션 유효 시간 연장"""
+        pipe = self.client.pipeline()
+        for name, args in commands:
+            getattr(pipe, name)(*args)
+        for kind in ("fields", "entries", "order", "files"):
+            pipe.expire(self._key(session_id, kind), SESSION_TTL_SEC)
+        return pipe.execute()
+
+    def load_session(self, session_id):
+        pipe = self.client.pipeline()
+        pipe.hgetall(self._key(session_id, "fields"))
+        pipe.hgetall(self._key(session_id, "entries"))
+        pipe.hgetall(self._key(session_id, "order"))
+        fields, entries, order = pipe.execute()
+        if not fields and not entries:
+            return None
+        ordered_ids = sorted(entries, key=lambda entry_id: int(order.get(entry_id, 0)))
+        return {
+            "fields": {name.decode("utf-8"): decode_value(value) for name, value in fields.items()},
+            "entries": [decode_value(entries[entry_id]) for entry_id in ordered_ids],
+        }
+
+    def save_fields(self, session_id, fields):
+        self._write(session_id, [("hset", (self._key(session_id, "fields"), name, encode_value(value)))
+                                 for name, value in fields.items()])
+
+    def save_entry(self, session_id, entry):
+        # 항목과 순서를 한 트랜잭션으로 기록 (HSETNX로 처음 저장할 때만 순서를 기록하므로 수정한 항목은 순서 유지,
+        # 여러 인스턴스가 같은 항목을 동시에 기록해도 순서가 중복되지 않음)
+        self._write(session_id, [
+            ("hset", (self._key(session_id, "entries"), entry["id"], encode_value(entry))),
+            ("hsetnx", (self._key(session_id, "order"), entry["id"], time.time_ns())),
+        ])
+
+    def delete_entry(self, session_id, entry_id):
+        self._write(session_id, [
+            ("hdel", (self._key(session_id, "entries"), entry_id)),
+            ("hdel", (self._key(session_id, "order"), entry_id)),
+        ])
+
+    def clear_entries(self, session_id):
+        self._write(session_id, [
+            ("delete", (self._key(session_id, "entries"),)),
+            ("delete", (self._key(session_id, "order"),)),
+        ])
+
+    def save_file(self, session_id, name, content):
+        self._write(session_id, [("hset", (self._key(session_id, "files"), name, content))])
+
+    def load_file(self, session_id, name):
+        content = self.client.hget(self._key(session_id, "files"), name)
+        return content.decode("utf-8") if content is not None else None
+
+    def delete_session(self, session_id):
+        self.client.delete(*[self._key(session_id, kind) for kind in ("fields", "entries", "order", "files")])
+
+    def get_result(self, key):
+        data = self.client.get(f"{self.prefix}result:{key}")
+        return decode_value(data) if data is not None else None
+
+    def set_result(self, key, value, ttl_seconds):
+        self.client.set(f"{self.prefix}result:{key}", encode_value(value), ex=int(ttl_seconds))
+
+    def stats(self):
+        return {"backend": self.backend}
+
+def create_session_store(backend=SESSION_STORE_BACKEND):
+    """설정에 맞는 저장소 생성 (redis 연결 실패 시 예외)"""
+    if backend == "redis":
+        return RedisStore(SESSION_STORE_REDIS_URL)
+    if backend == "sqlite":
+        return SQLiteStore(SESSION_STORE_PATH)
+    return MemoryStore()
+
+_session_store = None
+_session_store_lock = threading.Lock()
+
+def get_session_store():
+    """
+    프로세스 전체에서 공유하는 세션 저장소 반환
+
+    설정한 저장소를 열 수 없으면(패키지 없음, 파일 권한 등) 메모리 저장소를 대신 사용합니다.
+    """
+    global _session_store
+    with _session_store_lock:
+        if _session_store is None:
+            try:
+                _session_store = create_session_store()
+            except Exception as e:
+                _logger.warning(f"세션 저장소({SESSION_STORE_BACKEND})를 사용할 수 없어 메모리 저장소를 사용합니다: {e}")
+                _session_store = MemoryStore()
+    return _session_store
+
+def get_shared_result(key):
+    """다른 인스턴스와 공유하는 처리 결과 반환 (공유 저장소가 아니거나 오류 시 None)"""
+    store = get_session_store()
+    if not store.shared:
+        return None
+    try:
+        return store.get_result(key)
+    except Exception:
+        return None
+
+def store_shared_result(key, value, ttl_seconds):
+    """처리 결과를 다른 인스턴스와 공유 (공유 저장소가 아니면 아무것도 하지 않음)"""
+    store = get_session_store()
+    if not store.shared:
+        return
+    try:
+        store.set_result(key, value, ttl_seconds)
+    except Exception:
+        pass
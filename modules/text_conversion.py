@@ -3,20 +3,32 @@
 """
 import os
 import json
-import tempfile
 import streamlit as st
-import openai
-import requests
 import re
-from modules.utils import get_file_hash, add_entry_with_timestamp
-from config.settings import ALLOWED_AUDIO_FORMATS, WHISPER_MODEL, DEFAULT_LANGUAGE
-
-# pydub 가져오기 시도 (없어도 기본 기능 동작)
-try:
-    from pydub import AudioSegment
-    PYDUB_AVAILABLE = True
-except ImportError:
-    PYDUB_AVAILABLE = False
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait
+from modules.utils import (
+    add_entry_with_timestamp, spool_upload, add_job_notices, render_job_notices, persist_session_fields
+)
+from modules.audio_processing import (
+    PYDUB_AVAILABLE, NUMPY_AVAILABLE, split_audio_on_silence, transcode_for_upload, trim_silence,
+    map_to_original_time, remove_temp_files
+)
+from modules.cache import get_transcript_cache, make_transcript_cache_key, make_cache_key
+from modules.storage import get_shared_result, store_shared_result
+from modules.jobs import get_job_manager, Job, JobQueueFull
+from modules.clients import get_whisper_client, get_clova_session, CLOVA_TIMEOUT
+from modules.clova_async import wait_for_clova_result
+from modules.hedging import hedged_call
+from modules.rate_limit import rate_limited_call, check_response, bind_rate_limit_owner
+from modules.single_flight import run_single_flight
+from modules.metrics import timing_span
+from config.settings import (
+    ALLOWED_AUDIO_FORMATS, UPLOAD_MAX_CONCURRENCY, WHISPER_MODEL, DEFAULT_LANGUAGE,
+    AUDIO_SPLIT_ENABLED, AUDIO_CHUNK_CONCURRENCY, AUDIO_TRANSCODE_ENABLED, AUDIO_TRANSCODE_FORMAT,
+    AUDIO_TRIM_ENABLED, TRANSCRIPT_CACHE_ENABLED,
+    BACKGROUND_JOBS_ENABLED, JOB_POLL_INTERVAL, STT_HEDGING_MODE, STT_HEDGE_DELAY_SEC, CLOVA_INVOKE_URL,
+    CLOVA_COMPLETION_MODE, SESSION_TTL_SEC
+)
 
 def setup_conversion_interface():
     """오디오 파일 업로드 및 변환 인터페이스 설정"""
@@ -29,6 +41,9 @@ def setup_conversion_interface():
     engine_name = "네이버 클로바" if st.session_state.speech_to_text_engine == "clova" else "OpenAI Whisper"
     st.info(f"현재 선택된 음성 인식 엔진: {engine_name} (사이드바에서 변경 가능)")
     
+    # 백그라운드 변환 작업 결과 메시지 표시
+    render_job_notices("transcription")
+    
     # 화자 인식 옵션
     enable_speaker_diarization = st.checkbox("화자 구분 활성화", value=True, 
                                           help="오디오에서 서로 다른 화자를 식별합니다.")
@@ -38,28 +53,89 @@ def setup_conversion_interface():
     else:
         st.session_state.enable_speaker_diarization = False
     
-    # 오디오 파일 업로더
-    audio_file = st.file_uploader("회의 녹음 파일을 업로드하세요", type=ALLOWED_AUDIO_FORMATS, key="audio_uploader")
+    # 오디오 파일 업로더 (여러 파일을 올리면 동시에 변환하고, 결과는 올린 순서대로 추가)
+    audio_files = st.file_uploader("회의 녹음 파일을 업로드하세요 (여러 파일 선택 가능)", type=ALLOWED_AUDIO_FORMATS,
+                                   key="audio_uploader", accept_multiple_files=True)
     
-    if audio_file:
-        process_audio_file(audio_file, engine_name)
+    if audio_files:
+        process_audio_files(audio_files, engine_name)
     
     st.markdown('</div>', unsafe_allow_html=True)
 
-def process_audio_file(audio_file, engine_name):
+def process_audio_files(audio_files, engine_name):
     """
-    업로드된 오디오 파일 처리
+    업로드된 오디오 파일들 처리 (이미 처리한 파일은 건너뛰고 새 파일은 동시에 변환)
     
     Parameters:
-    audio_file: Streamlit 업로드된 파일 객체
+    audio_files (list): Streamlit 업로드된 파일 객체 목록 (업로드 순서)
     engine_name: 표시용 엔진 이름
     """
-    # 파일 해시 계산 (중복 처리 방지)
-    audio_content = audio_file.getvalue()
-    audio_hash = get_file_hash(audio_content)
+    new_files = []  # (업로드 파일, 해시값, 임시 파일 경로)
+    batch_hashes = set()
+    for audio_file in audio_files:
+        audio_hash, tmp_path = get_audio_file_hash(audio_file, engine_name)
+        
+        # 같은 내용의 파일을 한 번에 여러 개 올린 경우 한 번만 변환
+        if audio_hash in batch_hashes:
+            if tmp_path:
+                remove_temp_files([tmp_path])
+            st.warning(f"같은 내용의 파일이 함께 업로드되어 한 번만 변환합니다: {audio_file.name}")
+            continue
+        batch_hashes.add(audio_hash)
+        
+        if show_existing_audio_status(audio_file, audio_hash, tmp_path, engine_name):
+            continue
+        new_files.append((audio_file, audio_hash, tmp_path))
+    
+    if not new_files:
+        return
+    
+    # 새 파일 처리 로직
+    st.session_state.file_name = new_files[-1][0].name
+    st.session_state.input_method = 'audio'
+    persist_session_fields("file_name", "input_method")
+    
+    # 백그라운드 작업으로 변환 (화면 조작 중에도 변환이 중단되지 않음, 동시 실행 수는 JOB_MAX_WORKERS로 제한)
+    if BACKGROUND_JOBS_ENABLED:
+        for audio_file, audio_hash, tmp_path in new_files:
+            if submit_transcription_job(audio_file, audio_hash, tmp_path):
+                show_transcription_job_status(audio_hash, engine_name)
+        return
+    
+    convert_audio_files(new_files, engine_name)
+
+def get_audio_file_hash(audio_file, engine_name):
+    """
+    업로드 파일의 해시값 반환
+    
+    같은 업로드 파일은 재실행 시 다시 읽지 않고 이전에 계산한 해시값을 사용합니다.
+    
+    Returns:
+    tuple: (해시값, 임시 파일 경로 - 이번에 새로 저장한 경우만, 아니면 None)
+    """
+    upload_id = getattr(audio_file, "file_id", None)
+    audio_hash = st.session_state.upload_hashes.get(upload_id) if upload_id else None
+    tmp_path = None
+    if audio_hash is None:
+        # 임시 파일로 옮기면서 해시 계산 (변환 시 그대로 재사용)
+        with timing_span("spool", engine=engine_name) as span:
+            tmp_path, audio_hash, span["file_size"] = spool_upload(audio_file)
+        if upload_id:
+            st.session_state.upload_hashes[upload_id] = audio_hash
+    return audio_hash, tmp_path
+
+def show_existing_audio_status(audio_file, audio_hash, tmp_path, engine_name):
+    """
+    이미 처리했거나 변환 중인 파일이면 상태를 표시
     
+    Returns:
+    bool: 새로 변환할 필요가 없으면 True
+    """
     # 이미 처리한 파일인지 확인
     if audio_hash in st.session_state.processed_files:
+        if tmp_path:
+            remove_temp_files([tmp_path])
+
         processed_name = st.session_state.processed_files[audio_hash]
         # 중복 파일이지만 이름이 다른 경우 특별히 알림
         if processed_name != audio_file.name:
@@ -68,123 +144,527 @@ def process_audio_file(audio_file, engine_name):
             st.info(f"이 파일은 이미 처리되었습니다: {audio_file.name}")
         
         # 중복 파일 처리 방법 선택 옵션 제공
-        if st.button("그래도 이 파일을 다시 처리하기", key="force_process"):
+        if st.button("그래도 이 파일을 다시 처리하기", key=f"force_process_{audio_hash}"):
             # 해시 목록에서 제거하여 재처리 허용
             st.session_state.processed_files.pop(audio_hash, None)
+            persist_session_fields("processed_files")
             st.rerun()
+        return True
+    
+    # 백그라운드에서 변환 중이거나 변환이 끝나지 못한 파일이면 상태만 표시
+    if audio_hash in st.session_state.audio_jobs:
+        if tmp_path:
+            remove_temp_files([tmp_path])
+        show_transcription_job_status(audio_hash, engine_name)
+        return True
+    return False
+
+def convert_audio_files(new_files, engine_name):
+    """
+    여러 오디오 파일을 동시에 변환하고 올린 순서대로 항목 추가 (백그라운드 작업을 사용하지 않는 경우)
+    
+    변환은 작업 스레드에서 실행되므로 화면 메시지는 파일별 Job에 기록했다가 변환이 끝난 뒤 표시합니다.
+    
+    Parameters:
+    new_files (list): (업로드 파일, 해시값, 임시 파일 경로 또는 None) 목록
+    engine_name: 표시용 엔진 이름
+    """
+    engine = st.session_state.speech_to_text_engine
+    enable_diarization = st.session_state.get('enable_speaker_diarization', False)
+    secret_key = st.session_state.get('naver_client_secret', "")
+    
+    # 파일별 진행 상태 표시
+    trackers = [(Job("transcription"), st.empty(), st.progress(0)) for _ in new_files]
+    results = [None] * len(new_files)
+    
+    with st.spinner(f"{engine_name}로 오디오 파일 {len(new_files)}개를 텍스트로 변환 중..."):
+        with ThreadPoolExecutor(max_workers=max(1, min(UPLOAD_MAX_CONCURRENCY, len(new_files)))) as executor:
+            futures = {}
+            for i, (audio_file, audio_hash, tmp_path) in enumerate(new_files):
+                if tmp_path is None:
+                    tmp_path, _, _ = spool_upload(audio_file)
+                job = trackers[i][0]
+                futures[executor.submit(
+                    transcribe_audio, tmp_path, audio_file.name, audio_hash, engine, enable_diarization, secret_key,
+                    ui=job, on_progress=job.update
+                )] = i
+            
+            pending = set(futures)
+            while pending:
+                done, pending = wait(pending, timeout=JOB_POLL_INTERVAL / 2)
+                for future in done:
+                    try:
+                        results[futures[future]] = future.result()
+                    except Exception as e:
+                        trackers[futures[future]][0].error(f"오디오 파일 처리 중 오류가 발생했습니다: {str(e)}")
+                for (audio_file, _, _), (job, status_text, progress_bar), result in zip(new_files, trackers, results):
+                    status_text.text(f"{audio_file.name}: {'완료' if result else job.message or '변환 중...'}")
+                    progress_bar.progress(100 if result else job.progress)
+    
+    # 완료 순서와 관계없이 올린 순서대로 항목 추가
+    for (audio_file, audio_hash, _), (job, status_text, progress_bar), result in zip(new_files, trackers, results):
+        status_text.empty()
+        progress_bar.empty()
+        for level, message in job.messages:
+            getattr(st, level)(message)
+        
+        transcript_text, file_info = result if result else (None, None)
+        if file_info:
+            st.session_state.audio_info[audio_file.name] = file_info
+        if not transcript_text:
+            st.error(f"텍스트 변환에 실패했습니다. 파일을 확인하고 다시 시도해주세요: {audio_file.name}")
+            continue
+        
+        # 변환된 텍스트를 타임스탬프와 함께 저장, 처리된 파일 해시값 저장 (중복 방지)
+        add_entry_with_timestamp(transcript_text, f"오디오 파일 ({audio_file.name})")
+        st.session_state.processed_files[audio_hash] = audio_file.name
+        
+        # 사용된 엔진에 따라 다른 메시지 표시
+        if "(백업)" in file_info.get("engine", ""):
+            st.warning(f"기본 엔진에 오류가 발생하여 백업 엔진으로 변환되었습니다: {audio_file.name}")
+        else:
+            st.success(f"오디오 파일이 {engine_name}로 텍스트로 변환되었습니다: {audio_file.name}")
+    persist_session_fields("processed_files", "audio_info")
+
+def submit_transcription_job(audio_file, audio_hash, tmp_path=None):
+    """
+    오디오 변환을 백그라운드 작업으로 등록
+    
+    Returns:
+    bool: 등록 성공 여부
+    """
+    if tmp_path is None:
+        tmp_path, _, _ = spool_upload(audio_file)
+    
+    try:
+        job = get_job_manager().submit(
+            "transcription", run_transcription_job,
+            tmp_path, audio_file.name, audio_hash,
+            st.session_state.speech_to_text_engine,
+            st.session_state.get('enable_speaker_diarization', False),
+            st.session_state.get('naver_client_secret', ""),
+            cleanup=lambda: remove_temp_files([tmp_path])
+        )
+    except JobQueueFull as e:
+        remove_temp_files([tmp_path])
+        st.error(str(e))
+        return False
+    
+    st.session_state.audio_jobs[audio_hash] = {
+        "job_id": job.id,
+        "file_name": audio_file.name,
+        "status": "running"
+    }
+    # 변환 결과를 올린 순서대로 추가하기 위한 순서 기록
+    st.session_state.audio_job_order.append(audio_hash)
+    return True
+
+def run_transcription_job(job, tmp_path, file_name, audio_hash, engine, enable_diarization, secret_key):
+    """백그라운드 작업: 오디오 변환 (화면 메시지는 job에 기록)"""
+    job.update(5, "변환 준비 중...")
+    transcript_text, file_info = transcribe_audio(
+        tmp_path, file_name, audio_hash, engine, enable_diarization, secret_key,
+        ui=job, on_progress=job.update
+    )
+    job.check_cancelled()
+    return transcript_text, file_info
+
+def show_transcription_job_status(audio_hash, engine_name):
+    """백그라운드 변환 작업 상태 표시 (실패/취소된 작업은 다시 시도 버튼 제공)"""
+    entry = st.session_state.audio_jobs[audio_hash]
+    
+    if entry["status"] == "running":
+        render_transcription_job(audio_hash, engine_name)
         return
     
-    # 새 파일 처리 로직
-    st.session_state.file_name = audio_file.name
+    if entry["status"] == "done":
+        st.info(f"변환 완료: {entry['file_name']} (앞서 올린 파일의 변환이 끝나면 순서대로 추가됩니다)")
+        return
+    
+    if entry["status"] == "cancelled":
+        st.info(f"변환이 취소되었습니다: {entry['file_name']}")
+    else:
+        st.error(f"텍스트 변환에 실패했습니다: {entry.get('error') or entry['file_name']}")
+    
+    if st.button("다시 변환하기", key=f"retry_{audio_hash}"):
+        st.session_state.audio_jobs.pop(audio_hash, None)
+        st.rerun()
+
+@st.fragment(run_every=JOB_POLL_INTERVAL)
+def render_transcription_job(audio_hash, engine_name):
+    """변환 진행 상태를 주기적으로 갱신 (이 부분만 다시 실행됨)"""
+    entry = st.session_state.audio_jobs.get(audio_hash)
+    if entry is None or entry["status"] != "running":
+        return
+    
+    job = get_job_manager().get(entry["job_id"])
+    if job is None:
+        # 작업 정보가 만료된 경우 (서버 재시작 등)
+        entry["status"] = "failed"
+        entry["error"] = "변환 작업 정보를 찾을 수 없습니다."
+        st.rerun()
+    
+    if not job.is_finished():
+        st.info(f"{engine_name}로 '{entry['file_name']}' 변환 중... {job.message}")
+        st.progress(job.progress)
+        if st.button("변환 취소", key=f"cancel_{job.id}"):
+            get_job_manager().cancel(job.id)
+        return
     
-    with st.spinner(f"{engine_name}로 오디오 파일을 텍스트로 변환 중..."):
-        # 오디오 처리 진행
-        transcript_text = convert_audio_to_text(audio_file)
+    finish_transcription_job(audio_hash, entry, job, engine_name)
+    st.rerun()
+
+def finish_transcription_job(audio_hash, entry, job, engine_name):
+    """완료된 변환 작업 결과를 세션 상태에 반영"""
+    file_name = entry["file_name"]
+    notices = list(job.messages)
+    transcript_text, file_info = job.result if job.result else (None, None)
+    
+    if job.status == "done" and transcript_text:
+        # 결과는 앞서 올린 파일들의 변환이 모두 끝난 뒤 순서대로 추가
+        entry.update(status="done", transcript=transcript_text, file_info=file_info)
         
-        if transcript_text:
-            # 변환된 텍스트를 타임스탬프와 함께 저장
-            add_entry_with_timestamp(transcript_text, f"오디오 파일 ({audio_file.name})")
-            # 처리된 파일 해시값 저장 (중복 방지)
-            st.session_state.processed_files[audio_hash] = audio_file.name
-            
-            # 사용된 엔진에 따라 다른 메시지 표시
-            used_engine = st.session_state.audio_info[audio_file.name].get("engine", "unknown")
-            
-            if "(백업)" in used_engine:
-                st.warning(f"기본 엔진에 오류가 발생하여 백업 엔진으로 변환되었습니다: {audio_file.name}")
-            else:
-                st.success(f"오디오 파일이 {engine_name}로 텍스트로 변환되었습니다: {audio_file.name}")
+        if "(백업)" in file_info.get("engine", ""):
+            notices.append(("warning", f"기본 엔진에 오류가 발생하여 백업 엔진으로 변환되었습니다: {file_name}"))
         else:
-            st.error("텍스트 변환에 실패했습니다. 파일을 확인하고 다시 시도해주세요.")
+            notices.append(("success", f"오디오 파일이 {engine_name}로 텍스트로 변환되었습니다: {file_name}"))
+    elif job.status == "cancelled":
+        entry["status"] = "cancelled"
+    else:
+        entry["status"] = "failed"
+        entry["error"] = job.error
+    
+    add_job_notices("transcription", notices)
+    release_finished_transcriptions()
+
+def release_finished_transcriptions():
+    """
+    완료된 변환 결과를 올린 순서대로 항목에 추가
+    
+    앞서 올린 파일이 아직 변환 중이면 그 뒤의 결과는 기다립니다.
+    실패/취소된 파일은 순서에서 빠지며, 다시 변환하면 맨 뒤에 추가됩니다.
+    """
+    order = st.session_state.audio_job_order
+    released = False
+    while order:
+        entry = st.session_state.audio_jobs.get(order[0])
+        if entry is not None and entry["status"] == "running":
+            break
+        audio_hash = order.pop(0)
+        if entry is None or entry["status"] != "done":
+            continue
         
-        st.session_state.input_method = 'audio'
+        file_name = entry["file_name"]
+        st.session_state.audio_info[file_name] = entry["file_info"]
+        add_entry_with_timestamp(entry["transcript"], f"오디오 파일 ({file_name})")
+        st.session_state.processed_files[audio_hash] = file_name
+        st.session_state.audio_jobs.pop(audio_hash, None)
+        released = True
+    
+    if released:
+        persist_session_fields("processed_files", "audio_info")
 
-def convert_audio_to_text(audio_file):
+def transcribe_audio(tmp_path, file_name, audio_hash, engine, enable_diarization, secret_key, ui=st, on_progress=None,
+                     remove_source=True):
     """
-    오디오 파일을 텍스트로 변환
+    임시 파일로 저장된 오디오를 텍스트로 변환 (처리 시간과 결과는 "transcribe" 단계로 기록)
+    
+    세션 상태를 사용하지 않고 화면 메시지는 ui(st 또는 Job)로만 출력하므로
+    백그라운드 작업 스레드에서도 실행할 수 있습니다. tmp_path는 remove_source가 True이면 처리 후 삭제됩니다.
     
     Parameters:
-    audio_file: Streamlit 업로드된 파일 객체
+    tmp_path (str): 오디오 임시 파일 경로
+    file_name (str): 원본 파일 이름
+    audio_hash (str): 파일 해시값 (캐시 키)
+    engine (str): 음성 인식 엔진 ("clova" 또는 "whisper")
+    enable_diarization (bool): 화자 구분 여부
+    secret_key (str): 클로바 Secret Key
+    ui: 메시지 출력 대상 (info/success/warning/error 메서드 제공)
+    on_progress: 진행률 콜백 (진행률, 메시지)
+    remove_source (bool): 처리 후 tmp_path 삭제 여부 (일괄 처리처럼 원본 파일을 직접 넘기면 False)
     
     Returns:
-    str: 변환된 텍스트 또는 None (실패 시)
+    tuple: (변환된 텍스트, 파일 정보) - 실패 시 (None, None)
     """
+    with timing_span("transcribe", engine=engine, file_size=os.path.getsize(tmp_path),
+                     diarization=bool(enable_diarization)) as span:
+        # 같은 파일을 같은 설정으로 변환 중인 요청이 있으면 API를 다시 호출하지 않고 그 결과를 함께 사용
+        # (클로바 키가 다른 요청끼리는 합치지 않도록 키 자체가 아닌 해시를 포함)
+        flight_key = make_cache_key("transcribe", audio_hash, engine, DEFAULT_LANGUAGE, bool(enable_diarization),
+                                    CLOVA_INVOKE_URL, make_cache_key(secret_key or ""))
+        started = []
+        
+        def transcribe(flight_ui, flight_progress, _):
+            started.append(True)
+            return run_transcription(tmp_path, file_name, audio_hash, engine, enable_diarization, secret_key,
+                                     ui=flight_ui, on_progress=flight_progress, remove_source=remove_source)
+        
+        try:
+            (transcript_text, file_info), joined = run_single_flight(
+                flight_key, "transcription", transcribe, ui=ui, on_progress=on_progress
+            )
+        finally:
+            # 합류한 요청은 run_transcription이 실행되지 않으므로 자신의 임시 파일을 직접 삭제
+            if remove_source and not started:
+                remove_temp_files([tmp_path])
+        if joined and file_info:
+            file_info = dict(file_info, original_name=file_name, temp_path=None, coalesced=True)
+        span["outcome"] = get_transcription_outcome(file_info)
+        if file_info:
+            span["used_engine"] = file_info["engine"]
+        return transcript_text, file_info
+
+def get_transcription_outcome(file_info):
+    """변환 결과 종류 반환 (primary, fallback, hedged, cached, coalesced, failed)"""
+    if not file_info:
+        return "failed"
+    if file_info.get("cached"):
+        return "cached"
+    if file_info.get("coalesced"):
+        return "coalesced"
+    if "(백업)" in file_info["engine"]:
+        return "fallback"
+    if "(헤지)" in file_info["engine"]:
+        return "hedged"
+    return "primary"
+
+def run_transcription(tmp_path, file_name, audio_hash, engine, enable_diarization, secret_key, ui=st, on_progress=None,
+                      remove_source=True):
+    """transcribe_audio의 실제 변환 처리 (인자와 반환값은 transcribe_audio와 동일)"""
+    upload_path = tmp_path
+    chunks = [(tmp_path, 0)]
     try:
-        # 임시 파일로 저장
-        with tempfile.NamedTemporaryFile(delete=False, suffix=f".{audio_file.name.split('.')[-1]}") as tmp_file:
-            tmp_file.write(audio_file.getvalue())
-            tmp_path = tmp_file.name
+        file_size_bytes = os.path.getsize(tmp_path)
+        file_size = file_size_bytes / (1024 * 1024)  # MB 단위
+        
+        # 이전에 같은 설정으로 변환한 결과가 있으면 API 호출 없이 사용
+        if TRANSCRIPT_CACHE_ENABLED:
+            cached = get_cached_transcript(audio_hash, engine, enable_diarization)
+            if cached:
+                ui.success("이전에 변환한 결과를 불러왔습니다. (캐시)")
+                return cached["transcript"], {
+                    "original_name": file_name,
+                    "file_size": file_size,
+                    "temp_path": None,
+                    "engine": cached["engine"],
+                    "cached": True,
+                    "duration": "자동 감지"
+                }
         
         # 파일 정보 저장
         file_info = {
-            "original_name": audio_file.name,
-            "file_size": len(audio_file.getvalue()) / (1024 * 1024),  # MB 단위
+            "original_name": file_name,
+            "file_size": file_size,
             "temp_path": tmp_path,
-            "engine": st.session_state.speech_to_text_engine  # 사용된 엔진 저장
+            "engine": engine  # 사용된 엔진 저장
         }
         
         transcript_text = ""
         
+        # 업로드 전에 모노 16kHz 압축 형식으로 변환 (실제로 크기가 줄어들 때만 사용)
+        if AUDIO_TRANSCODE_ENABLED and PYDUB_AVAILABLE:
+            with timing_span("transcode", engine=engine, file_size=file_size_bytes) as span:
+                upload_path, transcode_result = transcode_for_upload(tmp_path)
+                span.update(transcode_result)
+            if upload_path != tmp_path:
+                chunks = [(upload_path, 0)]
+                ui.info(
+                    f"업로드 크기 축소: {transcode_result['bytes_before'] / (1024 * 1024):.1f}MB → "
+                    f"{transcode_result['bytes_after'] / (1024 * 1024):.1f}MB "
+                    f"({transcode_result['format'].upper()}, {transcode_result['transcode_sec']:.1f}초)"
+                )
+        
+        # 긴 무음 구간 제거 (변환 결과의 시간 표시는 offset_map으로 원본 기준으로 되돌림)
+        offset_map = None
+        if AUDIO_TRIM_ENABLED and PYDUB_AVAILABLE and NUMPY_AVAILABLE:
+            output_format = AUDIO_TRANSCODE_FORMAT if upload_path != tmp_path else "mp3"
+            with timing_span("trim", engine=engine, file_size=file_size_bytes) as span:
+                trimmed_path, offset_map, trim_result = trim_silence(upload_path, output_format)
+                span.update(trim_result)
+            if trimmed_path != upload_path:
+                if upload_path != tmp_path:
+                    remove_temp_files([upload_path])
+                upload_path = trimmed_path
+                chunks = [(upload_path, 0)]
+                ui.info(
+                    f"무음 구간 {trim_result['removed_sec'] / 60:.1f}분을 제외하고 변환합니다. "
+                    f"({trim_result['removed_sec'] / trim_result['duration_before']:.0%} 단축)"
+                )
+        
+        # 긴 오디오는 무음 위치 기준으로 구간 분할 (작업 스레드에서 동시에 변환)
+        if AUDIO_SPLIT_ENABLED and PYDUB_AVAILABLE:
+            with timing_span("split", engine=engine, file_size=file_size_bytes) as span:
+                chunks = split_audio_on_silence(upload_path)
+                span["chunks"] = len(chunks)
+            if len(chunks) > 1:
+                ui.info(f"긴 오디오를 {len(chunks)}개 구간으로 나누어 동시에 변환합니다...")
+                if enable_diarization:
+                    ui.info("화자 번호는 구간마다 따로 매겨지므로 '구간2-1'처럼 구간 번호와 함께 표시됩니다. "
+                            "구간이 다르면 같은 번호라도 다른 사람일 수 있습니다.")
+        
         # 선택된 음성 인식 엔진에 따라 처리
-        if st.session_state.speech_to_text_engine == "whisper":
-            st.info("OpenAI Whisper로 텍스트 변환 중...")
-            transcript_text = convert_with_whisper(tmp_path)
+        if engine == "whisper":
+            ui.info("OpenAI Whisper로 텍스트 변환 중...")
+            transcript_text = transcribe_audio_chunks(chunks, convert_with_whisper, on_progress=on_progress,
+                                                      enable_diarization=enable_diarization, offset_map=offset_map)
             if transcript_text:
-                st.success("Whisper 변환 완료!")
+                ui.success("Whisper 변환 완료!")
                 
-        elif st.session_state.speech_to_text_engine == "clova":
+        elif engine == "clova" and STT_HEDGING_MODE != "off" and secret_key:
+            # 클로바가 지연되면 Whisper에도 요청하고 먼저 완료된 결과 사용
+            ui.info("네이버 클로바로 텍스트 변환 중... (응답 지연 시 Whisper 동시 요청)")
             try:
-                st.info("네이버 클로바로 텍스트 변환 중...")
+                transcript_text, winner, clova_error = hedged_call(
+                    lambda cancel: transcribe_audio_chunks(chunks, convert_with_clova, on_progress=on_progress,
+                                                           enable_diarization=enable_diarization,
+                                                           offset_map=offset_map, secret_key=secret_key,
+                                                           cancel_event=cancel),
+                    lambda cancel: transcribe_audio_chunks(chunks, convert_with_whisper,
+                                                           enable_diarization=enable_diarization,
+                                                           offset_map=offset_map, cancel_event=cancel),
+                    labels=("clova", "whisper"), delay=STT_HEDGE_DELAY_SEC, race=STT_HEDGING_MODE == "race"
+                )
+            except Exception as hedge_error:
+                ui.error(f"음성 변환 API 오류: {str(hedge_error)}")
+                return None, None
+            
+            if winner == "clova":
+                ui.success("클로바 변환 완료!")
+            elif clova_error is not None:
+                ui.error(f"Clova API 오류: {str(clova_error)}")
+                ui.success("Whisper 변환 성공! (백업 사용)")
+                file_info["engine"] = "whisper (백업)"
+            else:
+                ui.success("클로바 응답이 지연되어 먼저 완료된 Whisper 결과를 사용합니다.")
+                file_info["engine"] = "whisper (헤지)"
+                
+        elif engine == "clova":
+            try:
+                ui.info("네이버 클로바로 텍스트 변환 중...")
                 # 클로바 API 키 확인
-                if not hasattr(st.session_state, 'naver_client_secret') or not st.session_state.naver_client_secret:
+                if not secret_key:
                     raise Exception("네이버 클로바 API 키가 설정되지 않았습니다.")
                 
-                transcript_text = convert_with_clova(tmp_path)
+                transcript_text = transcribe_audio_chunks(chunks, convert_with_clova, on_progress=on_progress,
+                                                          enable_diarization=enable_diarization, offset_map=offset_map,
+                                                          secret_key=secret_key)
                 if transcript_text:
-                    st.success("클로바 변환 완료!")
+                    ui.success("클로바 변환 완료!")
                     
             except Exception as clova_error:
-                st.error(f"Clova API 오류: {str(clova_error)}")
+                ui.error(f"Clova API 오류: {str(clova_error)}")
                 # 오류 발생 시 Whisper로 백업
-                st.warning("Clova API 오류 발생, Whisper로 대체합니다...")
+                ui.warning("Clova API 오류 발생, Whisper로 대체합니다...")
                 try:
-                    transcript_text = convert_with_whisper(tmp_path)
+                    transcript_text = transcribe_audio_chunks(chunks, convert_with_whisper, on_progress=on_progress,
+                                                              enable_diarization=enable_diarization, offset_map=offset_map)
                     if transcript_text:
-                        st.success("Whisper 변환 성공! (백업 사용)")
+                        ui.success("Whisper 변환 성공! (백업 사용)")
                     else:
-                        st.error("Whisper 변환 실패: 텍스트를 추출할 수 없습니다")
+                        ui.error("Whisper 변환 실패: 텍스트를 추출할 수 없습니다")
                     file_info["engine"] = "whisper (백업)"
                 except Exception as whisper_error:
-                    st.error(f"Whisper API 오류: {str(whisper_error)}")
-                    # 임시 파일 삭제
-                    try:
-                        os.unlink(tmp_path)
-                    except:
-                        pass
-                    return None
-        
-        # 임시 파일 삭제
-        try:
-            os.unlink(tmp_path)
-        except Exception as e:
-            st.warning(f"임시 파일 삭제 실패: {str(e)}")
+                    ui.error(f"Whisper API 오류: {str(whisper_error)}")
+                    return None, None
         
         # 결과값 저장
+        # 변환 텍스트는 텍스트 항목에만 보관 (파일 정보에 사본을 두지 않음)
         file_info["duration"] = "자동 감지"  # 실제로는 API 응답에서 추출할 수 있음
-        file_info["transcript"] = transcript_text
         
-        st.session_state.audio_info[audio_file.name] = file_info
-        return transcript_text
+        # 변환 결과 캐시 저장 (백업/헤지 엔진 결과는 실제 사용된 엔진 기준으로 저장)
+        if TRANSCRIPT_CACHE_ENABLED and transcript_text:
+            used_engine = file_info["engine"].split(" ")[0]
+            store_cached_transcript(audio_hash, used_engine, enable_diarization, transcript_text)
         
-    except Exception as e:
-        st.error(f"오디오 파일 처리 중 오류가 발생했습니다: {str(e)}")
+        return transcript_text, file_info
+    
+    finally:
+        # 임시 파일, 형식 변환 파일 및 분할 구간 파일 삭제
+        temp_paths = [path for path, _ in chunks if path not in (tmp_path, upload_path)]
+        if upload_path != tmp_path:
+            temp_paths.append(upload_path)
+        if remove_source:
+            temp_paths.append(tmp_path)
+        remove_temp_files(temp_paths)
+
+def get_cached_transcript(audio_hash, engine, enable_diarization):
+    """캐시된 변환 결과 반환 (디스크 → 공유 저장소 순으로 확인, 없거나 캐시 오류 시 None)"""
+    try:
+        key = make_transcript_cache_key(audio_hash, engine, DEFAULT_LANGUAGE, enable_diarization)
+        return get_transcript_cache().get(key) or get_shared_result(key)
+    except Exception:
         return None
 
-def convert_with_whisper(file_path):
-    """OpenAI Whisper API로 변환 - 화자 구분 가능"""
+def store_cached_transcript(audio_hash, engine, enable_diarization, transcript_text):
+    """변환 결과를 캐시에 저장 (캐시 오류는 변환 결과에 영향 없음)"""
+    key = make_transcript_cache_key(audio_hash, engine, DEFAULT_LANGUAGE, enable_diarization)
+    try:
+        get_transcript_cache().set(key, {"engine": engine, "transcript": transcript_text})
+    except Exception:
+        pass
+    # 다른 인스턴스도 같은 파일의 변환 결과를 사용하도록 공유
+    store_shared_result(key, {"engine": engine, "transcript": transcript_text}, SESSION_TTL_SEC)
+
+def transcribe_audio_chunks(chunks, convert_func, on_progress=None, **options):
+    """
+    오디오 구간들을 동시에 변환한 후 원래 순서대로 이어 붙임
+    
+    Parameters:
+    chunks (list): (구간 파일 경로, 원본 기준 시작 시간(초)) 목록
+    convert_func: convert_with_whisper 또는 convert_with_clova
+    on_progress: 구간 변환이 끝날 때마다 호출할 진행률 콜백 (진행률, 메시지)
+    options: 변환 함수에 전달할 옵션
+    
+    Returns:
+    str: 이어 붙인 변환 텍스트 (구간 하나라도 실패하면 예외 발생)
+    
+    엔진은 구간마다 화자 번호를 따로 매기므로 (1구간의 "1"과 2구간의 "1"이 같은 사람이라는 보장이 없음)
+    여러 구간으로 나눈 경우 화자 이름 앞에 구간 번호를 붙여 ("구간2-1") 다른 구간의 화자와 섞이지 않게 합니다.
+    """
+    if len(chunks) == 1:
+        path, offset = chunks[0]
+        return convert_func(path, time_offset=offset, **options)
+    
+    results = [None] * len(chunks)
+    with ThreadPoolExecutor(max_workers=max(1, min(AUDIO_CHUNK_CONCURRENCY, len(chunks)))) as executor:
+        futures = {
+            executor.submit(bind_rate_limit_owner(convert_func), path, time_offset=offset,
+                            speaker_scope=f"구간{i + 1}", **options): i
+            for i, (path, offset) in enumerate(chunks)
+        }
+        try:
+            for done, future in enumerate(as_completed(futures), 1):
+                results[futures[future]] = future.result()
+                if on_progress is not None:
+                    on_progress(10 + int(80 * done / len(chunks)), f"구간 변환 중... ({done}/{len(chunks)})")
+        except BaseException:
+            # 실패 또는 취소 시 아직 시작하지 않은 구간은 변환하지 않음
+            for future in futures:
+                future.cancel()
+            raise
+    
+    # 화자 구분 형식은 줄 단위로, 일반 텍스트는 공백으로 이어 붙임
+    if options.get('enable_diarization'):
+        return "".join(text if text.endswith("\n") else text + "\n" for text in results if text)
+    return " ".join(text.strip() for text in results if text and text.strip())
+
+def convert_with_whisper(file_path, enable_diarization=None, time_offset=0, offset_map=None, speaker_scope=None,
+                         cancel_event=None):
+    """
+    OpenAI Whisper API로 변환 - 화자 구분 가능
+    
+    Parameters:
+    file_path (str): 오디오 파일 경로
+    enable_diarization (bool): 화자 구분 여부 (None이면 세션 상태 사용)
+    time_offset (float): 원본 오디오 기준 시작 시간(초) - 분할 구간 변환 시 사용
+    offset_map (list): 무음 제거 시 원본 기준 시간으로 되돌리는 대응표 (없으면 None)
+    speaker_scope (str): 화자 이름 앞에 붙일 구간 이름 (분할 구간 변환 시 사용, 예: "구간2")
+    cancel_event (threading.Event): 설정되면 요청을 보내기 전에 중단 (이중 요청에서 진 쪽)
+    """
     try:
         # 화자 인식 활성화 여부 확인
-        enable_diarization = st.session_state.get('enable_speaker_diarization', False)
+        if enable_diarization is None:
+            enable_diarization = st.session_state.get('enable_speaker_diarization', False)
         
         # 기본 옵션
         options = {
@@ -195,34 +675,55 @@ def convert_with_whisper(file_path):
         # 화자 구분 옵션 추가 (Whisper는 현재 공식적으로 화자 구분 지원 X)
         # 변환 후 포스트 프로세싱에서 화자 구분 추정
         with open(file_path, "rb") as audio:
-            transcript = openai.audio.transcriptions.create(
-                file=audio,
-                **options
-            )
+            def request():
+                audio.seek(0)  # 재시도 시 처음부터 다시 업로드
+                with timing_span("stt_request", engine="whisper", file_size=os.path.getsize(file_path)):
+                    return get_whisper_client().audio.transcriptions.create(
+                        file=audio,
+                        **options
+                    )
+            
+            # 다른 세션의 요청과 함께 제한하며, 429 응답은 기다렸다가 다시 시도
+            transcript = rate_limited_call("whisper", request, cancel_event=cancel_event)
         
         # 화자 구분 활성화된 경우 임의로 화자 구분 형식으로 변환
         if enable_diarization:
-            return estimate_speakers_from_whisper(transcript.text)
+            return estimate_speakers_from_whisper(transcript.text, start_time=time_offset, offset_map=offset_map,
+                                                  speaker_scope=speaker_scope)
         else:
             return transcript.text
             
     except Exception as e:
         raise Exception(f"Whisper API 오류: {str(e)}")
 
-def convert_with_clova(file_path):
-    """네이버 클로바 API로 변환 - 화자 구분 지원"""
+def convert_with_clova(file_path, enable_diarization=None, secret_key=None, time_offset=0, offset_map=None,
+                       speaker_scope=None, cancel_event=None):
+    """
+    네이버 클로바 API로 변환 - 화자 구분 지원
+    
+    Parameters:
+    file_path (str): 오디오 파일 경로
+    enable_diarization (bool): 화자 구분 여부 (None이면 세션 상태 사용)
+    secret_key (str): 클로바 Secret Key (None이면 세션 상태 사용)
+    time_offset (float): 원본 오디오 기준 시작 시간(초) - 분할 구간 변환 시 사용
+    offset_map (list): 무음 제거 시 원본 기준 시간으로 되돌리는 대응표 (없으면 None)
+    speaker_scope (str): 화자 이름 앞에 붙일 구간 이름 (분할 구간 변환 시 사용, 예: "구간2")
+    cancel_event (threading.Event): 설정되면 요청 전이나 결과를 기다리는 중에 중단 (이중 요청에서 진 쪽)
+    """
     try:
         # API 호출 준비 - Invoke URL 및 Secret Key 사용
-        invoke_url = "https://clovaspeech-gw.ncloud.com/external/v1/10576/25e1436c8b6a648441382ef258197ba987660c32a80bc65b319acad99556b0e9"
-        secret_key = st.session_state.naver_client_secret
+        invoke_url = CLOVA_INVOKE_URL
+        if secret_key is None:
+            secret_key = st.session_state.naver_client_secret
         
         # 화자 인식 활성화 여부 확인
-        enable_diarization = st.session_state.get('enable_speaker_diarization', False)
+        if enable_diarization is None:
+            enable_diarization = st.session_state.get('enable_speaker_diarization', False)
         
         # 요청 본문 설정
         request_body = {
             'language': 'ko-KR',
-            'completion': 'sync',
+            'completion': CLOVA_COMPLETION_MODE,
             'wordAlignment': True,
             'fullText': True,
             'diarization': {
@@ -243,19 +744,38 @@ def convert_with_clova(file_path):
                 'params': (None, json.dumps(request_body, ensure_ascii=False).encode('UTF-8'), 'application/json')
             }
             
-            response = requests.post(
-                headers=headers, 
-                url=invoke_url + '/recognizer/upload', 
-                files=files
-            )
+            def request():
+                audio_file.seek(0)  # 재시도 시 처음부터 다시 업로드
+                # 공유 세션으로 연결 재사용, 응답이 없는 경우 제한 시간 후 중단
+                with timing_span("stt_request", engine="clova", mode=CLOVA_COMPLETION_MODE,
+                                 file_size=os.path.getsize(file_path)) as span:
+                    response = get_clova_session().post(
+                        headers=headers, 
+                        url=invoke_url + '/recognizer/upload', 
+                        files=files,
+                        timeout=CLOVA_TIMEOUT
+                    )
+                    if response.status_code != 200:
+                        span["outcome"] = f"http_{response.status_code}"
+                # 과부하(429/503)와 일시 오류는 요청 제한 모듈이 기다렸다가 다시 시도
+                return check_response(response)
+            
+            response = rate_limited_call("clova", request, cancel_event=cancel_event)
         
         # 응답 처리
         if response.status_code == 200:
             result = response.json()
             
+            # 비동기 방식은 작업 토큰으로 인식 결과를 기다림 (업로드 연결은 바로 종료됨)
+            if CLOVA_COMPLETION_MODE == "async":
+                if not result.get('token'):
+                    raise Exception(f"API 응답에서 작업 토큰을 찾을 수 없습니다: {result.get('message', '')}")
+                result = wait_for_clova_result(result['token'], headers, cancel_event=cancel_event)
+            
             # 화자 구분 활성화 시 포맷팅
             if enable_diarization and 'segments' in result and len(result['segments']) > 0:
-                return format_clova_speaker_segments(result['segments'])
+                return format_clova_speaker_segments(result['segments'], time_offset=time_offset,
+                                                     offset_map=offset_map, speaker_scope=speaker_scope)
             # 일반 텍스트 변환
             elif 'text' in result:
                 return result.get("text", "")
@@ -271,26 +791,45 @@ def convert_with_clova(file_path):
     except Exception as e:
         raise Exception(f"Clova API 오류: {str(e)}")
 
-def format_clova_speaker_segments(segments):
-    """클로바 API의 화자 세그먼트를 화자-시간 형식으로 변환"""
+def format_clova_speaker_segments(segments, time_offset=0, offset_map=None, speaker_scope=None):
+    """
+    클로바 API의 화자 세그먼트를 화자-시간 형식으로 변환
+    
+    Parameters:
+    segments (list): 클로바 응답의 segments (start는 ms 단위)
+    time_offset (float): 원본 오디오 기준 시작 시간(초)
+    offset_map (list): 무음 제거 시 원본 기준 시간으로 되돌리는 대응표 (없으면 None)
+    speaker_scope (str): 화자 이름 앞에 붙일 구간 이름 (없으면 None)
+    """
     formatted_text = ""
     for segment in segments:
         if 'text' in segment:
-            speaker = segment.get('speaker', {}).get('label', '알 수 없음')
-            start_time = format_time_to_mm_ss(segment.get('start', 0))
+            speaker = scope_speaker(segment.get('speaker', {}).get('label', '알 수 없음'), speaker_scope)
+            # 클로바의 start는 밀리초 단위이므로 초로 바꾼 뒤 구간 시작 시간을 더함
+            # (이전에는 밀리초 값을 초로 그대로 표시하여 시간 표시가 1000배 크게 나왔음)
+            start_time = format_time_to_mm_ss(map_to_original_time(segment.get('start', 0) / 1000 + time_offset,
+                                                                   offset_map))
             text = segment.get('text', '')
             
             formatted_text += f"{speaker} {start_time}\n{text}\n"
     
     return formatted_text
 
-def estimate_speakers_from_whisper(text):
-    """Whisper 결과에서 화자 구분 추정 (문장 및 구두점 기반)"""
+def estimate_speakers_from_whisper(text, start_time=0, offset_map=None, speaker_scope=None):
+    """
+    Whisper 결과에서 화자 구분 추정 (문장 및 구두점 기반)
+    
+    Parameters:
+    text (str): Whisper 변환 텍스트
+    start_time (float): 원본 오디오 기준 시작 시간(초)
+    offset_map (list): 무음 제거 시 원본 기준 시간으로 되돌리는 대응표 (없으면 None)
+    speaker_scope (str): 화자 이름 앞에 붙일 구간 이름 (없으면 None)
+    """
     # 문장 단위로 분리 (마침표, 느낌표, 물음표 뒤 공백으로 분리)
     sentences = re.split(r'(?<=[.!?])\s+', text)
     
     formatted_text = ""
-    current_time = 0
+    current_time = start_time
     speakers = ["참석자 A", "참석자 B"]  # 기본 화자 이름
     
     # 대화 패턴 추정을 위한 간단한 규칙
@@ -310,7 +849,7 @@ def estimate_speakers_from_whisper(text):
             current_speaker_idx = 1 - current_speaker_idx  # 화자 전환
             
         # 화자 결정
-        speaker = speakers[current_speaker_idx]
+        speaker = scope_speaker(speakers[current_speaker_idx], speaker_scope)
         
         # 문장 길이에 비례하여 시간 추정
         words_count = len(sentence.split())
@@ -318,12 +857,16 @@ def estimate_speakers_from_whisper(text):
         sentence_duration = max(1.0, words_count * time_per_word)  # 최소 1초
         
         current_time += sentence_duration
-        time_str = format_time_to_mm_ss(current_time)
+        time_str = format_time_to_mm_ss(map_to_original_time(current_time, offset_map))
         
         formatted_text += f"{speaker} {time_str}\n{sentence}\n"
     
     return formatted_text
 
+def scope_speaker(speaker, speaker_scope):
+    """구간 이름이 있으면 화자 이름 앞에 붙임 (예: "구간2-1")"""
+    return f"{speaker_scope}-{speaker}" if speaker_scope else speaker
+
 def format_time_to_mm_ss(seconds):
     """초를 MM:SS 형식으로 변환"""
     total_seconds = int(seconds)
@@ -3,7 +3,12 @@
 """
 import streamlit as st
 from datetime import datetime
-from modules.utils import add_entry_with_timestamp
+from modules.utils import (
+    add_entry_with_timestamp, persist_entry, delete_persisted_entry, clear_persisted_entries, persist_session_fields
+)
+from modules.transcript import ensure_entry_id
+from modules.session_memory import get_entry_text, set_entry_text, get_entry_chars, get_entry_preview
+from config.settings import TEXT_ENTRIES_PAGE_SIZE, TEXT_ENTRY_PREVIEW_CHARS
 
 def setup_text_management():
     """텍스트 직접 입력 인터페이스 설정"""
@@ -33,85 +38,170 @@ def setup_text_management():
     if not st.session_state.file_name and st.session_state.text_entries:
         current_date = datetime.now().strftime("%Y-%m-%d")
         st.session_state.file_name = f"회의_{current_date}"
+        persist_session_fields("file_name")
     
     st.markdown('</div>', unsafe_allow_html=True)
 
 def display_text_entries():
-    """텍스트 항목 목록 표시"""
-    if not st.session_state.text_entries:
+    """
+    텍스트 항목 목록 표시 (페이지 단위)
+    
+    한 번에 TEXT_ENTRIES_PAGE_SIZE개 항목만 그리고, 각 항목은 미리보기로 접어 두었다가
+    편집할 때만 전체 텍스트를 표시합니다. 항목마다 별도 fragment로 그리므로
+    한 항목을 편집해도 해당 항목만 다시 실행됩니다.
+    """
+    entries = st.session_state.text_entries
+    if not entries:
         return
         
     st.markdown('<h3 class="subheader">입력된 텍스트 내용</h3>', unsafe_allow_html=True)
     
     # 항목 삭제 기능
     col1, col2 = st.columns([3, 1])
+    with col1:
+        stats = st.session_state.transcript.get_stats(entries)
+        st.caption(f"전체 {stats['entries']}개 항목 · {stats['chars']:,}자 · 약 {stats['tokens']:,} 토큰")
     with col2:
         if st.button("모든 항목 삭제", use_container_width=True):
             st.session_state.text_entries = []
             st.session_state.processed_files = {}  # 처리된 파일 목록도 초기화
             st.session_state.audio_info = {}  # 오디오 정보도 초기화
+            st.session_state.editing_entries = set()
+            st.session_state.transcript.mark_dirty()
+            clear_persisted_entries()
+            persist_session_fields("processed_files", "audio_info")
             st.success("모든 텍스트 항목이 삭제되었습니다.")
             st.rerun()
     
-    # 각 항목 표시
-    for i, entry in enumerate(st.session_state.text_entries):
-        with st.container():
-            st.markdown(f'<div class="entry-container">', unsafe_allow_html=True)
+    # 현재 페이지 항목만 표시
+    page_count = (len(entries) + TEXT_ENTRIES_PAGE_SIZE - 1) // TEXT_ENTRIES_PAGE_SIZE
+    page = 1
+    if page_count > 1:
+        if st.session_state.get("entries_page", 1) > page_count:
+            st.session_state.entries_page = page_count
+        page = st.number_input(
+            f"페이지 (전체 {page_count}쪽)",
+            min_value=1,
+            max_value=page_count,
+            step=1,
+            key="entries_page"
+        )
+    
+    start = (page - 1) * TEXT_ENTRIES_PAGE_SIZE
+    for number, entry in enumerate(entries[start:start + TEXT_ENTRIES_PAGE_SIZE], start + 1):
+        render_text_entry(ensure_entry_id(entry), number)
+
+def find_text_entry(entry_id):
+    """ID로 텍스트 항목 찾기 (없으면 None)"""
+    for entry in st.session_state.text_entries:
+        if entry.get("id") == entry_id:
+            return entry
+    return None
+
+def get_engine_display_name(engine_name):
+    """엔진 이름을 사용자 친화적으로 표시"""
+    if engine_name == "clova":
+        return "네이버 클로바"
+    elif engine_name == "whisper":
+        return "OpenAI Whisper"
+    elif engine_name == "whisper (백업)":
+        return "OpenAI Whisper (백업)"
+    elif engine_name == "whisper (헤지)":
+        return "OpenAI Whisper (지연 대비 동시 요청)"
+    return engine_name
+
+def update_entry_text(entry_id, key):
+    """편집한 텍스트를 항목에 반영 (text_area on_change 콜백)"""
+    entry = find_text_entry(entry_id)
+    if entry is not None:
+        set_entry_text(entry, st.session_state[key])
+        st.session_state.transcript.mark_dirty()
+        persist_entry(entry)
+
+def toggle_entry_editing(entry_id):
+    """항목 편집 영역 펼치기/접기 (버튼 on_click 콜백)"""
+    if entry_id in st.session_state.editing_entries:
+        st.session_state.editing_entries.discard(entry_id)
+        # 접으면 편집 영역의 텍스트 사본도 해제
+        st.session_state.pop(f"entry_{entry_id}", None)
+    else:
+        st.session_state.editing_entries.add(entry_id)
+
+@st.fragment
+def render_text_entry(entry_id, number):
+    """
+    텍스트 항목 하나 표시 (편집/삭제 시 이 항목만 다시 실행)
+    
+    Parameters:
+    entry_id (str): 항목 ID
+    number (int): 화면에 표시할 항목 번호
+    """
+    entry = find_text_entry(entry_id)
+    if entry is None:
+        return
+    editing = entry_id in st.session_state.editing_entries
+    
+    with st.container():
+        st.markdown(f'<div class="entry-container">', unsafe_allow_html=True)
+        
+        col1, col2, col3 = st.columns([4, 1, 1])
+        with col1:
+            source_display = entry["source"]
+            source_class = ""
             
-            col1, col2 = st.columns([5, 1])
-            with col1:
-                source_display = entry["source"]
-                source_class = ""
-                
-                # 소스 타입에 따른 스타일링
-                if "오디오 파일" in source_display:
-                    source_class = "source-tag"
-                elif "텍스트 파일" in source_display:
-                    source_class = "source-tag"
-                
-                # 타임스탬프와 소스 표시
-                if source_class:
-                    st.markdown(f'<div class="timestamp">[{entry["timestamp"]}] <span class="{source_class}">{source_display}</span></div>', unsafe_allow_html=True)
-                else:
-                    st.markdown(f'<div class="timestamp">[{entry["timestamp"]} - {source_display}]</div>', unsafe_allow_html=True)
-                
-                # 오디오 파일인 경우 추가 정보 표시
-                if "오디오 파일" in source_display:
-                    file_name = source_display.split("(")[1].split(")")[0]
-                    if file_name in st.session_state.audio_info:
-                        info = st.session_state.audio_info[file_name]
-                        engine_name = info.get("engine", "unknown")
-                        
-                        # 엔진 이름을 사용자 친화적으로 표시
-                        if engine_name == "clova":
-                            engine_display = "네이버 클로바"
-                        elif engine_name == "whisper":
-                            engine_display = "OpenAI Whisper"
-                        elif engine_name == "whisper (백업)":
-                            engine_display = "OpenAI Whisper (백업)"
-                        else:
-                            engine_display = engine_name
-                            
-                        st.markdown(f'<div class="audio-info">파일 크기: {info["file_size"]:.2f}MB | 변환 엔진: {engine_display}</div>', unsafe_allow_html=True)
+            # 소스 타입에 따른 스타일링
+            if "오디오 파일" in source_display:
+                source_class = "source-tag"
+            elif "텍스트 파일" in source_display:
+                source_class = "source-tag"
             
-            with col2:
-                delete_key = f"delete_{i}_{entry['timestamp'].replace(' ', '_').replace(':', '')}"
-                if st.button("삭제", key=delete_key, use_container_width=True):
-                    st.session_state.text_entries.pop(i)
-                    st.success("항목이 삭제되었습니다.")
-                    st.rerun()
+            # 타임스탬프와 소스 표시
+            if source_class:
+                st.markdown(f'<div class="timestamp">[{entry["timestamp"]}] <span class="{source_class}">{source_display}</span></div>', unsafe_allow_html=True)
+            else:
+                st.markdown(f'<div class="timestamp">[{entry["timestamp"]} - {source_display}]</div>', unsafe_allow_html=True)
             
-            # 편집 가능한 텍스트 영역
-            edit_key = f"entry_{i}_{entry['timestamp'].replace(' ', '_').replace(':', '')}"
-            edited_text = st.text_area(
-                f"항목 #{i+1}",
-                value=entry["text"],
-                height=100,
-                key=edit_key
+            # 오디오 파일인 경우 추가 정보 표시
+            if "오디오 파일" in source_display:
+                file_name = source_display.split("(")[1].split(")")[0]
+                if file_name in st.session_state.audio_info:
+                    info = st.session_state.audio_info[file_name]
+                    engine_display = get_engine_display_name(info.get("engine", "unknown"))
+                    st.markdown(f'<div class="audio-info">파일 크기: {info["file_size"]:.2f}MB | 변환 엔진: {engine_display}</div>', unsafe_allow_html=True)
+        
+        with col2:
+            st.button("접기" if editing else "편집", key=f"toggle_{entry_id}", use_container_width=True,
+                      on_click=toggle_entry_editing, args=(entry_id,))
+        
+        with col3:
+            if st.button("삭제", key=f"delete_{entry_id}", use_container_width=True):
+                st.session_state.text_entries.remove(entry)
+                st.session_state.transcript.mark_dirty()
+                delete_persisted_entry(entry_id)
+                st.session_state.editing_entries.discard(entry_id)
+                st.session_state.pop(f"entry_{entry_id}", None)
+                # 항목 수와 페이지가 바뀌므로 전체 화면 다시 실행
+                st.rerun()
+        
+        if editing:
+            # 편집 가능한 텍스트 영역 (변경 내용은 콜백에서 바로 항목에 반영)
+            edit_key = f"entry_{entry_id}"
+            if edit_key not in st.session_state:
+                st.session_state[edit_key] = get_entry_text(entry)
+            st.text_area(
+                f"항목 #{number}",
+                height=300,
+                key=edit_key,
+                on_change=update_entry_text,
+                args=(entry_id, edit_key)
             )
-            
-            # 텍스트가 수정되었으면 업데이트
-            if edited_text != entry["text"]:
-                st.session_state.text_entries[i]["text"] = edited_text
-            
-            st.markdown('</div>', unsafe_allow_html=True)
\ No newline at end of file
+        else:
+            # 접힌 상태에서는 앞부분만 표시 (디스크로 옮긴 항목도 전체를 읽지 않음)
+            chars = get_entry_chars(entry)
+            preview = get_entry_preview(entry)
+            if chars > TEXT_ENTRY_PREVIEW_CHARS:
+                preview += "…"
+            st.markdown(f'<div class="entry-preview"><b>항목 #{number}</b> ({chars:,}자)</div>', unsafe_allow_html=True)
+            st.text(preview)
+        
+        st.markdown('</div>', unsafe_allow_html=True)
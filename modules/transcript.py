@@ -0,0 +1,169 @@
+"""
+전체 회의 내용(트랜스크립트) 관리 모듈 - 항목별 크기 추정치와 이어 붙인 결과를 캐시
+"""
+import re
+import sys
+import uuid
+from modules.session_memory import get_entry_text, is_spilled
+from config.settings import TOKEN_ESTIMATE_HANGUL_PER_TOKEN, TOKEN_ESTIMATE_OTHER_PER_TOKEN
+
+HANGUL_PATTERN = re.compile(r"[가-힣]")
+
+def format_entry_block(entry):
+    """텍스트 항목 하나를 전체 트랜스크립트 형식의 블록으로 변환"""
+    return f"[{entry['timestamp']} - {entry['source']}]\n{get_entry_text(entry)}\n\n"
+
+def estimate_tokens(text):
+    """
+    LLM 입력 토큰 수 추정 (한글은 글자 단위, 나머지는 영문 기준 비율)
+
+    실제 토큰 수는 모델마다 다르므로 화면 표시와 구간 크기 판단용으로만 사용합니다.
+    """
+    hangul = len(HANGUL_PATTERN.findall(text))
+    other = len(text) - hangul
+    return int(hangul / TOKEN_ESTIMATE_HANGUL_PER_TOKEN + other / TOKEN_ESTIMATE_OTHER_PER_TOKEN + 0.5)
+
+def ensure_entry_id(entry):
+    """ID가 없는 항목(이전 버전에서 추가된 항목)에 고유 ID 부여 후 반환"""
+    if "id" not in entry:
+        entry["id"] = uuid.uuid4().hex
+    return entry["id"]
+
+class TranscriptModel:
+    """
+    텍스트 항목 목록으로 만든 전체 트랜스크립트 캐시
+
+    항목을 추가/수정/삭제할 때 mark_dirty()를 호출하면 다음 get_text()에서 바뀐 항목의 블록만 다시 만들고,
+    바뀐 것이 없으면 이전에 이어 붙인 결과를 그대로 반환합니다.
+    항목 텍스트가 바뀌었는지는 문자열 비교 없이 객체 동일성(is)으로 확인합니다 (디스크로 옮긴 항목은 저장 키로 확인).
+
+    메모리에 있는 항목은 블록을 항목별로 보관하고, 디스크로 옮긴 항목은 블록 대신 이전 전체 텍스트에서의
+    위치만 기억했다가 다시 이어 붙일 때 그 부분을 잘라 사용합니다. 따라서 항목 하나를 수정해도
+    디스크에서는 바뀐 항목만 읽습니다. 메모리가 부족하면 release()로 블록과 전체 텍스트를 해제할 수 있으며,
+    해제한 뒤 처음 이어 붙일 때만 디스크로 옮긴 항목을 모두 다시 읽습니다.
+    """
+
+    def __init__(self):
+        # 항목 ID -> (텍스트 또는 저장 키, 타임스탬프, 출처, 블록(디스크로 옮긴 항목은 None), 블록 글자 수, 토큰 추정치)
+        self._blocks = {}
+        self._offsets = {}  # 항목 ID -> self._text 안에서 블록 시작 위치 (이후 바뀐 항목은 제외)
+        self._fresh = {}    # 항목 ID -> 이번에 디스크에서 읽어 새로 만든 블록 (다음 이어 붙이기에서 한 번만 사용)
+        self._text = None
+        self._stale = True  # self._text를 다시 이어 붙여야 하는지 여부
+        self._dirty = True
+        self.entry_count = 0
+        self.char_count = 0
+        self.token_estimate = 0
+        self.rendered_blocks = 0  # 지금까지 새로 만든 블록 수 (캐시 효과 확인용)
+
+    def mark_dirty(self):
+        """항목이 추가/수정/삭제되었음을 표시"""
+        self._dirty = True
+
+    def release(self):
+        """
+        이어 붙인 전체 텍스트와 항목별 블록 해제 (다음 get_text()에서 다시 만듦)
+
+        Returns:
+        int: 해제한 메모리 크기(바이트)
+        """
+        freed = self.cached_bytes()
+        self._text = None
+        self._offsets = {}
+        self._fresh = {}
+        self._stale = True
+        self._blocks = {entry_id: cached[:3] + (None,) + cached[4:] for entry_id, cached in self._blocks.items()}
+        return freed
+
+    def mark_spilled(self, entry):
+        """디스크로 옮긴 항목의 비교 기준을 저장 키로 바꾸고 보관 중인 블록 해제 (다시 읽지 않도록)"""
+        cached = self._blocks.get(entry.get("id"))
+        if cached is not None:
+            self._blocks[entry["id"]] = (entry["blob"],) + cached[1:3] + (None,) + cached[4:]
+
+    def cached_bytes(self):
+        """캐시된 전체 텍스트와 항목별 블록의 메모리 크기(바이트)"""
+        blocks = sum(sys.getsizeof(cached[3]) for cached in self._blocks.values() if cached[3] is not None)
+        blocks += sum(sys.getsizeof(block) for block in self._fresh.values())
+        return blocks + (sys.getsizeof(self._text) if self._text is not None else 0)
+
+    def _sync(self, entries):
+        """바뀐 항목의 블록과 크기 추정치만 다시 계산 (디스크로 옮긴 항목은 바뀐 경우에만 읽음)"""
+        blocks = {}
+        char_count = 0
+        token_estimate = 0
+        for entry in entries:
+            entry_id = ensure_entry_id(entry)
+            spilled = is_spilled(entry)
+            ref = entry["blob"] if spilled else entry["text"]
+            cached = self._blocks.get(entry_id)
+            if (cached is None or (cached[0] != ref if spilled else cached[0] is not ref)
+                    or cached[1] != entry["timestamp"] or cached[2] != entry["source"]):
+                block = format_entry_block(entry)
+                cached = (ref, entry["timestamp"], entry["source"], None if spilled else block,
+                          len(block), estimate_tokens(block))
+                # 이전 전체 텍스트의 이 항목 부분은 더 이상 사용할 수 없음
+                self._offsets.pop(entry_id, None)
+                if spilled:
+                    self._fresh[entry_id] = block
+                self.rendered_blocks += 1
+            blocks[entry_id] = cached
+            char_count += cached[4]
+            token_estimate += cached[5]
+
+        self._blocks = blocks
+        self._stale = True
+        self._dirty = False
+        self.entry_count = len(entries)
+        self.char_count = char_count
+        self.token_estimate = token_estimate
+
+    def _assemble(self, entries):
+        """보관 중인 블록과 이전 전체 텍스트의 바뀌지 않은 부분으로 전체 텍스트를 다시 이어 붙임"""
+        parts = []
+        offsets = {}
+        position = 0
+        for entry in entries:
+            entry_id = entry["id"]
+            cached = self._blocks[entry_id]
+            block = cached[3] or self._fresh.get(entry_id)
+            if block is None:
+                start = self._offsets.get(entry_id)
+                if self._text is not None and start is not None:
+                    block = self._text[start:start + cached[4]]
+                else:
+                    # release() 이후 처음 이어 붙이는 경우 (디스크로 옮긴 항목은 여기서만 다시 읽음)
+                    block = format_entry_block(entry)
+                    if not is_spilled(entry):
+                        self._blocks[entry_id] = cached[:3] + (block,) + cached[4:]
+            offsets[entry_id] = position
+            position += len(block)
+            parts.append(block)
+
+        self._text = "".join(parts)
+        self._offsets = offsets
+        self._fresh = {}
+        self._stale = False
+
+    def get_text(self, entries):
+        """
+        전체 트랜스크립트 반환 (바뀐 항목이 없으면 캐시된 결과)
+
+        Parameters:
+        entries (list): st.session_state.text_entries
+        """
+        if self._dirty or len(entries) != self.entry_count:
+            self._sync(entries)
+        if self._stale or self._text is None:
+            self._assemble(entries)
+        return self._text
+
+    def get_stats(self, entries):
+        """항목 수, 글자 수, 토큰 추정치 반환 (바뀐 항목이 있을 때만 다시 계산, 전체 텍스트는 만들지 않음)"""
+        if self._dirty or len(entries) != self.entry_count:
+            self._sync(entries)
+        return {
+            "entries": self.entry_count,
+            "chars": self.char_count,
+            "tokens": self.token_estimate,
+        }
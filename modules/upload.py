@@ -1,8 +1,10 @@
 """
 파일 업로드 처리 모듈
 """
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import streamlit as st
-from modules.utils import get_file_hash, add_entry_with_timestamp
+from modules.utils import get_file_hash, add_entry_with_timestamp, persist_session_fields
+from config.settings import UPLOAD_MAX_CONCURRENCY
 
 def setup_upload_interface(file_type="txt"):
     """
@@ -16,41 +18,72 @@ def setup_upload_interface(file_type="txt"):
     if file_type == "txt":
         st.markdown('<h3 class="subheader">TXT 파일 업로드</h3>', unsafe_allow_html=True)
         
-        # 통합된 파일 업로더 - Streamlit 기본 UI 사용
-        uploaded_file = st.file_uploader("회의 내용이 담긴 TXT 파일을 업로드하세요", type=["txt"], key="txt_uploader")
+        # 통합된 파일 업로더 - Streamlit 기본 UI 사용 (여러 파일 선택 가능)
+        uploaded_files = st.file_uploader("회의 내용이 담긴 TXT 파일을 업로드하세요 (여러 파일 선택 가능)", type=["txt"],
+                                          key="txt_uploader", accept_multiple_files=True)
         
         # 파일이 업로드되면 자동으로 처리
-        if uploaded_file:
-            process_text_file(uploaded_file)
+        if uploaded_files:
+            process_text_files(uploaded_files)
     
     st.markdown('</div>', unsafe_allow_html=True)
 
-def process_text_file(uploaded_file):
+def read_text_file(uploaded_file):
     """
-    업로드된 텍스트 파일 처리
+    업로드된 텍스트 파일 읽기 (세션 상태를 사용하지 않으므로 작업 스레드에서 실행 가능)
+    
+    Returns:
+    tuple: (파일 해시값, 텍스트, 오류 메시지 또는 None)
+    """
+    file_content = uploaded_file.getvalue()
+    file_hash = get_file_hash(file_content)
+    try:
+        return file_hash, file_content.decode("utf-8"), None
+    except Exception as e:
+        return file_hash, None, str(e)
+
+def process_text_files(uploaded_files):
+    """
+    업로드된 텍스트 파일들 처리 (새 파일은 동시에 읽고, 항목은 올린 순서대로 추가)
     
     Parameters:
-    uploaded_file: Streamlit 업로드된 파일 객체
+    uploaded_files (list): Streamlit 업로드된 파일 객체 목록 (업로드 순서)
     """
-    # 파일 내용 읽기
-    file_content = uploaded_file.read()
+    # 이미 처리한 업로드는 다시 읽지 않음
+    new_files = [
+        uploaded_file for uploaded_file in uploaded_files
+        if st.session_state.upload_hashes.get(uploaded_file.file_id) not in st.session_state.processed_files
+    ]
+    if not new_files:
+        return
     
-    # 파일 해시값 계산
-    file_hash = get_file_hash(file_content)
+    results = [None] * len(new_files)
+    progress_bar = st.progress(0) if len(new_files) > 1 else None
+    with ThreadPoolExecutor(max_workers=min(UPLOAD_MAX_CONCURRENCY, len(new_files))) as executor:
+        futures = {executor.submit(read_text_file, uploaded_file): i for i, uploaded_file in enumerate(new_files)}
+        for done, future in enumerate(as_completed(futures), 1):
+            results[futures[future]] = future.result()
+            if progress_bar:
+                progress_bar.progress(int(done / len(new_files) * 100))
+    if progress_bar:
+        progress_bar.empty()
     
-    # 이미 처리한 파일인지 확인 (중복 방지)
-    if file_hash not in st.session_state.processed_files:
+    for uploaded_file, (file_hash, text, error) in zip(new_files, results):
+        st.session_state.upload_hashes[uploaded_file.file_id] = file_hash
+        
+        # 이미 처리한 파일인지 확인 (중복 방지, 같은 내용의 파일을 함께 올린 경우 포함)
+        if file_hash in st.session_state.processed_files:
+            continue
         st.session_state.file_name = uploaded_file.name
         
-        try:
-            # TXT 파일 내용을 읽어서 저장
-            text = file_content.decode("utf-8")
-            # 파일 업로드 시 새로운 항목으로 추가
-            if text:
-                add_entry_with_timestamp(text, f"텍스트 파일 ({uploaded_file.name})")
-                # 처리된 파일 해시값 저장 (중복 방지)
-                st.session_state.processed_files[file_hash] = uploaded_file.name
-                st.success(f"파일이 업로드되었습니다: {uploaded_file.name}")
-            st.session_state.input_method = 'txt'
-        except Exception as e:
-            st.error(f"파일 처리 중 오류가 발생했습니다: {str(e)}")
\ No newline at end of file
+        if error:
+            st.error(f"파일 처리 중 오류가 발생했습니다: {uploaded_file.name} ({error})")
+            continue
+        # 파일 업로드 시 새로운 항목으로 추가
+        if text:
+            add_entry_with_timestamp(text, f"텍스트 파일 ({uploaded_file.name})")
+            # 처리된 파일 해시값 저장 (중복 방지)
+            st.session_state.processed_files[file_hash] = uploaded_file.name
+            st.success(f"파일이 업로드되었습니다: {uploaded_file.name}")
+        st.session_state.input_method = 'txt'
+    persist_session_fields("processed_files", "file_name", "input_method")
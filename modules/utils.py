@@ -2,10 +2,56 @@
 공통 유틸리티 함수 모듈
 """
 import streamlit as st
+import streamlit.components.v1 as components
 import hashlib
 import os
+import re
+import secrets
+import tempfile
+import threading
+import uuid
 from datetime import datetime
-from config.settings import APP_TITLE, APP_VERSION
+from modules.cache import get_transcript_cache
+from modules.clients import set_default_api_keys, get_pool_stats
+from modules.jobs import get_job_manager
+from modules.metrics import get_stage_summary
+from modules.rate_limit import get_rate_limit_stats
+from modules.single_flight import get_single_flight_stats
+from modules.storage import get_session_store
+from modules.session_memory import enforce_memory_budget, measure_session_memory, get_memory_summary
+from modules.transcript import TranscriptModel, format_entry_block
+from modules.artifacts import ArtifactStore
+from config.settings import (
+    APP_TITLE, APP_VERSION, TRANSCRIPT_CACHE_ENABLED, UPLOAD_CHUNK_SIZE, STATIC_DIR,
+    SESSION_COOKIE_NAME, SESSION_TTL_SEC
+)
+
+# 저장소에 기록하는 세션 상태 (텍스트 항목은 항목 단위로 따로 기록)
+PERSISTED_FIELDS = ("file_name", "input_method", "processed_files", "audio_info", "summary", "output_file",
+                    "processing_complete")
+SESSION_ID_PATTERN = re.compile(r"^[0-9a-f]{32}$")
+
+_static_assets = {}  # 정적 자산 경로 -> 파일 내용 (프로세스당 한 번만 읽음)
+_static_assets_lock = threading.Lock()
+
+def load_static_asset(relative_path):
+    """
+    정적 자산 파일 내용 반환 (처음 요청할 때만 디스크에서 읽고 이후에는 메모리에서 반환)
+
+    Parameters:
+    relative_path (str): STATIC_DIR 기준 경로 (예: "css/styles.css")
+    """
+    content = _static_assets.get(relative_path)
+    if content is None:
+        with open(os.path.join(STATIC_DIR, relative_path), encoding="utf-8") as f:
+            content = f.read()
+        with _static_assets_lock:
+            content = _static_assets.setdefault(relative_path, content)
+    return content
+
+def apply_custom_css():
+    """커스텀 CSS 적용 (파일은 프로세스당 한 번만 읽음)"""
+    st.markdown(f"<style>{load_static_asset('css/styles.css')}</style>", unsafe_allow_html=True)
 
 def initialize_session_state():
     """세션 상태 변수 초기화"""
@@ -26,20 +72,49 @@ def initialize_session_state():
     # 타임스탬프 항목을 저장하기 위한 새로운 세션 상태 변수    
     if 'text_entries' not in st.session_state:
         st.session_state.text_entries = []
+    if 'transcript' not in st.session_state:
+        st.session_state.transcript = TranscriptModel()  # text_entries로 만든 전체 트랜스크립트 캐시
+    if 'editing_entries' not in st.session_state:
+        st.session_state.editing_entries = set()  # 편집 중(펼친) 텍스트 항목 ID
     if 'need_rerun' not in st.session_state:
         st.session_state.need_rerun = False
     # 파일 처리 추적을 위한 변수
     if 'processed_files' not in st.session_state:
         st.session_state.processed_files = {}
+    # 업로드 파일 ID별 해시값 (재실행 시 파일 전체를 다시 읽지 않기 위함)
+    if 'upload_hashes' not in st.session_state:
+        st.session_state.upload_hashes = {}
     # 오디오 변환 정보
     if 'audio_info' not in st.session_state:
         st.session_state.audio_info = {}
+    # 백그라운드 작업 (오디오 해시별 변환 작업, 회의록 생성 작업, 완료 메시지)
+    if 'audio_jobs' not in st.session_state:
+        st.session_state.audio_jobs = {}
+    if 'audio_job_order' not in st.session_state:
+        st.session_state.audio_job_order = []  # 변환 결과를 추가할 순서 (업로드 순서의 오디오 해시)
+    if 'minutes_job' not in st.session_state:
+        st.session_state.minutes_job = None
+    if 'job_notices' not in st.session_state:
+        st.session_state.job_notices = {}
     # 선택된 음성 변환 엔진
     if 'speech_to_text_engine' not in st.session_state:
         st.session_state.speech_to_text_engine = "clova"
     # 선택된 회의록 요약 모델
     if 'summary_model' not in st.session_state:
         st.session_state.summary_model = "claude"
+    if 'output_file' not in st.session_state:
+        st.session_state.output_file = None
+    if 'artifacts' not in st.session_state:
+        st.session_state.artifacts = ArtifactStore()  # 완성된 회의록과 내보내기 형식 캐시
+    # 저장소에 기록된 세션 복원 (새 세션이 시작될 때 한 번)
+    if 'session_id' not in st.session_state:
+        restore_session_state()
+    write_session_cookie()
+    # 세션 메모리 예산 적용 (초과 시 큰 텍스트 항목을 디스크로 옮김)
+    try:
+        enforce_memory_budget(st.session_state, st.session_state.session_id)
+    except Exception:
+        pass
     
     # API 키 설정 확인
     try:
@@ -67,6 +142,9 @@ def initialize_session_state():
         st.session_state.claude_api_key = claude_api_key
         st.session_state.naver_client_id = naver_client_id
         st.session_state.naver_client_secret = naver_client_secret
+        
+        # 작업 스레드의 공유 API 클라이언트가 사용할 기본 키 등록
+        set_default_api_keys(openai_api_key=openai_api_key, claude_api_key=claude_api_key)
             
         # API 키가 설정되었는지 확인
         if st.session_state.openai_api_key and st.session_state.claude_api_key:
@@ -75,10 +153,138 @@ def initialize_session_state():
         st.error(f"API 키 설정 중 오류 발생: {e}")
         pass
 
+def restore_session_state():
+    """
+    브라우저 쿠키의 세션 ID로 저장소에 기록된 세션 상태 복원
+    
+    세션 ID가 없으면 추측할 수 없는 임의 값으로 새로 만들어 쿠키에 기록하므로(write_session_cookie),
+    새로고침하거나 인스턴스가 재시작되어 다른 인스턴스로 연결되어도 같은 세션을 이어서 사용할 수 있습니다.
+    세션 ID는 URL에 넣지 않으므로 주소를 공유해도 세션이 함께 전달되지 않습니다.
+    """
+    session_id = read_session_cookie()
+    if not session_id:
+        session_id = secrets.token_hex(16)
+    st.session_state.session_id = session_id
+    
+    try:
+        stored = get_session_store().load_session(session_id)
+    except Exception as e:
+        st.warning(f"저장된 세션을 불러오지 못했습니다: {e}")
+        return
+    if not stored:
+        return
+    
+    for name, value in stored["fields"].items():
+        if name in PERSISTED_FIELDS:
+            st.session_state[name] = value
+    st.session_state.text_entries = stored["entries"]
+    st.session_state.transcript.mark_dirty()
+
+def read_session_cookie():
+    """브라우저 쿠키에 기록된 세션 ID 반환 (없거나 형식이 맞지 않으면 빈 문자열)"""
+    session_id = st.context.cookies.get(SESSION_COOKIE_NAME)
+    if isinstance(session_id, str) and SESSION_ID_PATTERN.match(session_id):
+        return session_id
+    return ""
+
+def write_session_cookie():
+    """
+    현재 세션 ID를 브라우저 쿠키에 기록 (이미 같은 값이 전달된 연결이면 생략)
+    
+    Streamlit에는 서버에서 쿠키를 설정하는 기능이 없으므로 브라우저에서 실행되는 스크립트로 기록하며,
+    쿠키는 다음 연결(새로고침, 재연결)부터 서버로 전달됩니다.
+    """
+    session_id = st.session_state.session_id
+    if read_session_cookie() == session_id:
+        return
+    # 최신 Streamlit은 st.iframe, 이전 버전은 components.html로 스크립트 실행
+    embed_html = getattr(st, "iframe", None) or components.html
+    embed_html(
+        "<script>"
+        f"window.parent.document.cookie = '{SESSION_COOKIE_NAME}={session_id}; path=/; "
+        f"max-age={SESSION_TTL_SEC}; SameSite=Strict' + "
+        "(window.parent.location.protocol === 'https:' ? '; Secure' : '');"
+        "</script>",
+        height=1
+    )
+
+def persist_session_fields(*names):
+    """세션 상태 중 바뀐 값만 저장소에 기록 (저장소 오류는 화면 동작에 영향 없음)"""
+    try:
+        get_session_store().save_fields(st.session_state.session_id,
+                                        {name: st.session_state[name] for name in names})
+    except Exception:
+        pass
+
+def persist_entry(entry):
+    """추가/수정된 텍스트 항목 하나를 저장소에 기록"""
+    try:
+        get_session_store().save_entry(st.session_state.session_id, entry)
+    except Exception:
+        pass
+
+def delete_persisted_entry(entry_id):
+    """삭제된 텍스트 항목을 저장소에서 삭제"""
+    try:
+        get_session_store().delete_entry(st.session_state.session_id, entry_id)
+    except Exception:
+        pass
+
+def clear_persisted_entries():
+    """저장소의 텍스트 항목 모두 삭제"""
+    try:
+        get_session_store().clear_entries(st.session_state.session_id)
+    except Exception:
+        pass
+
+def persist_file(name, content):
+    """결과 파일을 저장소에 기록 (저장소 오류는 화면 동작에 영향 없음)"""
+    try:
+        get_session_store().save_file(st.session_state.session_id, name, content)
+    except Exception:
+        pass
+
 def get_file_hash(file_content):
     """파일 내용의 해시값 계산 (중복 확인용)"""
     return hashlib.md5(file_content).hexdigest()
 
+def spool_upload(uploaded_file, chunk_size=UPLOAD_CHUNK_SIZE):
+    """
+    업로드 파일을 고정 크기 단위로 임시 파일에 기록하면서 해시값 계산
+    
+    하나의 버퍼에 readinto로 읽어 복사본을 만들지 않으므로 
+    파일 크기와 관계없이 메모리 사용량이 chunk_size로 제한됩니다.
+    
+    Parameters:
+    uploaded_file: Streamlit 업로드된 파일 객체
+    chunk_size (int): 한 번에 읽을 바이트 수
+    
+    Returns:
+    tuple: (임시 파일 경로, 해시값 (get_file_hash와 동일), 파일 크기(바이트))
+    """
+    hasher = hashlib.md5()
+    buffer = bytearray(chunk_size)
+    view = memoryview(buffer)
+    file_size = 0
+    
+    uploaded_file.seek(0)
+    with tempfile.NamedTemporaryFile(delete=False, suffix=f".{uploaded_file.name.split('.')[-1]}") as tmp_file:
+        try:
+            while True:
+                read_size = uploaded_file.readinto(buffer)
+                if not read_size:
+                    break
+                hasher.update(view[:read_size])
+                tmp_file.write(view[:read_size])
+                file_size += read_size
+        except Exception:
+            tmp_file.close()
+            os.unlink(tmp_file.name)
+            raise
+    uploaded_file.seek(0)
+    
+    return tmp_file.name, hasher.hexdigest(), file_size
+
 def add_entry_with_timestamp(text, source="직접 입력"):
     """타임스탬프와 함께 항목 추가"""
     if not text.strip():  # 빈 텍스트는 추가하지 않음
@@ -89,6 +295,7 @@ def add_entry_with_timestamp(text, source="직접 입력"):
     
     # 타임스탬프와 출처, 텍스트를 함께 저장
     entry = {
+        "id": uuid.uuid4().hex,  # 화면 위젯 키로 사용하는 고유 ID
         "timestamp": timestamp,
         "source": source,
         "text": text
@@ -96,15 +303,31 @@ def add_entry_with_timestamp(text, source="직접 입력"):
     
     # 세션 상태에 저장
     st.session_state.text_entries.append(entry)
+    st.session_state.transcript.mark_dirty()
+    persist_entry(entry)
     st.session_state.need_rerun = True
 
+def add_job_notices(kind, notices):
+    """백그라운드 작업 완료 메시지 저장 (다음 실행 시 한 번 표시)"""
+    st.session_state.job_notices.setdefault(kind, []).extend(notices)
+
+def render_job_notices(kind):
+    """저장된 백그라운드 작업 완료 메시지를 표시한 후 삭제"""
+    for level, text in st.session_state.job_notices.pop(kind, []):
+        getattr(st, level)(text)
+
 def update_full_transcript():
-    """전체 트랜스크립트 업데이트"""
-    full_text = ""
-    for entry in st.session_state.text_entries:
-        full_text += f"[{entry['timestamp']} - {entry['source']}]\n{entry['text']}\n\n"
+    """전체 트랜스크립트 반환 (바뀐 항목만 다시 만들고 나머지는 캐시 사용)"""
+    return st.session_state.transcript.get_text(st.session_state.text_entries)
+
+def format_transcript(entries):
+    """
+    텍스트 항목 목록을 전체 트랜스크립트 형식으로 변환 (세션 상태 사용 안 함)
     
-    return full_text
+    Parameters:
+    entries (list): {"timestamp", "source", "text"} 항목 목록
+    """
+    return "".join(format_entry_block(entry) for entry in entries)
 
 def setup_sidebar():
     """사이드바 설정"""
@@ -140,12 +363,85 @@ def setup_sidebar():
     else:
         st.session_state.summary_model = "openai"
     
+    # 서버 상태 (캐시, 백그라운드 작업, API 연결 현황)
+    with st.expander("서버 상태"):
+        if TRANSCRIPT_CACHE_ENABLED:
+            try:
+                stats = get_transcript_cache().stats()
+                st.caption(
+                    f"음성 변환 캐시: 적중 {stats['hits']}회 / 미적중 {stats['misses']}회 · "
+                    f"{stats['entries']}개 ({stats['bytes'] / (1024 * 1024):.1f}MB / {stats['max_bytes'] / (1024 * 1024):.0f}MB)"
+                )
+            except Exception:
+                pass
+        
+        job_stats = get_job_manager().stats()
+        st.caption(
+            f"백그라운드 작업: 실행 {job_stats['running']} / 대기 {job_stats['pending']} "
+            f"(최대 동시 실행 {job_stats['max_workers']})"
+        )
+        
+        pool_stats = get_pool_stats()
+        for provider in ("anthropic", "openai"):
+            pools = [pool for pool in pool_stats[provider]["pools"] if pool]
+            st.caption(
+                f"{provider} 연결: {sum(pool['connections'] for pool in pools)}개 "
+                f"(유휴 {sum(pool['idle'] for pool in pools)}개)"
+            )
+        if pool_stats["clova"]:
+            st.caption(
+                f"clova 연결: 생성 {pool_stats['clova']['connections_created']}개 · "
+                f"요청 {pool_stats['clova']['requests']}회"
+            )
+        
+        # 제공자별 요청 제한 (동시 요청 한도는 과부하 응답에 따라 자동 조절)
+        for provider, limits in sorted(get_rate_limit_stats().items()):
+            st.caption(
+                f"{provider} 요청: 진행 {limits['in_flight']}/{limits['limit']}개 · 대기 {limits['queued']}개"
+                + (f" · 과부하 응답 {limits['throttled']}회" if limits["throttled"] else "")
+            )
+        
+        # 동일 요청 합치기 (같은 파일/회의 내용을 동시에 처리한 요청은 API 호출 한 번으로 처리)
+        flight_names = {"transcription": "음성 변환", "minutes": "회의록 생성"}
+        for kind, flights in sorted(get_single_flight_stats().items()):
+            st.caption(
+                f"{flight_names.get(kind, kind)} 합치기: 진행 {flights['in_flight']}건 · "
+                f"합류 {flights['joined']}회 (호출 생략)"
+            )
+        
+        # 메모리 사용량 (이 세션, 프로세스 전체)
+        usage = measure_session_memory(st.session_state)
+        st.caption(
+            f"세션 메모리: {usage['total'] / (1024 * 1024):.1f}MB"
+            + (f" (디스크 보관 {usage['spilled_entries']}개 항목)" if usage["spilled_entries"] else "")
+        )
+        try:
+            memory = get_memory_summary()
+            rss = f" · 프로세스 {memory['process_rss'] / (1024 * 1024):.0f}MB" if memory["process_rss"] else ""
+            st.caption(
+                f"전체 세션 {memory['sessions']}개: {memory['session_bytes'] / (1024 * 1024):.1f}MB · "
+                f"디스크 보관 {memory['spill_bytes'] / (1024 * 1024):.1f}MB{rss}"
+            )
+        except Exception:
+            pass
+        
+        # 단계별 평균 처리 시간 (이 프로세스에서 처리한 요청 기준)
+        for stage, values in sorted(get_stage_summary().items()):
+            st.caption(f"{stage}: 평균 {values['avg_sec']:.2f}초 ({values['count']}회)")
+    
     # 앱 초기화 버튼
     st.markdown('---')
     if st.button("앱 완전 초기화", use_container_width=True):
+        # 저장된 세션 삭제
+        try:
+            get_session_store().delete_session(st.session_state.session_id)
+        except Exception:
+            pass
         # 모든 세션 상태 변수 초기화
         for key in list(st.session_state.keys()):
             del st.session_state[key]
+        # 쿠키의 이전 ID를 다시 읽지 않도록 새 세션 ID를 만들어 두고, 다시 실행될 때 쿠키에 기록
+        st.session_state.session_id = secrets.token_hex(16)
         st.rerun()
     
     # 사용 설명서